@@ -6,19 +6,20 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
-from app.core.config import settings
-from app.core.database import supabase_client
+from app.core.config import DEFAULT_API_PREFIX, settings
+from app.core.database import get_read_db
+from app.core.dataloader import get_loader
 from app.schemas.user import TokenData
 
 # JWT token configuration
-SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = "HS256"
 
 # Password hashing configuration
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-# OAuth2 configuration
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_PREFIX}/auth/login")
+# OAuth2 configuration (the token URL is only used for the OpenAPI docs, so the
+# default prefix is used to avoid loading the settings at import time)
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{DEFAULT_API_PREFIX}/auth/login")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -41,17 +42,18 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Any = Depends(get_read_db)) -> Dict[str, Any]:
     """
     Get the current authenticated user based on the JWT token.
     
     Args:
         token: JWT token from the Authorization header.
+        db: Data client for this worker process.
         
     Returns:
         User data.
@@ -67,7 +69,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> Dict[str, Any
     
     try:
         # Decode the JWT token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         
         if user_id is None:
@@ -78,11 +80,30 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> Dict[str, Any
         raise credentials_exception
     
     # Get the user from the database
-    result = supabase_client.table("users").select("*").eq("user_id", token_data.user_id).execute()
+    result = db.table("users").select("*").eq("user_id", token_data.user_id).execute()
     
     if not result.data:
         raise credentials_exception
         
     user = result.data[0]
     
+    # Later lookups of this user in the request (e.g. for names) need no query
+    get_loader("users").prime(user["user_id"], {key: value for key, value in user.items() if key != "password"})
+    
     return user
+
+
+async def get_current_admin(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+    """
+    Get the current user, requiring the admin role.
+    
+    Raises:
+        HTTPException: If the user is not an admin.
+    """
+    if current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    return current_user
@@ -0,0 +1,303 @@
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from jose import JWTError, jwt
+
+from app.core.auth import ALGORITHM
+from app.core.config import settings
+
+PRIORITY_HIGH = 0
+PRIORITY_LOW = 1
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limiter that adapts the in-flight cap to observed latency.
+
+    Latency is tracked per route template, since a pet listing and a login
+    have very different costs. Each route keeps a short-term and a long-term
+    moving average of its latency; the limit grows additively while the
+    short-term average stays within ``latency_tolerance`` of the long-term
+    one, and shrinks multiplicatively when it climbs past it or requests fail.
+    The long-term average covers about ``baseline_window`` requests of the
+    route, and is pulled down when latency recovers so that it does not keep
+    the latency of an earlier overload. Low-priority requests may only use a
+    share of the limit so that authenticated writes keep some headroom.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 32,
+        min_limit: int = 4,
+        max_limit: int = 256,
+        latency_tolerance: float = 2.0,
+        backoff_ratio: float = 0.9,
+        low_priority_share: float = 0.75,
+        max_queue: int = 128,
+        queue_timeout: float = 2.0,
+        baseline_window: int = 1000,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.low_priority_share = low_priority_share
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.baseline_window = baseline_window
+
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._in_flight = 0
+        self._waiters: Dict[int, Deque[asyncio.Future]] = {
+            PRIORITY_HIGH: deque(),
+            PRIORITY_LOW: deque(),
+        }
+
+        # Route template -> [samples, short-term average, long-term average]
+        self._routes: Dict[str, List[float]] = {}
+        self._smoothed_latency: float = 0.0
+        self._last_decrease = 0.0
+
+        self._admitted_total = 0
+        self._shed_total = {"queue_full": 0, "timeout": 0}
+        self._shed_by_priority = {PRIORITY_HIGH: 0, PRIORITY_LOW: 0}
+
+    @property
+    def limit(self) -> int:
+        """Current integer concurrency limit."""
+        return int(self._limit)
+
+    def _priority_limit(self, priority: int) -> int:
+        if priority == PRIORITY_HIGH:
+            return self.limit
+        return max(1, int(self._limit * self.low_priority_share))
+
+    def _can_admit(self, priority: int) -> bool:
+        return self._in_flight < self._priority_limit(priority)
+
+    def _queued(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def _shed(self, priority: int, reason: str) -> bool:
+        self._shed_total[reason] += 1
+        self._shed_by_priority[priority] += 1
+        return False
+
+    async def acquire(self, priority: int = PRIORITY_LOW) -> bool:
+        """
+        Acquire a slot, waiting in the priority queue if necessary.
+
+        Args:
+            priority: PRIORITY_HIGH or PRIORITY_LOW.
+
+        Returns:
+            True if the request was admitted, False if it should be shed.
+        """
+        # Admit immediately only if nobody of equal or higher priority is waiting
+        waiting_ahead = any(self._waiters[p] for p in self._waiters if p <= priority)
+        if not waiting_ahead and self._can_admit(priority):
+            self._in_flight += 1
+            self._admitted_total += 1
+            return True
+
+        if self._queued() >= self.max_queue:
+            return self._shed(priority, "queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard_waiter(priority, waiter)
+            return self._shed(priority, "timeout")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as the client went away; give it back
+                self._in_flight -= 1
+                self._wake_waiters()
+            else:
+                self._discard_waiter(priority, waiter)
+            raise
+
+        self._admitted_total += 1
+        return True
+
+    def _discard_waiter(self, priority: int, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters[priority].remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, latency: Optional[float], failed: bool = False, route: str = "") -> None:
+        """
+        Release a slot and feed the observed latency into the limit.
+
+        Args:
+            latency: Wall-clock duration of the request in seconds, or None to
+                release the slot without recording a sample.
+            failed: Whether the request failed in a way that signals overload.
+            route: Route template the request was served by.
+        """
+        self._in_flight -= 1
+        if latency is not None:
+            self._record(route, latency, failed)
+        self._wake_waiters()
+
+    def _record(self, route: str, latency: float, failed: bool) -> None:
+        self._smoothed_latency = latency if not self._smoothed_latency else (
+            0.9 * self._smoothed_latency + 0.1 * latency
+        )
+
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes[route] = [0, latency, latency]
+        samples, short, long = stats
+        samples += 1
+        short = 0.8 * short + 0.2 * latency
+        # Running mean until the window fills, then an exponential moving average
+        long += (latency - long) / min(samples, self.baseline_window)
+        if long > 2 * short:
+            # Latency recovered: forget the overload faster than the window would
+            long = 0.95 * long + 0.05 * short
+        stats[:] = [samples, short, long]
+
+        now = time.monotonic()
+        overloaded = failed or short > long * self.latency_tolerance
+        if overloaded:
+            # Back off at most once per smoothed round trip to avoid collapsing the limit
+            if now - self._last_decrease >= self._smoothed_latency:
+                self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+                self._last_decrease = now
+        elif self._in_flight + 1 >= self._limit / 2:
+            # Only grow while the current limit is actually being used
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+    def _wake_waiters(self) -> None:
+        for priority in (PRIORITY_HIGH, PRIORITY_LOW):
+            waiters = self._waiters[priority]
+            while waiters and self._can_admit(priority):
+                waiter = waiters.popleft()
+                if waiter.done():
+                    continue
+                self._in_flight += 1
+                waiter.set_result(None)
+            if waiters:
+                # Lower priorities never overtake a blocked higher priority
+                break
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the limiter's current metrics.
+        """
+        return {
+            "limit": self.limit,
+            "low_priority_limit": self._priority_limit(PRIORITY_LOW),
+            "in_flight": self._in_flight,
+            "queued_high": len(self._waiters[PRIORITY_HIGH]),
+            "queued_low": len(self._waiters[PRIORITY_LOW]),
+            "admitted_total": self._admitted_total,
+            "shed_total": sum(self._shed_total.values()),
+            "shed_queue_full": self._shed_total["queue_full"],
+            "shed_timeout": self._shed_total["timeout"],
+            "shed_high_priority": self._shed_by_priority[PRIORITY_HIGH],
+            "shed_low_priority": self._shed_by_priority[PRIORITY_LOW],
+            "latency_smoothed_ms": round(self._smoothed_latency * 1000, 3),
+            "routes_tracked": len(self._routes),
+        }
+
+
+def _has_valid_token(scope: Dict[str, Any]) -> bool:
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return False
+            try:
+                return bool(jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM]).get("sub"))
+            except JWTError:
+                return False
+    return False
+
+
+def classify_request(scope: Dict[str, Any]) -> int:
+    """
+    Assign a priority to an incoming HTTP request.
+
+    Writes carrying a bearer token with a valid signature are high priority;
+    anonymous traffic, reads and requests with forged or expired tokens are
+    low priority. Only the signature is checked, without a database lookup.
+    """
+    if scope.get("method") in SAFE_METHODS:
+        return PRIORITY_LOW
+    return PRIORITY_HIGH if _has_valid_token(scope) else PRIORITY_LOW
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    ASGI middleware that admits requests through an AdaptiveConcurrencyLimiter.
+
+    Requests that cannot be admitted are shed with a fast 503 response and a
+    Retry-After header. Cheap routes such as health checks bypass the limiter.
+    Streamed responses (no Content-Length, e.g. exports) give their slot back
+    once streaming starts and record no latency sample, since their duration
+    depends on the size of the download rather than on server load.
+    """
+
+    def __init__(
+        self,
+        app,
+        limiter: AdaptiveConcurrencyLimiter,
+        exempt_paths: Iterable[str] = (),
+        retry_after: int = 1,
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.exempt_paths = frozenset(exempt_paths)
+        self.retry_after = retry_after
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.limiter.acquire(classify_request(scope)):
+            await self._send_overloaded(send)
+            return
+
+        status_code = 500
+        streaming = False
+
+        async def send_wrapper(message):
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if not any(name.lower() == b"content-length" for name, _ in message.get("headers", [])):
+                    streaming = True
+                    self.limiter.release(None)
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not streaming:
+                route = getattr(scope.get("route"), "path_format", "")
+                self.limiter.release(time.perf_counter() - start, failed=status_code >= 500, route=route)
+
+    async def _send_overloaded(self, send) -> None:
+        body = json.dumps({"detail": "Server is overloaded, please retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
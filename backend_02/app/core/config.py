@@ -1,15 +1,20 @@
 import os
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 from pydantic import PostgresDsn, validator
 from pydantic_settings import BaseSettings
 
 
+# Default prefix, usable at import time without loading the full configuration
+DEFAULT_API_PREFIX = "/api/v1"
+
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Pet Adoption API"
     PROJECT_VERSION: str = "1.0.0"
     
-    API_PREFIX: str = "/api/v1"
+    API_PREFIX: str = DEFAULT_API_PREFIX
     
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
@@ -18,9 +23,159 @@ class Settings(BaseSettings):
     SUPABASE_URL: str
     SUPABASE_KEY: str
     
+    # Direct Postgres connection, used only by the migration tool (migrate.py)
+    DATABASE_URL: Optional[str] = None
+    
+    # Optional read replica endpoints (JSON list of URLs) for read-only queries
+    SUPABASE_READ_REPLICA_URLS: List[str] = []
+    # After a write, the writer's reads stay on the primary for this many seconds
+    READ_YOUR_WRITES_WINDOW_SECONDS: int = 10
+    
+    # Data client HTTP connection pool, timeouts and retries (per worker process).
+    # Retries back off only off the event loop; calls made on it retry once, immediately
+    DB_POOL_MAX_CONNECTIONS: int = 20
+    DB_POOL_MAX_KEEPALIVE: int = 10
+    DB_POOL_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    DB_POOL_TIMEOUT_SECONDS: float = 5.0
+    DB_HTTP2: bool = True
+    DB_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    DB_READ_TIMEOUT_SECONDS: float = 10.0
+    DB_WRITE_TIMEOUT_SECONDS: float = 10.0
+    DB_READ_RETRIES: int = 2
+    DB_RETRY_BACKOFF_SECONDS: float = 0.1
+    DB_RETRY_BACKOFF_MAX_SECONDS: float = 2.0
+    
+    # Per-table circuit breakers and stale fallback for public reads
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_TIMEOUT_SECONDS: float = 30.0
+    STALE_CACHE_MAX_ENTRIES: int = 1024
+    STALE_CACHE_MAX_AGE_SECONDS: float = 3600.0
+    
+    # Adaptive concurrency limiting (applied per worker process)
+    CONCURRENCY_INITIAL_LIMIT: int = 32
+    CONCURRENCY_MIN_LIMIT: int = 4
+    CONCURRENCY_MAX_LIMIT: int = 256
+    CONCURRENCY_LATENCY_TOLERANCE: float = 2.0  # Back off when latency exceeds baseline by this factor
+    CONCURRENCY_BACKOFF_RATIO: float = 0.9
+    CONCURRENCY_LOW_PRIORITY_SHARE: float = 0.75  # Fraction of the limit anonymous traffic may use
+    CONCURRENCY_MAX_QUEUE: int = 128
+    CONCURRENCY_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    CONCURRENCY_RETRY_AFTER_SECONDS: int = 1
+    
+    # Idempotency-Key support for retried POST requests (stored per worker process)
+    IDEMPOTENCY_TTL_SECONDS: float = 86400.0
+    IDEMPOTENCY_MAX_ENTRIES: int = 10000
+    IDEMPOTENCY_MAX_BODY_BYTES: int = 65536
+    
+    # Durable background task queue (SQLite file shared by the worker processes)
+    TASK_QUEUE_PATH: str = "data/task_queue.sqlite3"
+    TASK_QUEUE_CONCURRENCY: int = 4  # Consumers per worker process
+    TASK_QUEUE_MAX_ATTEMPTS: int = 5
+    TASK_QUEUE_RETRY_BACKOFF_SECONDS: float = 1.0
+    TASK_QUEUE_RETRY_BACKOFF_MAX_SECONDS: float = 300.0
+    TASK_QUEUE_LEASE_SECONDS: float = 60.0
+    
+    # Care guide (resources) caching: in-process TTL and client Cache-Control max-age
+    RESOURCE_CACHE_TTL_SECONDS: float = 300.0
+    RESOURCE_CACHE_MAX_ENTRIES: int = 512
+    RESOURCE_CACHE_MAX_AGE_SECONDS: int = 3600
+    
+    # Visit scheduling: per-owner calendars are reloaded after this many seconds
+    VISIT_CALENDAR_TTL_SECONDS: float = 60.0
+    
+    # Notification digests built from the notification_outbox table
+    NOTIFICATION_DIGEST_WINDOW_SECONDS: int = 300
+    NOTIFICATION_DISPATCH_INTERVAL_SECONDS: float = 30.0
+    NOTIFICATION_BATCH_SIZE: int = 500
+    NOTIFICATION_LEASE_SECONDS: int = 120
+    NOTIFICATION_TRANSPORT: str = "file"  # "file" (local stand-in) or "smtp"
+    NOTIFICATION_FILE_PATH: str = "data/notifications.jsonl"
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 587
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_USE_TLS: bool = True
+    SMTP_SENDER: str = "no-reply@pet-adoption.local"
+    
+    # List routes encode trusted database rows without re-validating them
+    # (disable to validate every response against its schema)
+    TRUSTED_SERIALIZATION: bool = True
+
+    # Streaming exports: rows fetched per keyset page, and pet IDs per owner-scoped query
+    EXPORT_PAGE_SIZE: int = 1000
+    EXPORT_PET_ID_CHUNK: int = 200
+
+    # Production server (see server.py)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # 0 sizes the worker pool to the available CPU cores
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_TIMEOUT_SECONDS: int = 5
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    SERVER_WARMUP: bool = True
+    
+    # Pet recommendations: the in-memory feature index is rebuilt after this many seconds
+    RECOMMENDATION_REFRESH_SECONDS: float = 300.0
+    
+    # User profiles cached per worker process; updates invalidate this process's
+    # entry, other workers may serve the old profile for up to the TTL except to
+    # the updating client, whose reads bypass it during READ_YOUR_WRITES_WINDOW_SECONDS
+    USER_PROFILE_CACHE_TTL_SECONDS: float = 60.0
+    USER_PROFILE_CACHE_MAX_ENTRIES: int = 4096
+    
+    # Request-scoped DataLoaders: most keys fetched by one batched in_ query
+    DATALOADER_MAX_BATCH: int = 200
+    
+    # Pet listing totals (X-Total-Count): exact counts only for filters the planner
+    # estimates at or below PET_COUNT_EXACT_MAX rows; totals are cached per filter
+    PET_COUNT_EXACT_MAX: int = 1000
+    PET_COUNT_CACHE_TTL_SECONDS: float = 30.0
+    PET_COUNT_CACHE_MAX_ENTRIES: int = 1024
+    
+    # Saved search alerts: the in-memory search index is reloaded after this many seconds
+    SAVED_SEARCH_REFRESH_SECONDS: float = 60.0
+    
+    # Request profiling (per worker process; adjustable at run time via /profiling/config).
+    # Admin requests sending PROFILING_HEADER are always profiled; when enabled, so are
+    # requests to PROFILING_ROUTES (path templates) and a PROFILING_SAMPLE_RATE fraction
+    # of all requests. Settings changed at run time and the buffer are per worker process
+    PROFILING_ENABLED: bool = False
+    PROFILING_ROUTES: List[str] = []
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_INTERVAL_SECONDS: float = 0.005
+    PROFILING_BUFFER_SIZE: int = 50
+    PROFILING_MAX_SAMPLES: int = 20000  # Per profile
+    
+    # Archival of adopted pets and their applications (see archive_adopted_pets)
+    ARCHIVE_ENABLED: bool = True
+    ARCHIVE_AFTER_DAYS: int = 30
+    ARCHIVE_INTERVAL_SECONDS: float = 3600.0
+    ARCHIVE_BATCH_SIZE: int = 500
+    
     class Config:
         # env_file = ".env"  # Uncomment this line to load environment variables from a .env file during local deployment
         case_sensitive = True
 
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Load the application settings from the environment on first use.
+    """
+    return Settings()
+
+
+class _LazySettings:
+    """
+    Proxy that defers reading the environment until a setting is first accessed.
+
+    Importing modules that reference ``settings`` therefore no longer requires
+    a complete environment configuration.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+
+settings: Settings = _LazySettings()  # type: ignore[assignment]
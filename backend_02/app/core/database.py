@@ -1,5 +1,204 @@
-import supabase
+import itertools
+import os
+from typing import Any, Dict, List, Optional
+
 from app.core.config import settings
+from app.core.metrics import register_metrics
+from app.core.read_routing import reads_pinned_to_primary
+from app.core.warmup import register_warmup
+
+# Per-process client state. Clients hold pooled connections, which must not be
+# shared across a fork, so new clients are created whenever the PID changes.
+_client: Optional[Any] = None
+_client_pid: Optional[int] = None
+_replicas: List[Any] = []
+_replicas_pid: Optional[int] = None
+_replica_cycle = itertools.count()
+
+
+def create_data_client(base_url: str) -> Any:
+    """
+    Build a PostgREST client for a Supabase project URL with a tuned connection pool.
+
+    Args:
+        base_url: Supabase project URL.
+
+    Returns:
+        A PostgREST client exposing ``table()`` and ``rpc()``.
+    """
+    # Deferred import: httpx/httpcore/h2 are only needed once a client is built
+    import httpx
+
+    from app.core.http_pool import CircuitBreakerTransport, PooledPostgrestClient, RetryingTransport
+    from app.core.resilience import CircuitBreakerRegistry
+
+    pool = RetryingTransport(
+        http2=settings.DB_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.DB_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.DB_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.DB_POOL_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        retries=settings.DB_READ_RETRIES,
+        backoff=settings.DB_RETRY_BACKOFF_SECONDS,
+        backoff_max=settings.DB_RETRY_BACKOFF_MAX_SECONDS,
+    )
+    breakers = CircuitBreakerRegistry(
+        failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=settings.CIRCUIT_RESET_TIMEOUT_SECONDS,
+    )
+    timeout = httpx.Timeout(
+        connect=settings.DB_CONNECT_TIMEOUT_SECONDS,
+        read=settings.DB_READ_TIMEOUT_SECONDS,
+        write=settings.DB_WRITE_TIMEOUT_SECONDS,
+        pool=settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+    headers = {
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+        "apikey": settings.SUPABASE_KEY,
+        "Authorization": f"Bearer {settings.SUPABASE_KEY}",
+    }
+    return PooledPostgrestClient(
+        f"{base_url.rstrip('/')}/rest/v1",
+        transport=CircuitBreakerTransport(pool, breakers),
+        headers=headers,
+        timeout=timeout,
+    )
+
+
+def get_supabase_client() -> Any:
+    """
+    Return this process's data client, creating it on first use.
+    """
+    global _client, _client_pid
+
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        _client = create_data_client(settings.SUPABASE_URL)
+        _client_pid = pid
+    return _client
+
+
+def get_replica_clients() -> List[Any]:
+    """
+    Return this process's read replica clients, creating them on first use.
+    """
+    global _replicas, _replicas_pid
+
+    pid = os.getpid()
+    if _replicas_pid != pid:
+        _replicas = [create_data_client(url) for url in settings.SUPABASE_READ_REPLICA_URLS]
+        _replicas_pid = pid
+    return _replicas
+
+
+def get_read_client() -> Any:
+    """
+    Return a client for read-only queries.
+
+    Reads are spread round-robin over the configured replicas, except when
+    there are none or the current request is pinned to the primary to
+    observe its own writes.
+    """
+    if reads_pinned_to_primary():
+        return get_supabase_client()
+    replicas = get_replica_clients()
+    if not replicas:
+        return get_supabase_client()
+    return replicas[next(_replica_cycle) % len(replicas)]
+
+
+def close_supabase_client() -> None:
+    """
+    Close this process's clients and release their pooled connections.
+    """
+    global _client, _client_pid, _replicas, _replicas_pid
+
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        _client.session.close()
+    if _replicas_pid == pid:
+        for replica in _replicas:
+            replica.session.close()
+    _client = None
+    _client_pid = None
+    _replicas = []
+    _replicas_pid = None
+
+
+def get_db() -> Any:
+    """
+    FastAPI dependency providing the per-process primary data client.
+    """
+    return get_supabase_client()
+
+
+def get_read_db() -> Any:
+    """
+    FastAPI dependency providing a client for read-only queries.
+    """
+    return get_read_client()
+
+
+class _ClientProxy:
+    """
+    Module-level handle that resolves to a per-process client on each use.
+    """
+
+    def __init__(self, resolve):
+        self._resolve = resolve
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+
+# Writes and read-modify-write paths must use the primary
+supabase_client = _ClientProxy(get_supabase_client)
+# Read-only queries may be served by a replica
+supabase_read_client = _ClientProxy(get_read_client)
+
+# Tables whose settled rows are moved to an archive table (see migration 0006);
+# lookups by ID that miss the hot table fall back to the archive
+ARCHIVE_TABLES = {
+    "pets": "pets_archive",
+    "adoption_applications": "adoption_applications_archive",
+}
+
+
+def _active_clients() -> Dict[str, Any]:
+    pid = os.getpid()
+    clients = {}
+    if _client is not None and _client_pid == pid:
+        clients["primary"] = _client
+    if _replicas_pid == pid:
+        for index, replica in enumerate(_replicas):
+            clients[f"replica_{index}"] = replica
+    return clients
+
+
+def pool_metrics() -> Dict[str, Any]:
+    """
+    Report connection pool saturation for this process's data clients.
+    """
+    return {name: client.transport.pool.snapshot() for name, client in _active_clients().items()}
+
+
+def circuit_metrics() -> Dict[str, Any]:
+    """
+    Report per-table circuit breaker state for this process's data clients.
+    """
+    return {name: client.transport.breakers.snapshot() for name, client in _active_clients().items()}
+
+
+register_metrics("db_pool", pool_metrics)
+register_metrics("circuit_breakers", circuit_metrics)
+
 
-# Initialize Supabase client
-supabase_client = supabase.create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+@register_warmup
+def warm_database_connection() -> None:
+    """
+    Open pooled connections (including the TLS handshake) before serving traffic.
+    """
+    for client in [get_supabase_client(), *get_replica_clients()]:
+        client.table("pet_types").select("pet_type_id").limit(1).execute()
@@ -0,0 +1,164 @@
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database import ARCHIVE_TABLES, supabase_read_client
+from app.core.metrics import register_metrics
+
+# Key column and columns loaded per table. Every service shares one loader per
+# table, so the column lists are fixed here (users never expose the password hash).
+# Keys missing from an archived table are looked up in its archive table.
+LOADER_TABLES = {
+    "users": ("user_id", "user_id, username, email, role, created_at"),
+    "pets": ("pet_id", "*"),
+    "breeds": ("breed_id", "*"),
+    "pet_types": ("pet_type_id", "*"),
+}
+
+_loaders: ContextVar[Optional[Dict[str, "DataLoader"]]] = ContextVar("dataloaders", default=None)
+
+_stats = {"batches_total": 0, "keys_total": 0, "memo_hits_total": 0}
+register_metrics("dataloader", lambda: dict(_stats))
+
+
+class DataLoader:
+    """
+    Batches and memoizes key lookups within one request.
+
+    ``load`` returns a future and queues its key; the queue is flushed by a
+    callback scheduled on the event loop, so every load issued before the
+    running coroutines next yield (e.g. the branches of an ``asyncio.gather``)
+    is answered by a single call to ``batch_fn``. Each key is requested at
+    most once per loader: later loads of it return the memoized future.
+
+    Loaded values are shared between callers and must be copied before being
+    modified.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Hashable]], Dict[Hashable, Any]], max_batch: int = 200):
+        self._batch_fn = batch_fn
+        self.max_batch = max_batch
+        self._memo: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Tuple[Hashable, asyncio.Future]] = []
+
+    def load(self, key: Hashable) -> "asyncio.Future":
+        """
+        Return a future resolving to the value for ``key`` (None if it does not exist).
+        """
+        future = self._memo.get(key)
+        if future is not None:
+            _stats["memo_hits_total"] += 1
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._memo[key] = future
+        self._queue.append((key, future))
+        if len(self._queue) == 1:
+            loop.call_soon(self._dispatch)
+        return future
+
+    async def load_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """
+        Load several keys in one batch.
+
+        Returns:
+            The values found, keyed by key (None keys and missing rows are left out).
+        """
+        keys = list(dict.fromkeys(key for key in keys if key is not None))
+        values = await asyncio.gather(*(self.load(key) for key in keys))
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def prime(self, key: Hashable, value: Any) -> None:
+        """
+        Memoize a value fetched by other means, unless the key is already loaded.
+        """
+        if key not in self._memo:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._memo[key] = future
+
+    def clear(self, key: Hashable) -> None:
+        """
+        Forget a memoized key, e.g. after the row was updated.
+        """
+        self._memo.pop(key, None)
+
+    def _dispatch(self) -> None:
+        queue, self._queue = self._queue, []
+        for start in range(0, len(queue), self.max_batch):
+            chunk = queue[start:start + self.max_batch]
+            _stats["batches_total"] += 1
+            _stats["keys_total"] += len(chunk)
+            try:
+                values = self._batch_fn([key for key, _ in chunk])
+            except Exception as e:
+                for key, future in chunk:
+                    # Forget failed keys so that a later load retries them
+                    if self._memo.get(key) is future:
+                        del self._memo[key]
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for key, future in chunk:
+                if not future.done():
+                    future.set_result(values.get(key))
+
+
+def _table_batch(table: str) -> Callable[[List[Hashable]], Dict[Hashable, Any]]:
+    key_column, columns = LOADER_TABLES[table]
+
+    def batch(keys: List[Hashable]) -> Dict[Hashable, Any]:
+        rows = supabase_read_client.table(table).select(columns).in_(key_column, keys).execute().data or []
+        values = {row[key_column]: row for row in rows}
+        missing = [key for key in keys if key not in values]
+        if missing and table in ARCHIVE_TABLES:
+            # Archived rows are only looked up for keys missing from the hot table
+            archived = supabase_read_client.table(ARCHIVE_TABLES[table]).select(columns) \
+                .in_(key_column, missing).execute().data or []
+            values.update((row[key_column], row) for row in archived)
+        return values
+    return batch
+
+
+def get_loader(table: str) -> DataLoader:
+    """
+    Return the current request's loader for a table in LOADER_TABLES.
+
+    Outside a request (background tasks, scripts) each call returns a new
+    loader, which still batches the loads issued through it.
+
+    Args:
+        table: Table name, e.g. ``"pets"``.
+    """
+    loaders = _loaders.get()
+    if loaders is None:
+        return DataLoader(_table_batch(table), settings.DATALOADER_MAX_BATCH)
+    loader = loaders.get(table)
+    if loader is None:
+        loader = loaders[table] = DataLoader(_table_batch(table), settings.DATALOADER_MAX_BATCH)
+    return loader
+
+
+class DataLoaderMiddleware:
+    """
+    ASGI middleware giving every HTTP request its own set of loaders.
+
+    Memoized rows therefore live exactly as long as the request, so one
+    request never sees another's (possibly outdated) lookups.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _loaders.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _loaders.reset(token)
@@ -0,0 +1,104 @@
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional
+
+from fastapi import Request, Response, status
+
+from app.core.cache import LRUCache
+
+
+class CachedBody(NamedTuple):
+    """
+    A serialized response body and its entity tag.
+    """
+    body: bytes
+    etag: str
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Build a strong entity tag from a response body.
+    """
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match header matches an entity tag.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def cached_response(request: Request, cached: CachedBody, cache_control: str) -> Response:
+    """
+    Serve a cached JSON body, or 304 Not Modified if the client already has it.
+
+    Args:
+        request: Incoming request (for If-None-Match).
+        cached: Serialized body and ETag.
+        cache_control: Value for the Cache-Control header.
+    """
+    headers = {"ETag": cached.etag, "Cache-Control": cache_control}
+    if etag_matches(request, cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """
+    In-process cache of serialized response bodies for read-mostly endpoints.
+
+    Bodies are serialized once and stored with their ETag, so cache hits skip
+    both the database and JSON encoding.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._cache = LRUCache(max_entries=max_entries, ttl=ttl)
+        self._hits = 0
+        self._misses = 0
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        serialize: Callable[[Any], bytes],
+    ) -> Optional[CachedBody]:
+        """
+        Return the cached body for a key, loading and serializing it on a miss.
+
+        Args:
+            key: Cache key.
+            loader: Coroutine function fetching the data.
+            serialize: Converts the loaded data to JSON bytes.
+
+        Returns:
+            The cached body, or None if the loader returned None (not cached).
+        """
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._hits += 1
+            return cached
+
+        self._misses += 1
+        data = await loader()
+        if data is None:
+            return None
+        body = serialize(data)
+        cached = CachedBody(body, make_etag(body))
+        self._cache.set(key, cached)
+        return cached
+
+    def clear(self) -> None:
+        """
+        Drop every cached body.
+        """
+        self._cache.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return cache size and hit counters.
+        """
+        return {"entries": len(self._cache), "hits": self._hits, "misses": self._misses}
@@ -0,0 +1,202 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from postgrest import SyncPostgrestClient
+from postgrest.utils import SyncClient
+
+from app.core.resilience import CircuitBreakerRegistry
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+# Failures where the request never reached the server, so any method is safe to retry
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# Failures after the request may have been processed; only idempotent reads are retried
+READ_ERRORS = (httpx.ReadTimeout, httpx.ReadError, httpx.RemoteProtocolError)
+
+
+class RetryingTransport(httpx.HTTPTransport):
+    """
+    Pooled HTTP transport that retries failed requests with jittered backoff.
+
+    Connection failures are retried for every method; read failures and
+    502/503/504 responses are retried only for idempotent methods. Backoff
+    sleeps only happen off the event loop (thread pool, task workers): a
+    request issued from a coroutine is retried at most ``loop_retries`` times,
+    immediately, so a sync call made on the loop never stalls other requests.
+    The transport also tracks in-flight requests so pool saturation can be
+    reported.
+    """
+
+    def __init__(
+        self,
+        *,
+        retries: int = 2,
+        backoff: float = 0.1,
+        backoff_max: float = 2.0,
+        loop_retries: int = 1,
+        limits: httpx.Limits = httpx.Limits(),
+        **kwargs: Any,
+    ):
+        super().__init__(limits=limits, **kwargs)
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.loop_retries = loop_retries
+        self.max_connections = limits.max_connections
+        self.max_keepalive_connections = limits.max_keepalive_connections
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._requests_total = 0
+        self._retries_total = 0
+        self._errors_total = 0
+        self._pool_timeouts_total = 0
+
+    def _retry_delay(self, attempt: int) -> float:
+        # Full jitter: uniform over [0, min(cap, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt)))
+
+    @staticmethod
+    def _on_event_loop() -> bool:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+
+    def _track(self, delta: int) -> None:
+        with self._lock:
+            self._in_flight += delta
+            if delta > 0:
+                self._requests_total += 1
+                self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        idempotent = request.method in IDEMPOTENT_METHODS
+        on_loop = self._on_event_loop()
+        retries = min(self.retries, self.loop_retries) if on_loop else self.retries
+        attempt = 0
+        while True:
+            self._track(1)
+            try:
+                response = super().handle_request(request)
+            except CONNECT_ERRORS as exc:
+                if isinstance(exc, httpx.PoolTimeout):
+                    with self._lock:
+                        self._pool_timeouts_total += 1
+                if attempt >= retries:
+                    self._record_error()
+                    raise
+            except READ_ERRORS:
+                if not idempotent or attempt >= retries:
+                    self._record_error()
+                    raise
+            else:
+                if not (idempotent and response.status_code in RETRYABLE_STATUS_CODES and attempt < retries):
+                    return response
+                response.close()
+            finally:
+                self._track(-1)
+
+            with self._lock:
+                self._retries_total += 1
+            if not on_loop:
+                time.sleep(self._retry_delay(attempt))
+            attempt += 1
+
+    def _record_error(self) -> None:
+        with self._lock:
+            self._errors_total += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return connection pool and retry metrics for this transport.
+        """
+        connections = list(self._pool.connections)
+        idle = sum(1 for connection in connections if connection.is_idle())
+        active = len(connections) - idle
+        with self._lock:
+            return {
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections,
+                "connections_open": len(connections),
+                "connections_active": active,
+                "connections_idle": idle,
+                "saturation": round(active / self.max_connections, 3) if self.max_connections else None,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+                "requests_total": self._requests_total,
+                "retries_total": self._retries_total,
+                "errors_total": self._errors_total,
+                "pool_timeouts_total": self._pool_timeouts_total,
+            }
+
+
+class CircuitBreakerTransport(httpx.BaseTransport):
+    """
+    Transport wrapper that guards each PostgREST table with a circuit breaker.
+
+    The table (or RPC function) is taken from the request path. Transport
+    errors and 5xx responses count as failures; while a table's circuit is
+    open, requests to it raise CircuitOpenError without touching the network.
+    """
+
+    def __init__(self, pool: RetryingTransport, breakers: CircuitBreakerRegistry):
+        self.pool = pool
+        self.breakers = breakers
+
+    @staticmethod
+    def _resource(request: httpx.Request) -> str:
+        parts = request.url.path.rstrip("/").split("/")
+        if len(parts) >= 2 and parts[-2] == "rpc":
+            return f"rpc/{parts[-1]}"
+        return parts[-1]
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = self.breakers.get(self._resource(request))
+        breaker.before_call()
+        try:
+            response = self.pool.handle_request(request)
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class PooledPostgrestClient(SyncPostgrestClient):
+    """
+    PostgREST client whose HTTP session uses an explicitly tuned transport.
+    """
+
+    def __init__(self, base_url: str, *, transport: httpx.BaseTransport, **kwargs: Any):
+        self.transport = transport
+        super().__init__(base_url, **kwargs)
+
+    def create_session(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout: Any,
+        verify: bool = True,
+        proxy: Optional[str] = None,
+    ) -> SyncClient:
+        return SyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+            transport=self.transport,
+        )
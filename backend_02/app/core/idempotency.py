@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.cache import LRUCache
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# Response headers that must not be replayed verbatim
+_EXCLUDED_HEADERS = {b"set-cookie", b"date", b"server"}
+
+
+class _StoredResponse:
+    """
+    A completed response kept for replay, along with the request it answered.
+    """
+
+    __slots__ = ("fingerprint", "status", "headers", "body")
+
+    def __init__(self, fingerprint: str, status: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.fingerprint = fingerprint
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class IdempotencyStore:
+    """
+    Bounded TTL store of completed responses plus the requests still in flight.
+
+    The store is per worker process: duplicates are only collapsed when they
+    reach the same worker.
+    """
+
+    def __init__(self, ttl: float = 86400.0, max_entries: int = 10000):
+        self.responses = LRUCache(max_entries=max_entries, ttl=ttl)
+        self.in_flight: Dict[str, asyncio.Future] = {}
+        self.replayed_total = 0
+        self.waited_total = 0
+        self.conflicts_total = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return store size and replay counters.
+        """
+        return {
+            "entries": len(self.responses),
+            "in_flight": len(self.in_flight),
+            "replayed_total": self.replayed_total,
+            "waited_total": self.waited_total,
+            "conflicts_total": self.conflicts_total,
+        }
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware that makes retried POST requests safe to repeat.
+
+    Clients send an ``Idempotency-Key`` header with each logical write. The
+    first response for a key (scoped to the caller's credentials) is kept in
+    an IdempotencyStore; retries with the same key and body get the stored
+    response back without reaching the route handler. A duplicate arriving
+    while the first request is still running waits for it instead of
+    executing concurrently. Server errors (5xx) are not stored, so the client
+    may retry them. Reusing a key with a different request body is rejected
+    with 422.
+    """
+
+    def __init__(
+        self,
+        app,
+        store: IdempotencyStore,
+        paths: Iterable[str],
+        max_body_bytes: int = 65536,
+    ):
+        self.app = app
+        self.store = store
+        self.paths = frozenset(paths)
+        self.max_body_bytes = max_body_bytes
+
+    @staticmethod
+    def _header(scope, name: bytes) -> Optional[str]:
+        for key, value in scope.get("headers", []):
+            if key == name:
+                return value.decode("latin-1")
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        key = self._header(scope, IDEMPOTENCY_HEADER.lower().encode())
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await self._send_error(send, 400, f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters")
+            return
+
+        body = await self._read_body(receive)
+        # Keys are scoped to the caller so clients cannot replay each other's responses
+        caller = self._header(scope, b"authorization") or ""
+        store_key = hashlib.sha256(f"{caller}\x00{scope['path']}\x00{key}".encode()).hexdigest()
+        fingerprint = hashlib.sha256(scope.get("query_string", b"") + b"\x00" + body).hexdigest()
+
+        while True:
+            stored = self.store.responses.get(store_key)
+            if stored is not None:
+                if stored.fingerprint != fingerprint:
+                    self.store.conflicts_total += 1
+                    await self._send_error(
+                        send, 422, f"{IDEMPOTENCY_HEADER} was already used for a different request"
+                    )
+                    return
+                self.store.replayed_total += 1
+                await self._replay(send, stored)
+                return
+
+            pending = self.store.in_flight.get(store_key)
+            if pending is None:
+                break
+            # Another request with this key is running; wait for it, then re-check the store
+            self.store.waited_total += 1
+            await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self.store.in_flight[store_key] = future
+        try:
+            await self._execute(scope, body, send, store_key, fingerprint)
+        finally:
+            del self.store.in_flight[store_key]
+            future.set_result(None)
+
+    async def _execute(self, scope, body: bytes, send, store_key: str, fingerprint: str) -> None:
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return {"type": "http.disconnect"}
+
+        status = 500
+        headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, headers, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() not in _EXCLUDED_HEADERS]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+                if size <= self.max_body_bytes:
+                    chunks.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, replay_receive, send_wrapper)
+
+        if status < 500 and size <= self.max_body_bytes:
+            self.store.responses.set(store_key, _StoredResponse(fingerprint, status, headers, b"".join(chunks)))
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    @staticmethod
+    async def _replay(send, stored: _StoredResponse) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": stored.status,
+            "headers": stored.headers + [(REPLAYED_HEADER.lower().encode(), b"true")],
+        })
+        await send({"type": "http.response.body", "body": stored.body})
+
+    @staticmethod
+    async def _send_error(send, status_code: int, detail: str) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
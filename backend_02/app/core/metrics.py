@@ -0,0 +1,25 @@
+from typing import Any, Callable, Dict
+
+# Registered metric providers, keyed by component name
+_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_metrics(name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    """
+    Register a component that exposes runtime metrics.
+
+    Args:
+        name: Name under which the metrics are reported.
+        provider: Callable returning a snapshot of the component's metrics.
+    """
+    _providers[name] = provider
+
+
+def collect_metrics() -> Dict[str, Any]:
+    """
+    Collect a snapshot from every registered metrics provider.
+
+    Returns:
+        Metrics grouped by component name.
+    """
+    return {name: provider() for name, provider in _providers.items()}
@@ -0,0 +1,217 @@
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent.parent / "migrations"
+
+# First line of a migration that must run outside a transaction (e.g. CREATE INDEX CONCURRENTLY)
+NO_TRANSACTION_MARKER = "-- migrate: no-transaction"
+
+_FILENAME = re.compile(r"^(\d{4})_([a-z0-9_]+)\.sql$")
+
+# Serializes concurrent runners (e.g. several containers starting at once)
+_LOCK_KEY = 4_180_221
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(4) PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum VARCHAR(64) NOT NULL,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+)
+"""
+
+
+class MigrationError(Exception):
+    """
+    Raised when migrations cannot be applied safely.
+    """
+
+
+class Migration:
+    """
+    A versioned SQL file in the migrations directory.
+    """
+
+    __slots__ = ("version", "name", "path", "sql", "checksum", "transactional")
+
+    def __init__(self, path: Path):
+        match = _FILENAME.match(path.name)
+        if match is None:
+            raise MigrationError(f"Migration file '{path.name}' must be named NNNN_description.sql")
+        self.version, self.name = match.groups()
+        self.path = path
+        self.sql = path.read_text(encoding="utf-8")
+        self.checksum = hashlib.sha256(self.sql.encode("utf-8")).hexdigest()
+        self.transactional = not self.sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+
+    def statements(self) -> List[str]:
+        """
+        Split a no-transaction migration into its statements.
+
+        Only plain statements are supported here (no function bodies), since
+        each one is sent separately.
+        """
+        lines = [line for line in self.sql.splitlines() if not line.strip().startswith("--")]
+        return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+def discover_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """
+    Load the migration files in a directory, ordered by version.
+
+    Raises:
+        MigrationError: If a file is misnamed or two files share a version.
+    """
+    migrations = [Migration(path) for path in sorted(directory.glob("*.sql"))]
+    versions = [migration.version for migration in migrations]
+    duplicates = sorted({version for version in versions if versions.count(version) > 1})
+    if duplicates:
+        raise MigrationError(f"Duplicate migration versions: {', '.join(duplicates)}")
+    return migrations
+
+
+class MigrationRunner:
+    """
+    Applies pending migrations to a Postgres database and records them in schema_migrations.
+
+    Each migration runs in its own transaction, except files starting with
+    NO_TRANSACTION_MARKER, whose statements run one by one in autocommit mode.
+    Applied files are checksummed; editing one afterwards is reported as drift
+    instead of being silently ignored.
+    """
+
+    def __init__(self, database_url: str, directory: Path = MIGRATIONS_DIR):
+        self.database_url = database_url
+        self.directory = directory
+
+    def connect(self):
+        """
+        Open an autocommit connection to the database.
+
+        Raises:
+            MigrationError: If the database is unreachable.
+        """
+        # Deferred import: psycopg is only needed by the migration tooling
+        import psycopg
+
+        try:
+            return psycopg.connect(self.database_url, autocommit=True)
+        except psycopg.OperationalError as e:
+            raise MigrationError(f"Could not connect to the database: {e}") from e
+
+    def _applied(self, conn) -> Dict[str, Dict[str, Any]]:
+        conn.execute(_SCHEMA)
+        rows = conn.execute("SELECT version, name, checksum, applied_at FROM schema_migrations").fetchall()
+        return {row[0]: {"name": row[1], "checksum": row[2], "applied_at": row[3]} for row in rows}
+
+    def status(self) -> List[Dict[str, Any]]:
+        """
+        List every migration with its state: ``applied``, ``pending`` or ``modified``.
+        """
+        with self.connect() as conn:
+            applied = self._applied(conn)
+        result = []
+        for migration in discover_migrations(self.directory):
+            record = applied.get(migration.version)
+            if record is None:
+                state = "pending"
+            elif record["checksum"] != migration.checksum:
+                state = "modified"
+            else:
+                state = "applied"
+            result.append({
+                "version": migration.version,
+                "name": migration.name,
+                "state": state,
+                "applied_at": record["applied_at"] if record else None,
+            })
+        return result
+
+    def migrate(self, target: Optional[str] = None) -> List[Migration]:
+        """
+        Apply pending migrations in order.
+
+        Args:
+            target: Last version to apply (defaults to the newest).
+
+        Returns:
+            The migrations that were applied.
+
+        Raises:
+            MigrationError: If an applied migration was modified, or a
+                no-transaction migration left an invalid index behind.
+        """
+        migrations = discover_migrations(self.directory)
+        done = []
+        with self.connect() as conn:
+            conn.execute("SELECT pg_advisory_lock(%s)", (_LOCK_KEY,))
+            try:
+                applied = self._applied(conn)
+                for migration in migrations:
+                    if target is not None and migration.version > target:
+                        break
+                    record = applied.get(migration.version)
+                    if record is not None:
+                        if record["checksum"] != migration.checksum:
+                            raise MigrationError(
+                                f"Migration {migration.path.name} was modified after it was applied; "
+                                "add a new migration instead"
+                            )
+                        continue
+                    logger.info("Applying migration %s", migration.path.name)
+                    self._apply(conn, migration)
+                    done.append(migration)
+            finally:
+                conn.execute("SELECT pg_advisory_unlock(%s)", (_LOCK_KEY,))
+        return done
+
+    def baseline(self, version: str) -> List[Migration]:
+        """
+        Record migrations up to ``version`` as applied without running them.
+
+        Only for databases whose schema already matches ``version``, e.g.
+        restored from a dump. Databases created by the old database_setup.sql
+        script lack objects added in 0001 and must be upgraded with ``up``.
+        """
+        marked = []
+        with self.connect() as conn:
+            applied = self._applied(conn)
+            for migration in discover_migrations(self.directory):
+                if migration.version > version:
+                    break
+                if migration.version not in applied:
+                    self._record(conn, migration)
+                    marked.append(migration)
+        return marked
+
+    def _apply(self, conn, migration: Migration) -> None:
+        if migration.transactional:
+            with conn.transaction():
+                conn.execute(migration.sql)
+                self._record(conn, migration)
+            return
+
+        for statement in migration.statements():
+            conn.execute(statement)
+        # A failed CREATE INDEX CONCURRENTLY leaves an invalid index that IF NOT EXISTS would skip next time
+        invalid = [row[0] for row in conn.execute(
+            "SELECT indexrelid::regclass::text FROM pg_index WHERE NOT indisvalid"
+        ).fetchall()]
+        if invalid:
+            raise MigrationError(
+                f"Migration {migration.path.name} left invalid indexes ({', '.join(invalid)}); "
+                "drop them and run the migrations again"
+            )
+        self._record(conn, migration)
+
+    @staticmethod
+    def _record(conn, migration: Migration) -> None:
+        conn.execute(
+            "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+            (migration.version, migration.name, migration.checksum),
+        )
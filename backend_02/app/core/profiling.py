@@ -0,0 +1,358 @@
+import asyncio
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from jose import JWTError, jwt
+
+from app.core.auth import ALGORITHM
+from app.core.config import settings
+from app.core.database import supabase_read_client
+
+# Leaf frame recorded while the request is suspended (waiting on I/O, a lock, a thread)
+AWAITING_FRAME = "[awaiting]"
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Frame labels per code object; bounded by the amount of loaded code
+_labels: Dict[Any, str] = {}
+
+
+def _frame_label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        path = code.co_filename
+        if path.startswith(_BACKEND_DIR):
+            path = os.path.relpath(path, _BACKEND_DIR)
+        elif "site-packages" in path:
+            path = path.split("site-packages" + os.sep, 1)[-1]
+        label = _labels[code] = f"{code.co_name} ({path}:{code.co_firstlineno})"
+    return label
+
+
+class Profile:
+    """
+    Stack samples of one request, root frame first.
+
+    Samples taken while the request's task was suspended end in
+    AWAITING_FRAME below the coroutine it is suspended in, so the profile
+    shows where wall-clock time went, not just CPU time.
+    """
+
+    def __init__(self, method: str, path: str, trigger: str, task: asyncio.Task, thread_id: int):
+        self.profile_id = str(uuid.uuid4())
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.status: Optional[int] = None
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.truncated = False
+        self.samples: List[Tuple[float, Tuple[str, ...]]] = []
+        self._task = task
+        self._thread_id = thread_id
+        self._started = time.perf_counter()
+
+    def sample(self, frames: Dict[int, Any], now: float) -> None:
+        """
+        Record the request's current stack. Called from the sampler thread.
+        """
+        if len(self.samples) >= settings.PROFILING_MAX_SAMPLES:
+            self.truncated = True
+            return
+        coro = self._task.get_coro()
+        if getattr(coro, "cr_running", False):
+            # The task is on the CPU: take the thread's stack down to the task's coroutine
+            stack = []
+            frame = frames.get(self._thread_id)
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                if frame is coro.cr_frame:
+                    break
+                frame = frame.f_back
+            stack.reverse()
+        else:
+            # Suspended: follow the chain of awaited coroutines
+            stack = []
+            while coro is not None:
+                frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+                if frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+            stack.append(AWAITING_FRAME)
+        self.samples.append((now - self._started, tuple(stack)))
+
+    def finish(self, status: Optional[int]) -> None:
+        self.status = status
+        self.duration = time.perf_counter() - self._started
+        self._task = None
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the profile's request details and sample counts.
+        """
+        awaiting = sum(1 for _, stack in self.samples if stack[-1] == AWAITING_FRAME)
+        return {
+            "profile_id": self.profile_id,
+            "method": self.method,
+            "path": self.path,
+            "trigger": self.trigger,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 2),
+            "samples": len(self.samples),
+            "awaiting_samples": awaiting,
+            "truncated": self.truncated,
+        }
+
+    def collapsed(self) -> Counter:
+        """
+        Return sample counts per stack, for collapsed-stack output.
+        """
+        return Counter(stack for _, stack in self.samples)
+
+    def speedscope(self) -> Dict[str, Any]:
+        """
+        Return the profile as a speedscope sampled profile (frames are indexes into ``frames``).
+        """
+        frames: Dict[str, int] = {}
+        samples, weights, previous = [], [], 0.0
+        for elapsed, stack in self.samples:
+            samples.append([frames.setdefault(label, len(frames)) for label in stack])
+            weights.append(round((elapsed - previous) * 1000, 3))
+            previous = elapsed
+        return {
+            "frames": list(frames),
+            "profile": {
+                "type": "sampled",
+                "name": f"{self.method} {self.path} ({self.profile_id})",
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(self.duration * 1000, 3),
+                "samples": samples,
+                "weights": weights,
+            },
+        }
+
+
+def to_collapsed(profiles: List[Profile]) -> str:
+    """
+    Merge profiles into collapsed-stack text (``frame;frame;frame count`` per line),
+    as read by flamegraph.pl, inferno and speedscope.
+    """
+    counts: Counter = Counter()
+    for profile in profiles:
+        counts.update(profile.collapsed())
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in sorted(counts.items()))
+
+
+def to_speedscope(profiles: List[Profile]) -> Dict[str, Any]:
+    """
+    Export profiles as one speedscope JSON document with a shared frame table.
+    """
+    frames: Dict[str, int] = {}
+    exported = []
+    for profile in profiles:
+        data = profile.speedscope()
+        remap = [frames.setdefault(label, len(frames)) for label in data["frames"]]
+        exported.append(dict(data["profile"], samples=[[remap[index] for index in sample]
+                                                       for sample in data["profile"]["samples"]]))
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "exporter": settings.PROJECT_NAME,
+        "name": "Request profiles",
+        "activeProfileIndex": 0,
+        "shared": {"frames": [{"name": label} for label in frames]},
+        "profiles": exported,
+    }
+
+
+class RequestProfiler:
+    """
+    Sampling profiler for individual requests.
+
+    While at least one request is being profiled, a daemon thread wakes every
+    PROFILING_INTERVAL_SECONDS and records the stack of each profiled
+    request's task (on-CPU stack or await chain, see Profile). The thread
+    exits when no request is being profiled, so the profiler costs nothing
+    while idle. Finished profiles are kept in a ring buffer of the most recent
+    PROFILING_BUFFER_SIZE.
+
+    Which requests are profiled is decided by ``enabled``, ``routes`` and
+    ``sample_rate``, initialized from the settings and adjustable at run
+    time through the admin endpoints; the profiling header works regardless
+    (see ProfilingMiddleware). Like the buffer, they are per worker process:
+    with several SERVER_WORKERS a configuration change only reaches the worker
+    that handled it, and a profile is only listed by the worker that recorded
+    it. Run a single worker while profiling by route or sampling rate. Work
+    handed to thread pools (sync dependencies, run_in_threadpool) appears as
+    time awaiting, not as its own stacks.
+    """
+
+    def __init__(self):
+        self.enabled = settings.PROFILING_ENABLED
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.set_routes(settings.PROFILING_ROUTES)
+        self.profiles: deque = deque(maxlen=settings.PROFILING_BUFFER_SIZE)
+        self.profiled_total = 0
+        self._active: Dict[str, Profile] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def set_routes(self, routes: List[str]) -> None:
+        """
+        Profile every request to these path templates (e.g. ``/api/v1/pets/{pet_id}``).
+        """
+        self.routes = list(routes)
+        self._route_patterns = [
+            re.compile("^" + re.sub(r"\\\{[^/]+?\\\}", "[^/]+", re.escape(route.rstrip("/"))) + "/?$")
+            for route in self.routes
+        ]
+
+    def trigger_for(self, path: str) -> Optional[str]:
+        """
+        Return why a request to ``path`` should be profiled, or None.
+        """
+        if any(pattern.match(path) for pattern in self._route_patterns):
+            return "route"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    def start(self, method: str, path: str, trigger: str) -> Profile:
+        profile = Profile(method, path, trigger, asyncio.current_task(), threading.get_ident())
+        with self._lock:
+            self._active[profile.profile_id] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        return profile
+
+    def stop(self, profile: Profile, status: Optional[int]) -> None:
+        with self._lock:
+            self._active.pop(profile.profile_id, None)
+            profile.finish(status)
+        self.profiles.append(profile)
+        self.profiled_total += 1
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(settings.PROFILING_INTERVAL_SECONDS)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                frames = sys._current_frames()
+                now = time.perf_counter()
+                for profile in self._active.values():
+                    profile.sample(frames, now)
+                del frames
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return next((profile for profile in self.profiles if profile.profile_id == profile_id), None)
+
+    def clear(self) -> None:
+        self.profiles.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return profiler state and counters.
+        """
+        return {
+            "enabled": self.enabled,
+            "active": len(self._active),
+            "buffered": len(self.profiles),
+            "profiled_total": self.profiled_total,
+        }
+
+
+_profiler: Optional[RequestProfiler] = None
+
+
+def get_profiler() -> RequestProfiler:
+    """
+    Return this worker's request profiler, creating it on first use.
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = RequestProfiler()
+    return _profiler
+
+
+def _is_admin_token(authorization: str) -> bool:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        user_id = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except JWTError:
+        return False
+    if not user_id:
+        return False
+    result = supabase_read_client.table("users").select("role").eq("user_id", user_id).execute()
+    return bool(result.data) and result.data[0].get("role") == "admin"
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles selected requests with the RequestProfiler.
+
+    A request is profiled when it carries the PROFILING_HEADER with an
+    admin's bearer token, or, while the profiler is enabled, when it matches
+    a profiled route or is picked at the sampling rate. Profiled responses
+    carry the profile ID in ``X-Profile-Id``; the profile is kept by the
+    worker process that served the request. Requests without the header pass
+    straight through while the profiler is disabled, as do requests under
+    ``exempt_prefixes``.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler, exempt_prefixes: Tuple[str, ...] = ()):
+        self.app = app
+        self.profiler = profiler
+        self.exempt_prefixes = tuple(exempt_prefixes)
+        self.header = settings.PROFILING_HEADER.lower().encode()
+
+    def _trigger(self, scope) -> Optional[str]:
+        headers = dict(scope.get("headers", []))
+        if headers.get(self.header, b"") not in (b"", b"0", b"false"):
+            authorization = headers.get(b"authorization", b"").decode("latin-1")
+            if _is_admin_token(authorization):
+                return "header"
+        # Route and sampling triggers only apply while the profiler is enabled
+        if not self.profiler.enabled:
+            return None
+        return self.profiler.trigger_for(scope["path"])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        trigger = self._trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = self.profiler.start(scope["method"], scope["path"], trigger)
+        status = None
+
+        async def send_with_profile_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile.profile_id.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            self.profiler.stop(profile, status)
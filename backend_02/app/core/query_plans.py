@@ -0,0 +1,166 @@
+import json
+from typing import Any, Dict, Iterator, List, Tuple
+
+from app.services.pet_query import INDEXED_EQUALITY_COLUMNS, INDEXED_RANGE_COLUMNS, SORT_ORDERS
+
+# Tables small enough that a sequential scan is the right plan
+SMALL_TABLES = {"pet_types", "breeds", "analytics_pet_type_summary", "schema_migrations"}
+
+_ID = "'00000000-0000-0000-0000-000000000001'"
+_ID2 = "'00000000-0000-0000-0000-000000000002'"
+
+_SAMPLE_VALUES = {"status": "'available'", "gender": "'female'"}
+_SAMPLE_RANGES = {"age": ("1", "3"), "created_at": ("'2025-01-01'", "'2025-02-01'")}
+
+
+def _pet_listing_queries() -> List[Tuple[str, str]]:
+    """
+    Every pet listing shape the filter compiler accepts (app/services/pet_query.py).
+
+    One query per indexed column driving the listing, unordered and in every
+    sort order, so a column added to the compiler's index sets is checked here.
+    """
+    drivers = [("", "")]
+    for column in sorted(INDEXED_EQUALITY_COLUMNS):
+        drivers.append((column, f"WHERE {column} = {_SAMPLE_VALUES.get(column, _ID)} "))
+    for column in sorted(INDEXED_RANGE_COLUMNS):
+        low, high = _SAMPLE_RANGES[column]
+        drivers.append((f"{column} range", f"WHERE {column} >= {low} AND {column} < {high} "))
+
+    orderings = [("", "")] + [
+        (f"sort={sort.value}", "ORDER BY " + ", ".join(f"{column} {'DESC' if desc else 'ASC'}" for column, desc in order) + " ")
+        for sort, order in SORT_ORDERS.items()
+    ]
+    return [
+        (f"PetService.get_pets({', '.join(part for part in (driver, sort) if part)})",
+         f"SELECT * FROM pets {where}{order_by}LIMIT 100 OFFSET 0")
+        for driver, where in drivers
+        for sort, order_by in orderings
+    ]
+
+
+# SQL equivalents of the PostgREST queries issued by the services, keyed by caller
+SERVICE_QUERIES: List[Tuple[str, str]] = _pet_listing_queries() + [
+    ("PetService.get_pets(pet_type_id, status)",
+     f"SELECT * FROM pets WHERE pet_type_id = {_ID} AND status = 'available' LIMIT 100 OFFSET 0"),
+    ("PetService.get_pets(pet_type_id in, age, newest)",
+     f"SELECT * FROM pets WHERE pet_type_id IN ({_ID}, {_ID2}) AND age >= 1 AND age <= 5 "
+     "ORDER BY created_at DESC, pet_id LIMIT 100 OFFSET 0"),
+    ("PetService.get_pets(gender, exclude, newest)",
+     "SELECT * FROM pets WHERE gender = 'female' AND status NOT IN ('adopted') "
+     "ORDER BY created_at DESC, pet_id LIMIT 100 OFFSET 0"),
+    ("PetService.count_pets(exact)",
+     f"SELECT count(*) FROM pets WHERE pet_type_id = {_ID} AND status = 'available'"),
+    ("PetService.get_pet_by_id", f"SELECT * FROM pets WHERE pet_id = {_ID}"),
+    ("PetFeatureIndex.rebuild",
+     "SELECT * FROM pets WHERE status = 'available' ORDER BY pet_id LIMIT 1000 OFFSET 0"),
+    ("AdoptionService.get_application_by_id", f"SELECT * FROM adoption_applications WHERE application_id = {_ID}"),
+    ("AdoptionService.get_applications_by_adopter", f"SELECT * FROM adoption_applications WHERE adopter_id = {_ID}"),
+    ("AdoptionService.get_applications_by_adopter(archive)",
+     f"SELECT * FROM adoption_applications_archive WHERE adopter_id = {_ID}"),
+    ("AdoptionService.get_applications_for_pet_owner",
+     f"SELECT * FROM adoption_applications WHERE pet_id IN ({_ID}, {_ID2})"),
+    ("AdoptionService.reject_competing_applications",
+     f"SELECT application_id FROM adoption_applications WHERE pet_id = {_ID} AND application_id <> {_ID2}"),
+    ("SuccessStoryService.get_all_stories", "SELECT * FROM success_stories ORDER BY published_at DESC"),
+    ("SuccessStoryService.get_story", f"SELECT * FROM success_stories WHERE story_id = {_ID}"),
+    ("UserService.get_user_by_username", "SELECT * FROM users WHERE username = 'someone'"),
+    ("UserService.get_user_by_email", "SELECT * FROM users WHERE email = 'someone@example.com'"),
+    ("UserService.get_user_with_profile",
+     f"SELECT u.*, p.* FROM users u LEFT JOIN user_profiles p ON p.user_id = u.user_id WHERE u.user_id = {_ID}"),
+    ("UserService.get_user_profile", f"SELECT * FROM user_profiles WHERE user_id = {_ID}"),
+    ("get_loader(users)",
+     f"SELECT user_id, username, email, role, created_at FROM users WHERE user_id IN ({_ID}, {_ID2})"),
+    ("get_loader(pets)", f"SELECT * FROM pets WHERE pet_id IN ({_ID}, {_ID2})"),
+    ("get_loader(pets) archive fallback", f"SELECT * FROM pets_archive WHERE pet_id IN ({_ID}, {_ID2})"),
+    ("VisitService.get_visits_by_adopter",
+     f"SELECT * FROM visit_schedules WHERE adopter_id = {_ID} ORDER BY scheduled_date"),
+    ("VisitCalendarIndex._load_active_visits",
+     f"SELECT visit_id, scheduled_date, duration_minutes FROM visit_schedules "
+     f"WHERE pet_id IN ({_ID}, {_ID2}) AND status IN ('pending', 'confirmed') AND scheduled_date >= NOW()"),
+    ("VisitService._confirmed_conflicts",
+     f"SELECT visit_id, scheduled_date, duration_minutes FROM visit_schedules WHERE owner_id = {_ID} "
+     f"AND status = 'confirmed' AND visit_id <> {_ID2} AND scheduled_date >= NOW() "
+     "AND scheduled_date < NOW() + INTERVAL '1 hour'"),
+    ("ResourceService.get_resources",
+     "SELECT * FROM resources WHERE category = 'dogs' ORDER BY published_at DESC LIMIT 50 OFFSET 0"),
+    ("AnalyticsService.get_shelter_breakdown",
+     "SELECT * FROM analytics_owner_summary ORDER BY pets_adopted DESC LIMIT 50 OFFSET 0"),
+    ("AnalyticsService.get_pet_funnels(owner_id)",
+     f"SELECT * FROM analytics_pet_funnel WHERE owner_id = {_ID} ORDER BY applications_total DESC LIMIT 50 OFFSET 0"),
+    ("ExportService.stream(pets, owner)",
+     f"SELECT * FROM pets WHERE owner_id = {_ID} AND pet_id > {_ID2} ORDER BY pet_id LIMIT 1000"),
+    ("ExportService.stream(applications, adopter)",
+     f"SELECT * FROM adoption_applications WHERE adopter_id = {_ID} AND application_id > {_ID2} "
+     "ORDER BY application_id LIMIT 1000"),
+    ("ExportService.stream(pets archive, owner)",
+     f"SELECT * FROM pets_archive WHERE owner_id = {_ID} AND pet_id > {_ID2} ORDER BY pet_id LIMIT 1000"),
+    ("SavedSearchService.get_searches_by_user",
+     f"SELECT * FROM saved_searches WHERE user_id = {_ID} ORDER BY created_at"),
+    ("SavedSearchIndex.rebuild",
+     f"SELECT search_id, user_id, name, filters FROM saved_searches WHERE search_id > {_ID} "
+     "ORDER BY search_id LIMIT 1000"),
+    ("NotificationDispatcher.dispatch_once",
+     "SELECT * FROM notification_outbox WHERE event_id IN (1, 2, 3)"),
+]
+
+
+def _walk(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def plan_problems(plan: Dict[str, Any]) -> List[str]:
+    """
+    Find scans in an EXPLAIN (FORMAT JSON) plan that read a large table without an index condition.
+
+    Flags sequential scans, and index scans that walk a whole index while
+    filtering rows (what the planner falls back to when sequential scans are
+    disabled but no index matches the filter).
+
+    Args:
+        plan: The ``Plan`` node of the EXPLAIN output.
+
+    Returns:
+        A description of each offending scan.
+    """
+    problems = []
+    for node in _walk(plan):
+        table = node.get("Relation Name")
+        if table is None or table in SMALL_TABLES:
+            continue
+        if node["Node Type"] == "Seq Scan":
+            problems.append(f"Seq Scan on {table}")
+        elif node["Node Type"] in ("Index Scan", "Index Only Scan") \
+                and "Index Cond" not in node and "Filter" in node:
+            problems.append(f"full {node['Node Type']} using {node['Index Name']} on {table} (filter: {node['Filter']})")
+    return problems
+
+
+def check_query_plans(conn, queries: List[Tuple[str, str]] = SERVICE_QUERIES) -> Dict[str, List[str]]:
+    """
+    EXPLAIN each service query and report those whose plan scans a large table without an index.
+
+    Sequential scans are disabled for the check, so the result does not
+    depend on how much data the (usually near-empty) test database holds: a
+    sequential scan still appearing means no index can serve the query.
+
+    Args:
+        conn: Open psycopg connection to a migrated database.
+        queries: ``(caller, sql)`` pairs to check.
+
+    Returns:
+        Problems keyed by caller; empty when every plan uses an index.
+    """
+    failures = {}
+    for caller, sql in queries:
+        with conn.transaction(force_rollback=True):
+            conn.execute("SET LOCAL enable_seqscan = off")
+            output = conn.execute(f"EXPLAIN (FORMAT JSON) {sql}").fetchone()[0]
+        if isinstance(output, str):
+            output = json.loads(output)
+        problems = plan_problems(output[0]["Plan"])
+        if problems:
+            failures[caller] = problems
+    return failures
@@ -0,0 +1,97 @@
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Optional
+
+from app.core.config import settings
+
+# Cookie (browsers) and header (API clients) carrying the read-your-writes deadline
+PIN_COOKIE_NAME = "read_primary_until"
+PIN_HEADER_NAME = "X-Read-Primary-Until"
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_pinned_to_primary: ContextVar[bool] = ContextVar("pinned_to_primary", default=False)
+
+
+def reads_pinned_to_primary() -> bool:
+    """
+    Whether reads in the current request must go to the primary.
+    """
+    return _pinned_to_primary.get()
+
+
+def pin_reads_to_primary() -> None:
+    """
+    Route the remaining reads of the current request to the primary.
+    """
+    _pinned_to_primary.set(True)
+
+
+def _parse_deadline(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware that pins a client's reads to the primary after it writes.
+
+    Successful non-GET requests receive a short-lived deadline as both a cookie
+    and a response header. Requests presenting an unexpired deadline (via the
+    cookie or the header) read from the primary instead of a replica, so users
+    always see their own writes despite replication lag.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def _request_deadline(self, scope) -> Optional[float]:
+        header_name = PIN_HEADER_NAME.lower().encode()
+        for name, value in scope.get("headers", []):
+            if name == header_name:
+                return _parse_deadline(value.decode("latin-1"))
+            if name == b"cookie":
+                cookie = SimpleCookie()
+                try:
+                    cookie.load(value.decode("latin-1"))
+                except Exception:
+                    continue
+                if PIN_COOKIE_NAME in cookie:
+                    return _parse_deadline(cookie[PIN_COOKIE_NAME].value)
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        window = settings.READ_YOUR_WRITES_WINDOW_SECONDS
+        now = time.time()
+        deadline = self._request_deadline(scope)
+        # Ignore deadlines further out than one window so clients cannot pin indefinitely
+        pinned = deadline is not None and now < deadline <= now + window
+        token = _pinned_to_primary.set(pinned)
+
+        is_write = scope["method"] not in SAFE_METHODS
+
+        async def send_wrapper(message):
+            if is_write and message["type"] == "http.response.start" and message["status"] < 400:
+                until = f"{time.time() + window:.3f}"
+                headers = list(message.get("headers", []))
+                headers.append((PIN_HEADER_NAME.lower().encode(), until.encode()))
+                headers.append((
+                    b"set-cookie",
+                    f"{PIN_COOKIE_NAME}={until}; Max-Age={window}; Path=/; HttpOnly; SameSite=Lax".encode(),
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper if is_write else send)
+        finally:
+            _pinned_to_primary.reset(token)
@@ -0,0 +1,221 @@
+import math
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+T = TypeVar("T")
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling the database while a table's circuit is open.
+    """
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit open for '{name}'")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``reset_timeout`` seconds. A single probe call is then
+    allowed through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._rejected_total = 0
+        self._opened_total = 0
+
+    def before_call(self) -> None:
+        """
+        Check whether a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or a probe is already in flight.
+        """
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if self._state == STATE_OPEN and remaining <= 0:
+                self._state = STATE_HALF_OPEN
+            if self._state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self._rejected_total += 1
+            raise CircuitOpenError(self.name, max(remaining, 1.0))
+
+    def record_success(self) -> None:
+        """
+        Record a successful call, closing the circuit.
+        """
+        with self._lock:
+            self._state = STATE_CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """
+        Record a failed call, opening the circuit once the threshold is reached.
+        """
+        with self._lock:
+            self._failures += 1
+            if self._state == STATE_HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != STATE_OPEN:
+                    self._opened_total += 1
+                self._state = STATE_OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the breaker's state and counters.
+        """
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "opened_total": self._opened_total,
+                "rejected_total": self._rejected_total,
+            }
+
+
+class CircuitBreakerRegistry:
+    """
+    Lazily created circuit breakers, one per table (or RPC function).
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        """
+        Return the breaker for a table, creating it on first use.
+        """
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    name, CircuitBreaker(name, self.failure_threshold, self.reset_timeout)
+                )
+        return breaker
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the state of every breaker created so far.
+        """
+        return {name: breaker.snapshot() for name, breaker in list(self._breakers.items())}
+
+
+class StaleReadCache:
+    """
+    Last-known-good responses for public read endpoints.
+
+    Successful reads are remembered; while the underlying table's circuit is
+    open, the remembered value is served instead (up to ``max_stale`` seconds old).
+    """
+
+    def __init__(self, max_entries: int, max_stale: float):
+        self.max_stale = max_stale
+        self._cache = LRUCache(max_entries=max_entries, ttl=max_stale)
+        self._served_stale_total = 0
+
+    async def fetch(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> Tuple[T, Optional[float]]:
+        """
+        Load a value, falling back to the last known good value if the circuit is open.
+
+        Args:
+            key: Cache key identifying the request.
+            loader: Coroutine function performing the read.
+
+        Returns:
+            The value and its staleness in seconds (None when freshly loaded).
+
+        Raises:
+            CircuitOpenError: If the circuit is open and no cached value exists.
+        """
+        try:
+            value = await loader()
+        except CircuitOpenError:
+            hit = self._cache.get_with_age(key)
+            if hit is None:
+                raise
+            self._served_stale_total += 1
+            return hit
+
+        if value is not None:
+            self._cache.set(key, value)
+        return value, None
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Forget the remembered value for a key.
+        """
+        self._cache.delete(key)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return cache size and fallback counters.
+        """
+        return {"entries": len(self._cache), "served_stale_total": self._served_stale_total}
+
+
+@lru_cache
+def get_stale_reads() -> StaleReadCache:
+    """
+    Return this process's stale read cache, created from the settings on first use.
+    """
+    return StaleReadCache(settings.STALE_CACHE_MAX_ENTRIES, settings.STALE_CACHE_MAX_AGE_SECONDS)
+
+
+def mark_stale(response: Response, age: Optional[float]) -> None:
+    """
+    Flag a response as served from the stale cache.
+
+    Args:
+        response: Response whose headers should be updated.
+        age: Staleness in seconds, or None if the data is fresh.
+    """
+    if age is None:
+        return
+    response.headers["X-Cache-Status"] = "stale"
+    response.headers["Age"] = str(int(age))
+    response.headers["Warning"] = '110 - "Response is Stale"'
+
+
+async def circuit_open_exception_handler(request: Request, exc: CircuitOpenError) -> JSONResponse:
+    """
+    Translate an open circuit into a fast 503 response.
+    """
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": f"Database temporarily unavailable for '{exc.name}', please retry later"},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
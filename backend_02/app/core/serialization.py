@@ -0,0 +1,97 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import PydanticUndefined, to_json
+
+from app.core.config import settings
+
+
+@lru_cache(maxsize=None)
+def get_adapter(tp: Any) -> TypeAdapter:
+    """
+    Return a TypeAdapter for a type, building its validator and serializer once per process.
+
+    Args:
+        tp: Any type Pydantic can validate, e.g. ``List[PetResponse]``.
+    """
+    return TypeAdapter(tp)
+
+
+@lru_cache(maxsize=None)
+def _projection(model: Type[BaseModel]) -> Tuple[Tuple[Tuple[str, Any], ...], Tuple[Tuple[str, Callable[[], Any]], ...]]:
+    # (field name, default) pairs, plus the fields whose defaults come from a factory
+    defaults = []
+    factories = []
+    for name, field in model.model_fields.items():
+        defaults.append((name, None if field.default is PydanticUndefined else field.default))
+        if field.default_factory is not None:
+            factories.append((name, field.default_factory))
+    return tuple(defaults), tuple(factories)
+
+
+def project(model: Type[BaseModel], row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shape a trusted row like a model's serialized output, without validating it.
+
+    Keeps exactly the model's fields, filling missing ones with their defaults
+    (``None`` for required fields). Values are passed through as-is, so the
+    row must already hold JSON-compatible values of the right types.
+
+    Args:
+        model: Response model (with flat fields).
+        row: Row as returned by PostgREST (plus any joined names).
+    """
+    defaults, factories = _projection(model)
+    projected = {name: row.get(name, default) for name, default in defaults}
+    for name, factory in factories:
+        if name not in row:
+            projected[name] = factory()
+    return projected
+
+
+def validated_json(tp: Any, data: Any) -> bytes:
+    """
+    Validate data against a type and serialize it to JSON in one pass through pydantic-core.
+    """
+    adapter = get_adapter(tp)
+    return adapter.dump_json(adapter.validate_python(data))
+
+
+def model_list_json(model: Type[BaseModel], rows: Iterable[Dict[str, Any]]) -> bytes:
+    """
+    Serialize database rows as a JSON array of ``model``.
+
+    With TRUSTED_SERIALIZATION enabled, rows read from our own database are
+    projected onto the model's fields and encoded directly, skipping
+    validation; otherwise they are validated with a cached TypeAdapter.
+
+    Args:
+        model: Response model of each item.
+        rows: Rows from the data client.
+
+    Returns:
+        The encoded JSON array.
+    """
+    if settings.TRUSTED_SERIALIZATION:
+        return to_json([project(model, row) for row in rows])
+    return validated_json(List[model], list(rows))
+
+
+def model_list_response(model: Type[BaseModel], rows: Iterable[Dict[str, Any]], response: Optional[Response] = None) -> Response:
+    """
+    Build a JSON response for a list route from database rows (see ``model_list_json``).
+
+    Returning a Response from a route bypasses FastAPI's own validation and
+    encoding of the ``response_model``, which is still used for the OpenAPI schema.
+
+    Args:
+        model: Response model of each item.
+        rows: Rows from the data client.
+        response: The route's injected Response, whose headers are carried over.
+    """
+    headers = dict(response.headers) if response is not None else None
+    if headers:
+        headers.pop("content-length", None)
+    return Response(model_list_json(model, rows), media_type="application/json", headers=headers)
@@ -0,0 +1,323 @@
+import asyncio
+import inspect
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DEAD = "dead"
+
+# Registered task handlers, keyed by task name
+_handlers: Dict[str, Callable[..., Any]] = {}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    run_at REAL NOT NULL,
+    lease_until REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready_idx ON jobs (status, run_at);
+"""
+
+
+def register_task(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Register a function as the handler for a named background task.
+
+    Handlers receive the job payload as keyword arguments and may be plain
+    functions (run in the thread pool) or coroutine functions. Jobs are
+    delivered at least once, so handlers must be safe to run again.
+
+    Args:
+        name: Task name used when enqueueing.
+    """
+    def decorator(handler: Callable[..., Any]) -> Callable[..., Any]:
+        _handlers[name] = handler
+        return handler
+    return decorator
+
+
+class TaskQueue:
+    """
+    Durable asyncio task queue backed by a local SQLite file.
+
+    Jobs are written to disk when enqueued, so they survive restarts. Each
+    worker process runs ``concurrency`` consumers that claim jobs with a lease;
+    a job whose lease expires (for example because its process died) becomes
+    claimable again. Failed jobs are retried with jittered exponential backoff
+    and moved to the dead-letter list after ``max_attempts`` tries.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        concurrency: int = 4,
+        max_attempts: int = 5,
+        backoff: float = 1.0,
+        backoff_max: float = 300.0,
+        lease: float = 60.0,
+        poll_interval: float = 1.0,
+    ):
+        self.path = path
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.lease = lease
+        self.poll_interval = poll_interval
+
+        self._db_lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_pid: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+        self._stopping = False
+        self._running = 0
+        self._completed_total = 0
+        self._retried_total = 0
+        self._dead_total = 0
+
+    # -- storage ---------------------------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if self._connection is None or self._connection_pid != pid:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+            self._connection_pid = pid
+        return self._connection
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._db_lock:
+            return self._db().execute(sql, params).fetchall()
+
+    def enqueue(self, name: str, delay: float = 0.0, **payload: Any) -> int:
+        """
+        Persist a job and wake a consumer.
+
+        Args:
+            name: Registered task name.
+            delay: Seconds to wait before the job becomes runnable.
+            **payload: JSON-serializable keyword arguments for the handler.
+
+        Returns:
+            The job ID.
+        """
+        if name not in _handlers:
+            raise ValueError(f"Unknown task '{name}'")
+        now = time.time()
+        with self._db_lock:
+            cursor = self._db().execute(
+                "INSERT INTO jobs (name, payload, run_at, created_at) VALUES (?, ?, ?, ?)",
+                (name, json.dumps(payload, default=str), now + delay, now),
+            )
+            job_id = cursor.lastrowid
+        self._notify()
+        return job_id
+
+    def _notify(self) -> None:
+        # enqueue() may be called from thread-pool handlers, so wake consumers via the loop
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        now = time.time()
+        with self._db_lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT * FROM jobs WHERE (status = ? AND run_at <= ?) OR (status = ? AND lease_until < ?) "
+                    "ORDER BY run_at LIMIT 1",
+                    (STATUS_PENDING, now, STATUS_RUNNING, now),
+                ).fetchone()
+                if row is not None:
+                    db.execute(
+                        "UPDATE jobs SET status = ?, lease_until = ?, attempts = attempts + 1 WHERE job_id = ?",
+                        (STATUS_RUNNING, now + self.lease, row["job_id"]),
+                    )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        return row
+
+    def _complete(self, job_id: int) -> None:
+        self._execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    def _fail(self, job: sqlite3.Row, error: str) -> Optional[float]:
+        attempts = job["attempts"] + 1
+        if attempts >= self.max_attempts:
+            self._execute(
+                "UPDATE jobs SET status = ?, lease_until = NULL, last_error = ? WHERE job_id = ?",
+                (STATUS_DEAD, error, job["job_id"]),
+            )
+            self._dead_total += 1
+            logger.error("Task %s (job %s) moved to dead letters: %s", job["name"], job["job_id"], error)
+            return None
+        # Full jitter: uniform over [0, min(cap, base * 2^attempt)]
+        delay = random.uniform(0, min(self.backoff_max, self.backoff * (2 ** attempts)))
+        self._execute(
+            "UPDATE jobs SET status = ?, lease_until = NULL, last_error = ?, run_at = ? WHERE job_id = ?",
+            (STATUS_PENDING, error, time.time() + delay, job["job_id"]),
+        )
+        self._retried_total += 1
+        return delay
+
+    # -- consumers -------------------------------------------------------
+
+    async def start(self) -> None:
+        """
+        Start this process's consumers.
+        """
+        if self._workers:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._workers = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop consumers, giving running jobs up to ``timeout`` seconds to finish.
+
+        Jobs still running afterwards are cancelled; their leases expire and
+        they are picked up again on the next start.
+        """
+        workers, self._workers = self._workers, []
+        if not workers:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        _, pending = await asyncio.wait(workers, timeout=timeout)
+        for worker in pending:
+            worker.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _consume(self) -> None:
+        while not self._stopping:
+            # Clear before claiming so an enqueue racing with an empty claim is not missed
+            self._wakeup.clear()
+            job = await run_in_threadpool(self._claim)
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: sqlite3.Row) -> None:
+        handler = _handlers.get(job["name"])
+        self._running += 1
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for task '{job['name']}'")
+            payload = json.loads(job["payload"])
+            if inspect.iscoroutinefunction(handler):
+                await handler(**payload)
+            else:
+                await run_in_threadpool(handler, **payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("Task %s (job %s) failed", job["name"], job["job_id"], exc_info=True)
+            delay = await run_in_threadpool(self._fail, job, f"{type(exc).__name__}: {exc}")
+            if delay is not None:
+                self._loop.call_later(delay, self._wakeup.set)
+        else:
+            await run_in_threadpool(self._complete, job["job_id"])
+            self._completed_total += 1
+        finally:
+            self._running -= 1
+
+    # -- dead letters and metrics ----------------------------------------
+
+    def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Return jobs that exhausted their retries, newest first.
+        """
+        rows = self._execute(
+            "SELECT job_id, name, payload, attempts, last_error, created_at FROM jobs "
+            "WHERE status = ? ORDER BY job_id DESC LIMIT ?",
+            (STATUS_DEAD, limit),
+        )
+        return [{**dict(row), "payload": json.loads(row["payload"])} for row in rows]
+
+    def requeue_dead(self, job_id: int) -> bool:
+        """
+        Move a dead-lettered job back to the queue with a fresh retry budget.
+
+        Returns:
+            True if the job was found in the dead-letter list.
+        """
+        with self._db_lock:
+            cursor = self._db().execute(
+                "UPDATE jobs SET status = ?, attempts = 0, run_at = ? WHERE job_id = ? AND status = ?",
+                (STATUS_PENDING, time.time(), job_id, STATUS_DEAD),
+            )
+        if cursor.rowcount:
+            self._notify()
+        return bool(cursor.rowcount)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return queue depth and job counters.
+        """
+        counts = {STATUS_PENDING: 0, STATUS_RUNNING: 0, STATUS_DEAD: 0}
+        for row in self._execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            counts[row["status"]] = row["n"]
+        oldest = self._execute("SELECT MIN(created_at) AS t FROM jobs WHERE status = ?", (STATUS_PENDING,))[0]["t"]
+        return {
+            "pending": counts[STATUS_PENDING],
+            "leased": counts[STATUS_RUNNING],
+            "dead": counts[STATUS_DEAD],
+            "running_here": self._running,
+            "consumers": len(self._workers),
+            "oldest_pending_age_seconds": round(time.time() - oldest, 3) if oldest else None,
+            "completed_total": self._completed_total,
+            "retried_total": self._retried_total,
+            "dead_total": self._dead_total,
+        }
+
+
+@lru_cache
+def get_task_queue() -> TaskQueue:
+    """
+    Return this process's task queue, created from the settings on first use.
+    """
+    return TaskQueue(
+        settings.TASK_QUEUE_PATH,
+        concurrency=settings.TASK_QUEUE_CONCURRENCY,
+        max_attempts=settings.TASK_QUEUE_MAX_ATTEMPTS,
+        backoff=settings.TASK_QUEUE_RETRY_BACKOFF_SECONDS,
+        backoff_max=settings.TASK_QUEUE_RETRY_BACKOFF_MAX_SECONDS,
+        lease=settings.TASK_QUEUE_LEASE_SECONDS,
+    )
@@ -0,0 +1,34 @@
+import inspect
+import logging
+from typing import Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+# Hooks run once per worker before it starts accepting traffic
+_hooks: List[Callable[[], Any]] = []
+
+
+def register_warmup(hook: Callable[[], Any]) -> Callable[[], Any]:
+    """
+    Register a hook that warms caches or connections at worker startup.
+
+    Hooks may be plain functions or coroutine functions. Can be used as a decorator.
+    """
+    _hooks.append(hook)
+    return hook
+
+
+async def run_warmup() -> None:
+    """
+    Run every registered warm-up hook.
+
+    Failures are logged rather than raised so that a degraded dependency does
+    not prevent the worker from starting.
+    """
+    for hook in _hooks:
+        try:
+            result = hook()
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.warning("Warm-up hook %s failed", getattr(hook, "__name__", hook), exc_info=True)
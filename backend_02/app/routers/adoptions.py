@@ -3,7 +3,8 @@ from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.core.auth import get_current_user
-from app.services.adoption_service import AdoptionService
+from app.core.serialization import model_list_response
+from app.services.adoption_service import AdoptionService, PetNotAdoptableError
 from app.schemas.adoption import (
     AdoptionApplicationCreate,
     AdoptionApplicationUpdate,
@@ -71,7 +72,7 @@ async def get_adoption_applications(
             detail="Only adopters, shelters, and individual pet owners can access applications"
         )
     
-    return applications
+    return model_list_response(AdoptionApplicationResponse, applications)
 
 
 @router.get("/{application_id}", response_model=AdoptionApplicationResponse)
@@ -135,6 +136,12 @@ async def update_adoption_application(
             detail="Not authorized to update this application"
         )
     
+    if application.get("archived_at"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Archived applications cannot be changed"
+        )
+    
     try:
         updated_application = await AdoptionService.update_application_status(
             application_id, 
@@ -144,6 +151,11 @@ async def update_adoption_application(
             "message": f"Adoption application status updated to {status_update.status}",
             "application_id": updated_application["application_id"]
         }
+    except PetNotAdoptableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,49 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.auth import get_current_admin
+from app.schemas.analytics import AnalyticsOverview, PetFunnel, PetTypeAnalytics, ShelterAnalytics
+from app.services.analytics_service import AnalyticsService
+
+# Every analytics route is admin-only
+router = APIRouter(dependencies=[Depends(get_current_admin)])
+
+
+@router.get("/overview", response_model=AnalyticsOverview)
+async def get_overview() -> Any:
+    """
+    Get platform-wide adoption funnel metrics.
+    """
+    return await AnalyticsService.get_overview()
+
+
+@router.get("/shelters", response_model=List[ShelterAnalytics])
+async def get_shelter_breakdown(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200)
+) -> Any:
+    """
+    Get adoption funnel metrics per shelter or individual owner.
+    """
+    return await AnalyticsService.get_shelter_breakdown(skip, limit)
+
+
+@router.get("/pet-types", response_model=List[PetTypeAnalytics])
+async def get_pet_type_breakdown() -> Any:
+    """
+    Get adoption funnel metrics per pet type.
+    """
+    return await AnalyticsService.get_pet_type_breakdown()
+
+
+@router.get("/pets", response_model=List[PetFunnel])
+async def get_pet_funnels(
+    owner_id: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200)
+) -> Any:
+    """
+    Get the application funnel of each pet, most applications first.
+    """
+    return await AnalyticsService.get_pet_funnels(owner_id, skip, limit)
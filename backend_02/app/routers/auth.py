@@ -5,7 +5,7 @@ from typing import Any
 
 from app.core.auth import create_access_token, verify_password
 from app.core.config import settings
-from app.services.user_service import UserService
+from app.services.user_service import UserExistsError, UserService
 from app.schemas.user import UserCreate, Token
 
 router = APIRouter()
@@ -16,26 +16,15 @@ async def register_user(user_data: UserCreate) -> Any:
     """
     Register a new user.
     """
-    # Check if the username already exists
-    existing_user = await UserService.get_user_by_username(user_data.username)
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already registered"
-        )
-    
-    # Check if the email already exists
-    existing_email = await UserService.get_user_by_email(user_data.email)
-    if existing_email:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
-    # Create the user using the service
+    # Create the user using the service; duplicates are reported by the database
     try:
         new_user = await UserService.create_user(user_data)
         return {"message": "User registered successfully", "user_id": new_user["user_id"]}
+    except UserExistsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
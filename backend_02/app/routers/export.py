@@ -0,0 +1,37 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.core.auth import get_current_user
+from app.schemas.export import ExportFormat, ExportResource
+from app.services.export_service import MEDIA_TYPES, ExportService
+
+router = APIRouter()
+
+
+@router.get("/{resource}")
+async def export_resource(
+    resource: ExportResource,
+    format: ExportFormat = Query(ExportFormat.CSV),
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Stream every pet, application or story visible to the current user as CSV or NDJSON.
+    
+    Admins export everything; shelters and individual owners export their own
+    pets and the applications and stories for them; adopters export their own
+    applications and stories.
+    """
+    if not ExportService.can_export(resource, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Not authorized to export {resource.value}"
+        )
+    
+    filename = f"{resource.value}.{'csv' if format == ExportFormat.CSV else 'ndjson'}"
+    return StreamingResponse(
+        ExportService.stream(resource, format, current_user),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,10 +1,17 @@
+from datetime import datetime
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from app.core.auth import get_current_user
+from app.core.resilience import get_stale_reads, mark_stale
+from app.core.serialization import model_list_response
+from app.services.pet_query import PetQueryError, compile_pet_filter
 from app.services.pet_service import PetService
-from app.schemas.pet import PetCreate, PetUpdate, PetResponse, PetFilter, PetStatus
+from app.services.recommendation_service import RecommendationService
+from app.schemas.pet import (
+    PetCreate, PetUpdate, PetResponse, PetFilter, PetSort, PetStatus, PetCountMethod, RecommendedPetResponse
+)
 
 router = APIRouter()
 
@@ -41,18 +48,29 @@ async def create_pet(
 
 @router.get("", response_model=List[PetResponse])
 async def get_pets(
-    pet_type_id: Optional[str] = None,
-    breed_id: Optional[str] = None,
-    status: Optional[PetStatus] = None,
+    response: Response,
+    pet_type_id: Optional[List[str]] = Query(None),
+    breed_id: Optional[List[str]] = Query(None),
+    status: Optional[List[PetStatus]] = Query(None),
     age_min: Optional[int] = None,
     age_max: Optional[int] = None,
-    gender: Optional[str] = None,
-    owner_id: Optional[str] = None,
+    gender: Optional[List[str]] = Query(None),
+    owner_id: Optional[List[str]] = Query(None),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    exclude: Optional[List[str]] = Query(None, description="field:value pairs to leave out, e.g. status:adopted"),
+    sort: Optional[PetSort] = None,
+    count: Optional[PetCountMethod] = Query(None, description="How to compute X-Total-Count (chosen automatically when omitted)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100)
 ) -> Any:
     """
     Get all pet listings with optional filters.
+    
+    Repeat a filter parameter to match any of several values
+    (``?pet_type_id=a&pet_type_id=b``). The number of matching pets is
+    returned in the ``X-Total-Count`` header, and the count method used
+    (``exact``, ``planned`` or ``estimated``) in ``X-Total-Count-Method``.
     """
     filters = PetFilter(
         pet_type_id=pet_type_id,
@@ -61,21 +79,69 @@ async def get_pets(
         age_min=age_min,
         age_max=age_max,
         gender=gender,
-        owner_id=owner_id
+        owner_id=owner_id,
+        created_after=created_after,
+        created_before=created_before,
+        exclude=exclude,
+        sort=sort
     )
     
-    pets = await PetService.get_pets(filters, skip, limit)
-    return pets
+    try:
+        cache_key = (compile_pet_filter(filters).cache_key, skip, limit)
+    except PetQueryError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    
+    pets, stale_age = await get_stale_reads().fetch(
+        cache_key, lambda: PetService.get_pets(filters, skip, limit)
+    )
+    mark_stale(response, stale_age)
+    
+    if len(pets) < limit and (pets or skip == 0):
+        # The page reaches the end of the results, so the total needs no count query
+        total, method = skip + len(pets), PetCountMethod.EXACT
+    else:
+        (total, method), _ = await get_stale_reads().fetch(
+            ("pet_count", cache_key[0], count), lambda: PetService.count_pets(filters, count)
+        )
+    response.headers["X-Total-Count"] = str(total)
+    response.headers["X-Total-Count-Method"] = method.value
+    
+    return model_list_response(PetResponse, pets, response)
+
+
+@router.get("/recommended", response_model=List[RecommendedPetResponse])
+async def get_recommended_pets(
+    limit: int = Query(10, ge=1, le=50),
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Get available pets ranked by fit with the current adopter's preferences.
+    """
+    if current_user.get("role") != "adopter":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only adopters can get pet recommendations"
+        )
+    
+    pets = await RecommendationService.get_recommendations(current_user.get("user_id"), limit)
+    return model_list_response(RecommendedPetResponse, pets)
 
 
 @router.get("/{pet_id}", response_model=PetResponse)
 async def get_pet(
-    pet_id: str
+    pet_id: str,
+    response: Response
 ) -> Any:
     """
     Get a specific pet by ID.
     """
-    pet = await PetService.get_pet_by_id(pet_id)
+    pet, stale_age = await get_stale_reads().fetch(
+        ("pet", pet_id), lambda: PetService.get_pet_by_id(pet_id)
+    )
+    mark_stale(response, stale_age)
     
     if not pet:
         raise HTTPException(
@@ -113,8 +179,15 @@ async def update_pet(
             detail="Not enough permissions to update this pet listing"
         )
     
+    if pet.get("archived_at"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Archived pet listings cannot be changed"
+        )
+    
     try:
         updated_pet = await PetService.update_pet(pet_id, pet_update)
+        get_stale_reads().invalidate(("pet", pet_id))
         return {
             "message": "Pet listing updated successfully",
             "pet_id": updated_pet["pet_id"]
@@ -153,6 +226,7 @@ async def delete_pet(
         )
     
     success = await PetService.delete_pet(pet_id)
+    get_stale_reads().invalidate(("pet", pet_id))
     
     if not success:
         raise HTTPException(
@@ -0,0 +1,102 @@
+import os
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.core.auth import get_current_admin
+from app.core.profiling import get_profiler, to_collapsed, to_speedscope
+from app.schemas.profiling import ProfileFormat, ProfileSummary, ProfilingConfig, ProfilingConfigUpdate
+
+# Every profiling route is admin-only. Configuration and profiles are per worker process:
+# with several workers each call reaches whichever worker accepts it, so a profile
+# from X-Profile-Id may 404 here; profile with SERVER_WORKERS=1 to see them all.
+router = APIRouter(dependencies=[Depends(get_current_admin)])
+
+
+def _config() -> ProfilingConfig:
+    profiler = get_profiler()
+    return ProfilingConfig(
+        enabled=profiler.enabled, routes=profiler.routes, sample_rate=profiler.sample_rate, worker_pid=os.getpid()
+    )
+
+
+def _export(profiles: list, format: ProfileFormat, name: str) -> Any:
+    if format == ProfileFormat.COLLAPSED:
+        return PlainTextResponse(to_collapsed(profiles), headers={
+            "Content-Disposition": f'attachment; filename="{name}.collapsed.txt"'
+        })
+    return JSONResponse(to_speedscope(profiles), headers={
+        "Content-Disposition": f'attachment; filename="{name}.speedscope.json"'
+    })
+
+
+@router.get("/config", response_model=ProfilingConfig)
+async def get_profiling_config() -> Any:
+    """
+    Get which requests are being profiled.
+    """
+    return _config()
+
+
+@router.put("/config", response_model=ProfilingConfig)
+async def update_profiling_config(config_update: ProfilingConfigUpdate) -> Any:
+    """
+    Enable or disable profiling, or change the profiled routes and sampling rate,
+    in the worker process that handles this request.
+    """
+    profiler = get_profiler()
+    if config_update.enabled is not None:
+        profiler.enabled = config_update.enabled
+    if config_update.routes is not None:
+        profiler.set_routes(config_update.routes)
+    if config_update.sample_rate is not None:
+        profiler.sample_rate = config_update.sample_rate
+    return _config()
+
+
+@router.get("/profiles", response_model=List[ProfileSummary])
+async def get_profiles() -> Any:
+    """
+    List the buffered request profiles, most recent first.
+    """
+    return [profile.summary() for profile in reversed(get_profiler().profiles)]
+
+
+@router.get("/profiles/export")
+async def export_profiles(
+    format: ProfileFormat = Query(ProfileFormat.SPEEDSCOPE),
+    path: Optional[str] = Query(None, description="Only profiles of requests to this path")
+) -> Any:
+    """
+    Export all buffered profiles merged into one flamegraph (collapsed stacks)
+    or as one speedscope document with a profile per request.
+    """
+    profiles = [profile for profile in get_profiler().profiles if path is None or profile.path == path]
+    return _export(profiles, format, "profiles")
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    format: ProfileFormat = Query(ProfileFormat.SPEEDSCOPE)
+) -> Any:
+    """
+    Export one request profile as collapsed stacks or speedscope JSON.
+    """
+    profile = get_profiler().get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return _export([profile], format, profile_id)
+
+
+@router.delete("/profiles", response_model=dict)
+async def clear_profiles() -> Any:
+    """
+    Discard the buffered profiles.
+    """
+    get_profiler().clear()
+    return {"message": "Profiles cleared"}
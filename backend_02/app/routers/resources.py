@@ -0,0 +1,94 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.core.http_cache import cached_response
+from app.core.serialization import validated_json
+from app.schemas.resource import ResourceCreate, ResourceResponse, ResourceSummary
+from app.services.resource_service import (
+    ResourceService,
+    get_resource_article_cache,
+    get_resource_list_cache,
+)
+
+router = APIRouter()
+
+
+def _serializer(tp: Any):
+    return lambda data: validated_json(tp, data)
+
+
+def _cache_control() -> str:
+    max_age = settings.RESOURCE_CACHE_MAX_AGE_SECONDS
+    return f"public, max-age={max_age}, stale-while-revalidate={max_age}"
+
+
+@router.post("", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def create_resource(
+    resource_data: ResourceCreate,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Publish a new care guide.
+    """
+    if current_user.get("role") not in ["shelter", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only shelters and admins can publish care guides"
+        )
+    
+    try:
+        resource = await ResourceService.create_resource(resource_data, current_user.get("user_id"))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    
+    return {
+        "message": "Resource created successfully",
+        "resource_id": resource["resource_id"]
+    }
+
+
+@router.get("", response_model=List[ResourceSummary])
+async def get_resources(
+    request: Request,
+    category: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100)
+) -> Any:
+    """
+    List care guides, optionally by category.
+    """
+    category = category.lower() if category else None
+    cached = await get_resource_list_cache().get_or_load(
+        ("resources", category, skip, limit),
+        lambda: ResourceService.get_resources(category, skip, limit),
+        _serializer(List[ResourceSummary]),
+    )
+    return cached_response(request, cached, _cache_control())
+
+
+@router.get("/{resource_id}", response_model=ResourceResponse)
+async def get_resource(
+    resource_id: str,
+    request: Request
+) -> Any:
+    """
+    Get a care guide with its prerendered HTML.
+    """
+    cached = await get_resource_article_cache().get_or_load(
+        ("resource", resource_id),
+        lambda: ResourceService.get_resource(resource_id),
+        _serializer(ResourceResponse),
+    )
+    if cached is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resource not found"
+        )
+    
+    return cached_response(request, cached, _cache_control())
@@ -0,0 +1,70 @@
+from typing import Any, List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.core.auth import get_current_user
+from app.schemas.saved_search import SavedSearchCreate, SavedSearchResponse
+from app.services.saved_search_service import SavedSearchService
+
+router = APIRouter()
+
+
+@router.post("", response_model=SavedSearchResponse, status_code=status.HTTP_201_CREATED)
+async def create_saved_search(
+    search_data: SavedSearchCreate,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Save a pet search. The user is notified when a new or updated listing matches it.
+    """
+    if current_user.get("role") != "adopter":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only users with role 'adopter' can save searches"
+        )
+
+    try:
+        return await SavedSearchService.create_search(search_data, current_user.get("user_id"))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("", response_model=List[SavedSearchResponse])
+async def get_saved_searches(current_user: dict = Depends(get_current_user)) -> Any:
+    """
+    Get the current user's saved searches.
+    """
+    return await SavedSearchService.get_searches_by_user(current_user.get("user_id"))
+
+
+@router.delete("/{search_id}", response_model=dict)
+async def delete_saved_search(
+    search_id: str,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Delete a saved search.
+    """
+    search = await SavedSearchService.get_search_by_id(search_id)
+    if not search:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Saved search not found"
+        )
+
+    if search["user_id"] != current_user.get("user_id") and current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to delete this saved search"
+        )
+
+    if not await SavedSearchService.delete_search(search_id):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete saved search"
+        )
+
+    return {"message": "Saved search deleted successfully"}
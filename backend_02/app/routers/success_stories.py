@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from typing import List, Any
 from datetime import datetime
 
 from app.schemas.story import StoryCreate, StoryUpdate, StoryResponse
 from app.services.success_story_service import SuccessStoryService
 from app.core.auth import get_current_user
+from app.core.resilience import get_stale_reads, mark_stale
+from app.core.serialization import model_list_response
 
 router = APIRouter()
 
@@ -39,19 +41,24 @@ async def create_story(story_data: StoryCreate, current_user: dict = Depends(get
 
 
 @router.get("", response_model=List[StoryResponse])
-async def get_all_stories() -> Any:
+async def get_all_stories(response: Response) -> Any:
     """
     Retrieve all success stories.
     """
-    return await SuccessStoryService.get_all_stories()
+    stories, stale_age = await get_stale_reads().fetch(("stories",), SuccessStoryService.get_all_stories)
+    mark_stale(response, stale_age)
+    return model_list_response(StoryResponse, stories, response)
 
 
 @router.get("/{story_id}", response_model=StoryResponse)
-async def get_story(story_id: int) -> Any:
+async def get_story(story_id: int, response: Response) -> Any:
     """
     Retrieve a specific success story.
     """
-    story = await SuccessStoryService.get_story(story_id)
+    story, stale_age = await get_stale_reads().fetch(
+        ("story", story_id), lambda: SuccessStoryService.get_story(story_id)
+    )
+    mark_stale(response, stale_age)
     if not story:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -88,6 +95,7 @@ async def update_story(
     update_data = {k: v for k, v in story_update.dict().items() if v is not None}
     
     updated_story = await SuccessStoryService.update_story(story_id, update_data)
+    get_stale_reads().invalidate(("story", story_id))
     if not updated_story:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -121,6 +129,7 @@ async def delete_story(
         )
     
     success = await SuccessStoryService.delete_story(story_id)
+    get_stale_reads().invalidate(("story", story_id))
     if not success:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -0,0 +1,24 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.core.auth import get_current_admin
+from app.core.metrics import collect_metrics
+
+router = APIRouter()
+
+
+@router.get("/health", response_model=dict)
+async def health_check() -> Any:
+    """
+    Liveness check used by container health probes.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/metrics", response_model=dict)
+async def get_metrics(current_user: dict = Depends(get_current_admin)) -> Any:
+    """
+    Return runtime metrics for this worker process. Admin only.
+    """
+    return collect_metrics()
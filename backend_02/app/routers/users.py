@@ -9,28 +9,22 @@ from app.schemas.user import UserInDB, UserProfile
 router = APIRouter()
 
 
+def _user_response(user: dict, profile: dict) -> dict:
+    # Never expose the password hash
+    user = {key: value for key, value in user.items() if key != "password"}
+    return {"user": user, "profile": profile}
+
+
 @router.get("/me", response_model=dict)
 async def read_current_user(current_user: dict = Depends(get_current_user)) -> Any:
     """
     Get the current authenticated user.
-    """
-    user_id = current_user.get("user_id")
-    user = await UserService.get_user_by_id(user_id)
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
     
-    # Remove the password field from the response
-    user.pop("password", None)
-    
-    # Get the user's profile
-    profile = await UserService.get_user_profile(user_id)
-    profile = profile if profile else {}
-    
-    return {"user": user, "profile": profile}
+    Reuses the user row loaded during authentication; only the profile is
+    fetched (through the profile cache).
+    """
+    profile = await UserService.get_cached_user_profile(current_user.get("user_id"))
+    return _user_response(current_user, profile)
 
 
 @router.get("/{user_id}", response_model=dict)
@@ -38,22 +32,20 @@ async def get_user(user_id: str, current_user: dict = Depends(get_current_user))
     """
     Get a specific user by ID.
     """
-    user = await UserService.get_user_by_id(user_id)
+    if user_id == current_user.get("user_id"):
+        profile = await UserService.get_cached_user_profile(user_id)
+        return _user_response(current_user, profile)
     
-    if not user:
+    found = await UserService.get_user_with_profile(user_id)
+    
+    if not found:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    # Remove the password field from the response
-    user.pop("password", None)
-    
-    # Get the user's profile
-    profile = await UserService.get_user_profile(user_id)
-    profile = profile if profile else {}
-    
-    return {"user": user, "profile": profile}
+    user, profile = found
+    return _user_response(user, profile)
 
 
 @router.put("/{user_id}", response_model=dict)
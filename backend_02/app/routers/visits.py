@@ -0,0 +1,221 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.core.auth import get_current_user
+from app.schemas.pet import PetStatus
+from app.schemas.visit import BusySlot, VisitCreate, VisitResponse, VisitStatus
+from app.services.pet_service import PetService
+from app.services.visit_service import VisitConflictError, VisitService
+
+router = APIRouter()
+
+
+def _conflict(e: VisitConflictError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "message": str(e),
+            "conflicts": [
+                {"start": slot["start"].isoformat(), "end": slot["end"].isoformat()} for slot in e.conflicts
+            ],
+        }
+    )
+
+
+@router.post("", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def propose_visit(
+    visit_data: VisitCreate,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Propose a visit to meet a pet.
+    """
+    if current_user.get("role") != "adopter":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only users with role 'adopter' can propose visits"
+        )
+    
+    if visit_data.scheduled_date <= datetime.now(timezone.utc):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Visits must be scheduled in the future"
+        )
+    
+    pet = await PetService.get_pet_by_id(visit_data.pet_id)
+    if not pet:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Pet not found"
+        )
+    if pet["status"] == PetStatus.ADOPTED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This pet has already been adopted"
+        )
+    
+    try:
+        visit = await VisitService.propose_visit(visit_data, current_user.get("user_id"), pet["owner_id"])
+    except VisitConflictError as e:
+        raise _conflict(e)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    
+    return {
+        "message": "Visit proposed successfully",
+        "visit_id": visit["visit_id"]
+    }
+
+
+@router.get("", response_model=List[VisitResponse])
+async def get_my_visits(
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Get visits for the authenticated user.
+    
+    For adopters, returns the visits they proposed.
+    For shelter/individual pet owners, returns visits to their pets.
+    """
+    user_id = current_user.get("user_id")
+    if current_user.get("role") == "adopter":
+        return await VisitService.get_visits_by_adopter(user_id)
+    return await VisitService.get_visits_for_owner(user_id)
+
+
+@router.get("/pet/{pet_id}", response_model=List[VisitResponse])
+async def get_pet_visits(
+    pet_id: str,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Get visits for a pet.
+    
+    The pet's owner and admins see every visit; other users see only their own.
+    """
+    pet = await PetService.get_pet_by_id(pet_id)
+    if not pet:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Pet not found"
+        )
+    
+    user_id = current_user.get("user_id")
+    if pet["owner_id"] == user_id or current_user.get("role") == "admin":
+        return await VisitService.get_visits_for_pet(pet_id)
+    return await VisitService.get_visits_for_pet(pet_id, adopter_id=user_id)
+
+
+@router.get("/owner/{owner_id}", response_model=List[VisitResponse])
+async def get_owner_visits(
+    owner_id: str,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Get every visit on a pet owner's calendar.
+    """
+    if owner_id != current_user.get("user_id") and current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this owner's visits"
+        )
+    
+    return await VisitService.get_visits_for_owner(owner_id)
+
+
+@router.get("/owner/{owner_id}/busy", response_model=List[BusySlot])
+async def get_owner_busy_slots(
+    owner_id: str,
+    start: Optional[datetime] = None,
+    days: int = Query(14, ge=1, le=90),
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Get the occupied slots on a pet owner's calendar, for choosing a visit time.
+    """
+    window_start = start or datetime.now(timezone.utc)
+    if window_start.tzinfo is None:
+        window_start = window_start.replace(tzinfo=timezone.utc)
+    return await VisitService.get_busy_slots(owner_id, window_start, window_start + timedelta(days=days))
+
+
+async def _get_visit_for_update(visit_id: str) -> dict:
+    visit = await VisitService.get_visit_by_id(visit_id)
+    if not visit:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Visit not found"
+        )
+    return visit
+
+
+@router.put("/{visit_id}/confirm", response_model=dict)
+async def confirm_visit(
+    visit_id: str,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Confirm a proposed visit.
+    """
+    visit = await _get_visit_for_update(visit_id)
+    
+    if visit.get("owner_id") != current_user.get("user_id") and current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the pet's owner can confirm visits"
+        )
+    if visit["status"] != VisitStatus.PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot confirm a visit that is {visit['status']}"
+        )
+    
+    try:
+        await VisitService.update_visit_status(visit, VisitStatus.CONFIRMED)
+    except VisitConflictError as e:
+        raise _conflict(e)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    
+    return {"message": "Visit confirmed successfully"}
+
+
+@router.put("/{visit_id}/cancel", response_model=dict)
+async def cancel_visit(
+    visit_id: str,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Cancel a pending or confirmed visit.
+    """
+    visit = await _get_visit_for_update(visit_id)
+    
+    user_id = current_user.get("user_id")
+    if user_id not in (visit["adopter_id"], visit.get("owner_id")) and current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to cancel this visit"
+        )
+    if visit["status"] not in (VisitStatus.PENDING, VisitStatus.CONFIRMED):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot cancel a visit that is {visit['status']}"
+        )
+    
+    try:
+        await VisitService.update_visit_status(visit, VisitStatus.CANCELLED)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    
+    return {"message": "Visit cancelled successfully"}
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from enum import Enum
 from datetime import datetime
@@ -44,8 +44,7 @@ class AdoptionApplicationInDB(AdoptionApplicationBase):
     status: AdoptionStatus
     submitted_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AdoptionApplicationResponse(AdoptionApplicationInDB):
@@ -55,5 +54,4 @@ class AdoptionApplicationResponse(AdoptionApplicationInDB):
     pet_name: Optional[str] = None
     adopter_name: Optional[str] = None
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
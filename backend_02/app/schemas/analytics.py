@@ -0,0 +1,60 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class FunnelMetrics(BaseModel):
+    """
+    Adoption funnel counters and the rates derived from them.
+    """
+    pets_listed: int = 0
+    pets_adopted: int = 0
+    applications_total: int = 0
+    applications_approved: int = 0
+    applications_rejected: int = 0
+    applications_per_pet: Optional[float] = None
+    approval_rate: Optional[float] = None
+    adoption_rate: Optional[float] = None
+    avg_days_to_adoption: Optional[float] = None
+
+
+class AnalyticsOverview(FunnelMetrics):
+    """
+    Schema for platform-wide adoption funnel metrics.
+    """
+    pass
+
+
+class ShelterAnalytics(FunnelMetrics):
+    """
+    Schema for adoption funnel metrics of one pet owner.
+    """
+    owner_id: str
+    owner_name: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+
+class PetTypeAnalytics(FunnelMetrics):
+    """
+    Schema for adoption funnel metrics of one pet type.
+    """
+    pet_type_id: str
+    type_name: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+
+class PetFunnel(BaseModel):
+    """
+    Schema for the application funnel of a single pet.
+    """
+    pet_id: str
+    pet_name: Optional[str] = None
+    owner_id: Optional[str] = None
+    pet_type_id: Optional[str] = None
+    listed_at: Optional[datetime] = None
+    applications_total: int = 0
+    applications_submitted: int = 0
+    applications_approved: int = 0
+    applications_rejected: int = 0
+    adopted_at: Optional[datetime] = None
+    days_to_adoption: Optional[float] = None
@@ -0,0 +1,18 @@
+from enum import Enum
+
+
+class ExportResource(str, Enum):
+    """
+    Enumeration of the datasets that can be exported.
+    """
+    PETS = "pets"
+    APPLICATIONS = "applications"
+    STORIES = "stories"
+
+
+class ExportFormat(str, Enum):
+    """
+    Enumeration of the supported export file formats.
+    """
+    CSV = "csv"
+    NDJSON = "ndjson"
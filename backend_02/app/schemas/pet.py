@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, Dict, Any, List
 from enum import Enum
 from datetime import datetime
@@ -13,6 +13,25 @@ class PetStatus(str, Enum):
     ADOPTED = "adopted"
 
 
+class PetSort(str, Enum):
+    """
+    Enumeration of supported pet listing orders (a leading ``-`` sorts descending).
+    """
+    NEWEST = "-created_at"
+    OLDEST = "created_at"
+    YOUNGEST = "age"
+    OLDEST_AGE = "-age"
+
+
+class PetCountMethod(str, Enum):
+    """
+    Enumeration of PostgREST count methods for pet listing totals.
+    """
+    EXACT = "exact"
+    PLANNED = "planned"
+    ESTIMATED = "estimated"
+
+
 class OwnerType(str, Enum):
     """
     Enumeration of possible pet owner types.
@@ -40,7 +59,8 @@ class PetCreate(PetBase):
     """
     owner_type: OwnerType
     
-    @validator("age")
+    @field_validator("age")
+    @classmethod
     def validate_age(cls, v):
         if v is not None and v < 0:
             raise ValueError("Age cannot be negative")
@@ -60,7 +80,8 @@ class PetUpdate(BaseModel):
     image_url: Optional[str] = None
     status: Optional[PetStatus] = None
 
-    @validator("age")
+    @field_validator("age")
+    @classmethod
     def validate_age(cls, v):
         if v is not None and v < 0:
             raise ValueError("Age cannot be negative")
@@ -77,8 +98,7 @@ class PetInDB(PetBase):
     status: PetStatus
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PetResponse(PetInDB):
@@ -89,18 +109,40 @@ class PetResponse(PetInDB):
     breed_name: Optional[str] = None
     owner_name: Optional[str] = None
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RecommendedPetResponse(PetResponse):
+    """
+    Schema for a recommended pet with its match score.
+    """
+    score: float
+    
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PetFilter(BaseModel):
     """
     Schema for filtering pets.
+    
+    List fields match any of their values; ``exclude`` holds ``field:value``
+    pairs that must not match.
     """
-    pet_type_id: Optional[str] = None
-    breed_id: Optional[str] = None
-    status: Optional[PetStatus] = None
+    pet_type_id: Optional[List[str]] = None
+    breed_id: Optional[List[str]] = None
+    status: Optional[List[PetStatus]] = None
     age_min: Optional[int] = None
     age_max: Optional[int] = None
-    gender: Optional[str] = None
-    owner_id: Optional[str] = None
+    gender: Optional[List[str]] = None
+    owner_id: Optional[List[str]] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    exclude: Optional[List[str]] = None
+    sort: Optional[PetSort] = None
+
+    @field_validator("pet_type_id", "breed_id", "status", "gender", "owner_id", "exclude", mode="before")
+    @classmethod
+    def ensure_list(cls, v):
+        if v is None or isinstance(v, (list, tuple, set)):
+            return v
+        return [v]
@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from enum import Enum
+
+
+class ProfileFormat(str, Enum):
+    """
+    Export formats for request profiles.
+    """
+    COLLAPSED = "collapsed"
+    SPEEDSCOPE = "speedscope"
+
+
+class ProfilingConfig(BaseModel):
+    """
+    Which requests the profiler captures in this worker process.
+    """
+    enabled: bool
+    routes: List[str] = Field(default_factory=list, description="Path templates, e.g. /api/v1/pets/{pet_id}")
+    sample_rate: float = Field(0.0, ge=0.0, le=1.0)
+    worker_pid: int = Field(..., description="Worker process this configuration applies to")
+
+
+class ProfilingConfigUpdate(BaseModel):
+    """
+    Schema for changing the profiler configuration; omitted fields are kept.
+    """
+    enabled: Optional[bool] = None
+    routes: Optional[List[str]] = None
+    sample_rate: Optional[float] = Field(None, ge=0.0, le=1.0)
+
+
+class ProfileSummary(BaseModel):
+    """
+    Schema for a captured request profile, without its samples.
+    """
+    profile_id: str
+    method: str
+    path: str
+    trigger: str
+    status: Optional[int] = None
+    started_at: float
+    duration_ms: float
+    samples: int
+    awaiting_samples: int
+    truncated: bool
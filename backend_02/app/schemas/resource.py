@@ -0,0 +1,51 @@
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import Optional
+from datetime import datetime
+
+
+class ResourceBase(BaseModel):
+    """
+    Base schema for care guide data.
+    """
+    title: str
+    category: Optional[str] = None
+
+
+class ResourceCreate(ResourceBase):
+    """
+    Schema for creating a care guide; ``content`` is markdown.
+    """
+    content: str
+
+    @field_validator("title", "content")
+    @classmethod
+    def validate_not_blank(cls, v):
+        if not v.strip():
+            raise ValueError("Must not be blank")
+        return v
+
+    @field_validator("category")
+    @classmethod
+    def normalize_category(cls, v):
+        return v.strip().lower() if v else None
+
+
+class ResourceSummary(ResourceBase):
+    """
+    Schema for care guides in category listings.
+    """
+    resource_id: str
+    author_id: Optional[str] = None
+    published_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ResourceResponse(ResourceSummary):
+    """
+    Schema for a full care guide, including its prerendered HTML.
+    """
+    content: str
+    content_html: str
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,46 @@
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import List, Optional
+from datetime import datetime
+
+from app.schemas.pet import PetStatus
+
+
+class SavedSearchFilters(BaseModel):
+    """
+    Pet filter fields a saved search can match on.
+    
+    Empty lists match any value; ``status`` defaults to available pets.
+    """
+    pet_type_id: List[str] = Field(default_factory=list)
+    breed_id: List[str] = Field(default_factory=list)
+    gender: List[str] = Field(default_factory=list)
+    status: List[PetStatus] = Field(default_factory=lambda: [PetStatus.AVAILABLE])
+    age_min: Optional[int] = None
+    age_max: Optional[int] = None
+
+    @field_validator("age_max")
+    @classmethod
+    def validate_age_range(cls, v, info):
+        age_min = info.data.get("age_min")
+        if v is not None and age_min is not None and v < age_min:
+            raise ValueError("age_max cannot be less than age_min")
+        return v
+
+
+class SavedSearchCreate(BaseModel):
+    """
+    Schema for saving a pet search.
+    """
+    name: str = Field(..., min_length=1, max_length=100)
+    filters: SavedSearchFilters = Field(default_factory=SavedSearchFilters)
+
+
+class SavedSearchResponse(SavedSearchCreate):
+    """
+    Schema for a saved search.
+    """
+    search_id: str
+    user_id: str
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from typing import Optional, Dict, Any
 from enum import Enum
 from datetime import datetime
@@ -30,7 +30,8 @@ class UserCreate(UserBase):
     role: UserRole
     additional_info: Optional[Dict[str, Any]] = Field(default_factory=dict)
     
-    @validator("password")
+    @field_validator("password")
+    @classmethod
     def password_strength(cls, v):
         if len(v) < 8:
             raise ValueError("Password must be at least 8 characters")
@@ -68,8 +69,7 @@ class UserInDB(UserBase):
     role: UserRole
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserProfile(BaseModel):
@@ -0,0 +1,74 @@
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import Optional
+from enum import Enum
+from datetime import datetime
+
+
+class VisitStatus(str, Enum):
+    """
+    Enumeration of possible visit statuses.
+    """
+    PENDING = "pending"
+    CONFIRMED = "confirmed"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+class VisitBase(BaseModel):
+    """
+    Base schema for visit data.
+    """
+    pet_id: str
+    scheduled_date: datetime
+    duration_minutes: int = 60
+    message: Optional[str] = None
+
+
+class VisitCreate(VisitBase):
+    """
+    Schema for proposing a new visit.
+    """
+
+    @field_validator("scheduled_date")
+    @classmethod
+    def validate_timezone(cls, v):
+        if v.tzinfo is None:
+            raise ValueError("scheduled_date must include a timezone")
+        return v
+
+    @field_validator("duration_minutes")
+    @classmethod
+    def validate_duration(cls, v):
+        if v < 15 or v > 480:
+            raise ValueError("Visits must last between 15 and 480 minutes")
+        return v
+
+
+class VisitInDB(VisitBase):
+    """
+    Schema for visit as stored in database.
+    """
+    visit_id: str
+    adopter_id: str
+    status: VisitStatus
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class VisitResponse(VisitInDB):
+    """
+    Schema for visit response including additional data.
+    """
+    pet_name: Optional[str] = None
+    adopter_name: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BusySlot(BaseModel):
+    """
+    Schema for an occupied slot in an owner's visit calendar.
+    """
+    start: datetime
+    end: datetime
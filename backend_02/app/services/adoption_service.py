@@ -1,13 +1,45 @@
+import asyncio
 from typing import Dict, List, Optional, Any
 
-from app.core.database import supabase_client
+from app.core.dataloader import get_loader
+from app.core.database import ARCHIVE_TABLES, supabase_client
+from app.core.task_queue import get_task_queue, register_task
 from app.schemas.adoption import AdoptionApplicationCreate, AdoptionApplicationUpdate, AdoptionStatus
+from app.schemas.pet import PetStatus
 from app.services.pet_service import PetService
 
 
+def _find_application(application_id: str, columns: str = "*") -> Optional[Dict[str, Any]]:
+    # Applications of archived pets are only in the archive table
+    for table in ("adoption_applications", ARCHIVE_TABLES["adoption_applications"]):
+        result = supabase_client.table(table).select(columns).eq("application_id", application_id).execute()
+        if result.data:
+            return result.data[0]
+    return None
+
+
+# Pet statuses from which an approval may mark the pet as adopted. A pet is
+# still available until the queued pending transition has run.
+ADOPTABLE_STATUSES = [PetStatus.AVAILABLE.value, PetStatus.PENDING.value]
+
+
+class PetNotAdoptableError(ValueError):
+    """
+    Raised when approving an application for a pet that is already adopted or gone.
+    """
+
+    def __init__(self, status: Optional[str]):
+        super().__init__("This pet has already been adopted" if status else "Pet not found")
+        self.status = status
+
+
 class AdoptionService:
     """
     Service for handling adoption application-related database operations.
+    
+    Applications of archived pets (see PetArchiver) are read-only: lookups by
+    ID and an adopter's own applications include them, pet owners' inboxes
+    and status updates only cover live applications.
     """
     
     @staticmethod
@@ -32,8 +64,10 @@ class AdoptionService:
         if not result.data:
             raise ValueError("Failed to create adoption application")
         
-        # Update pet status to pending
-        supabase_client.table("pets").update({"status": "pending"}).eq("pet_id", application_data.pet_id).execute()
+        # Mark the pet as pending after responding; the task also updates the recommendation index
+        get_task_queue().enqueue(
+            "pets.set_status", pet_id=application_data.pet_id, status="pending", from_status="available"
+        )
         
         return result.data[0]
     
@@ -46,23 +80,21 @@ class AdoptionService:
             application_id: ID of the application to retrieve.
             
         Returns:
-            Application data or None if not found.
+            Application data (with ``archived_at`` if archived) or None if not found.
         """
-        result = supabase_client.table("adoption_applications").select("*").eq("application_id", application_id).execute()
-        if not result.data:
+        application = _find_application(application_id)
+        if application is None:
             return None
-            
-        application = result.data[0]
         
-        # Get pet name
-        pet_result = supabase_client.table("pets").select("name").eq("pet_id", application["pet_id"]).execute()
-        if pet_result.data:
-            application["pet_name"] = pet_result.data[0]["name"]
-        
-        # Get adopter name
-        adopter_result = supabase_client.table("users").select("username").eq("user_id", application["adopter_id"]).execute()
-        if adopter_result.data:
-            application["adopter_name"] = adopter_result.data[0]["username"]
+        # Get pet and adopter names
+        pet, adopter = await asyncio.gather(
+            get_loader("pets").load(application["pet_id"]),
+            get_loader("users").load(application["adopter_id"]),
+        )
+        if pet is not None:
+            application["pet_name"] = pet["name"]
+        if adopter is not None:
+            application["adopter_name"] = adopter["username"]
             
         return application
     
@@ -77,24 +109,20 @@ class AdoptionService:
         Returns:
             List of adoption applications for the adopter.
         """
-        result = supabase_client.table("adoption_applications").select("*").eq("adopter_id", adopter_id).execute()
+        applications = []
+        for table in ("adoption_applications", ARCHIVE_TABLES["adoption_applications"]):
+            result = supabase_client.table(table).select("*").eq("adopter_id", adopter_id).execute()
+            applications.extend(result.data or [])
         
-        if not result.data:
+        if not applications:
             return []
-            
-        applications = result.data
         
         # Get pet names
-        pet_ids = [app["pet_id"] for app in applications]
-        pets_result = supabase_client.table("pets").select("pet_id, name").in_("pet_id", pet_ids).execute()
-        
-        pet_names = {}
-        if pets_result.data:
-            pet_names = {pet["pet_id"]: pet["name"] for pet in pets_result.data}
+        pets = await get_loader("pets").load_many(app["pet_id"] for app in applications)
         
         # Add pet names to applications
         for app in applications:
-            app["pet_name"] = pet_names.get(app["pet_id"], "Unknown")
+            app["pet_name"] = pets[app["pet_id"]]["name"] if app["pet_id"] in pets else "Unknown"
             app["adopter_name"] = "Self"  # Since we're querying by adopter ID
             
         return applications
@@ -110,13 +138,17 @@ class AdoptionService:
         Returns:
             List of adoption applications for the owner's pets.
         """
-        # First, get all pets owned by this user
-        pets_result = supabase_client.table("pets").select("pet_id").eq("owner_id", owner_id).execute()
+        # First, get all pets owned by this user, memoizing them for later lookups
+        pets_result = supabase_client.table("pets").select("*").eq("owner_id", owner_id).execute()
         
         if not pets_result.data:
             return []
             
-        pet_ids = [pet["pet_id"] for pet in pets_result.data]
+        pet_loader = get_loader("pets")
+        for pet in pets_result.data:
+            pet_loader.prime(pet["pet_id"], pet)
+        pets = {pet["pet_id"]: pet for pet in pets_result.data}
+        pet_ids = list(pets)
         
         # Get all applications for these pets
         applications_result = supabase_client.table("adoption_applications").select("*").in_("pet_id", pet_ids).execute()
@@ -126,25 +158,13 @@ class AdoptionService:
             
         applications = applications_result.data
         
-        # Get pet names
-        pets_result = supabase_client.table("pets").select("pet_id, name").in_("pet_id", pet_ids).execute()
-        
-        pet_names = {}
-        if pets_result.data:
-            pet_names = {pet["pet_id"]: pet["name"] for pet in pets_result.data}
-        
-        # Get adopter names
-        adopter_ids = [app["adopter_id"] for app in applications]
-        adopters_result = supabase_client.table("users").select("user_id, username").in_("user_id", adopter_ids).execute()
-        
-        adopter_names = {}
-        if adopters_result.data:
-            adopter_names = {adopter["user_id"]: adopter["username"] for adopter in adopters_result.data}
+        # Get adopter names (the owner's pets were loaded above)
+        adopters = await get_loader("users").load_many(app["adopter_id"] for app in applications)
         
         # Add pet and adopter names to applications
         for app in applications:
-            app["pet_name"] = pet_names.get(app["pet_id"], "Unknown")
-            app["adopter_name"] = adopter_names.get(app["adopter_id"], "Unknown")
+            app["pet_name"] = pets[app["pet_id"]]["name"] if app["pet_id"] in pets else "Unknown"
+            app["adopter_name"] = adopters[app["adopter_id"]]["username"] if app["adopter_id"] in adopters else "Unknown"
             
         return applications
     
@@ -159,6 +179,9 @@ class AdoptionService:
             
         Returns:
             The updated application data.
+            
+        Raises:
+            PetNotAdoptableError: If approving while the pet is already adopted or gone.
         """
         # Get the application to verify it exists
         application_result = supabase_client.table("adoption_applications").select("*").eq("application_id", application_id).execute()
@@ -168,6 +191,12 @@ class AdoptionService:
             
         application = application_result.data[0]
         
+        if status_update.status == AdoptionStatus.APPROVED:
+            pet_result = supabase_client.table("pets").select("status").eq("pet_id", application["pet_id"]).execute()
+            pet_status = pet_result.data[0]["status"] if pet_result.data else None
+            if pet_status not in ADOPTABLE_STATUSES:
+                raise PetNotAdoptableError(pet_status)
+        
         # Update the application status
         update_data = {"status": status_update.status}
         result = supabase_client.table("adoption_applications").update(update_data).eq("application_id", application_id).execute()
@@ -175,18 +204,31 @@ class AdoptionService:
         if not result.data:
             raise ValueError("Failed to update application status")
         
-        # If approved, update pet status to adopted
+        # If approved, mark the pet as adopted and reject competing applications after responding
         if status_update.status == AdoptionStatus.APPROVED:
-            supabase_client.table("pets").update({"status": "adopted"}).eq("pet_id", application["pet_id"]).execute()
-            
-            # Reject all other applications for this pet
-            supabase_client.table("adoption_applications").update({"status": "rejected"}) \
-                .eq("pet_id", application["pet_id"]) \
-                .neq("application_id", application_id) \
-                .execute()
+            queue = get_task_queue()
+            queue.enqueue(
+                "pets.set_status", pet_id=application["pet_id"], status="adopted", from_status=ADOPTABLE_STATUSES
+            )
+            queue.enqueue("adoptions.reject_competing", pet_id=application["pet_id"], application_id=application_id)
                 
         return result.data[0]
     
+    @staticmethod
+    @register_task("adoptions.reject_competing")
+    def reject_competing_applications(pet_id: str, application_id: str) -> None:
+        """
+        Reject all other applications for a pet once one is approved. Runs as a background task.
+        
+        Args:
+            pet_id: ID of the adopted pet.
+            application_id: ID of the approved application.
+        """
+        supabase_client.table("adoption_applications").update({"status": AdoptionStatus.REJECTED.value}) \
+            .eq("pet_id", pet_id) \
+            .neq("application_id", application_id) \
+            .execute()
+    
     @staticmethod
     async def is_pet_owner_for_application(application_id: str, user_id: str) -> bool:
         """
@@ -200,12 +242,12 @@ class AdoptionService:
             True if the user is the pet owner, False otherwise.
         """
         # Get the application
-        application_result = supabase_client.table("adoption_applications").select("pet_id").eq("application_id", application_id).execute()
+        application = _find_application(application_id, "pet_id")
         
-        if not application_result.data:
+        if application is None:
             return False
             
-        pet_id = application_result.data[0]["pet_id"]
+        pet_id = application["pet_id"]
         
         # Check if user is the owner of this pet
         return await PetService.is_pet_owner(pet_id, user_id)
@@ -0,0 +1,140 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.dataloader import get_loader
+from app.core.database import supabase_read_client
+
+SECONDS_PER_DAY = 86400.0
+COUNTER_FIELDS = (
+    "pets_listed",
+    "pets_adopted",
+    "applications_total",
+    "applications_approved",
+    "applications_rejected",
+    "adoption_seconds_total",
+)
+
+
+def _ratio(numerator: float, denominator: float, digits: int = 4) -> Optional[float]:
+    return round(numerator / denominator, digits) if denominator else None
+
+
+def with_rates(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add derived funnel rates to a row of summary counters.
+
+    Args:
+        row: Summary row with the counters in COUNTER_FIELDS.
+
+    Returns:
+        The row with ``applications_per_pet``, ``approval_rate``,
+        ``adoption_rate`` and ``avg_days_to_adoption`` added.
+    """
+    decided = row["applications_approved"] + row["applications_rejected"]
+    row["applications_per_pet"] = _ratio(row["applications_total"], row["pets_listed"], 2)
+    row["approval_rate"] = _ratio(row["applications_approved"], decided)
+    row["adoption_rate"] = _ratio(row["pets_adopted"], row["pets_listed"])
+    row["avg_days_to_adoption"] = _ratio(row["adoption_seconds_total"] / SECONDS_PER_DAY, row["pets_adopted"], 2)
+    return row
+
+
+class AnalyticsService:
+    """
+    Service for reading precomputed adoption analytics.
+
+    All reads go to the summary tables maintained by database triggers (see
+    migrations/0001_initial_schema.sql and 0008_analytics_overview.sql),
+    through the read client, so they never aggregate over pets or
+    adoption_applications.
+    """
+
+    @staticmethod
+    async def get_overview() -> Dict[str, Any]:
+        """
+        Get platform-wide funnel metrics from the analytics_overview view (migration 0008).
+
+        Returns:
+            Funnel counters and derived rates.
+        """
+        rows = supabase_read_client.table("analytics_overview") \
+            .select(", ".join(COUNTER_FIELDS)).execute().data or []
+
+        totals = {field: (rows[0].get(field) if rows else 0) or 0 for field in COUNTER_FIELDS}
+        return with_rates(totals)
+
+    @staticmethod
+    async def get_shelter_breakdown(skip: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get funnel metrics per pet owner, most adoptions first.
+
+        Args:
+            skip: Number of records to skip.
+            limit: Maximum number of records to return.
+
+        Returns:
+            Per-owner funnel metrics with owner names.
+        """
+        rows = supabase_read_client.table("analytics_owner_summary").select("*") \
+            .order("pets_adopted", desc=True) \
+            .range(skip, skip + limit - 1) \
+            .execute().data or []
+        if not rows:
+            return []
+
+        owners = await get_loader("users").load_many(row["owner_id"] for row in rows)
+
+        for row in rows:
+            row["owner_name"] = owners[row["owner_id"]]["username"] if row["owner_id"] in owners else None
+            with_rates(row)
+        return rows
+
+    @staticmethod
+    async def get_pet_type_breakdown() -> List[Dict[str, Any]]:
+        """
+        Get funnel metrics per pet type, most adoptions first.
+
+        Returns:
+            Per-type funnel metrics with type names.
+        """
+        rows = supabase_read_client.table("analytics_pet_type_summary").select("*") \
+            .order("pets_adopted", desc=True).execute().data or []
+        if not rows:
+            return []
+
+        pet_types = await get_loader("pet_types").load_many(row["pet_type_id"] for row in rows)
+
+        for row in rows:
+            row["type_name"] = pet_types[row["pet_type_id"]]["type_name"] if row["pet_type_id"] in pet_types else None
+            with_rates(row)
+        return rows
+
+    @staticmethod
+    async def get_pet_funnels(owner_id: Optional[str] = None, skip: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get per-pet application funnels, most applications first.
+
+        Args:
+            owner_id: Only include this owner's pets.
+            skip: Number of records to skip.
+            limit: Maximum number of records to return.
+
+        Returns:
+            Per-pet funnel rows with pet names and days to adoption.
+        """
+        query = supabase_read_client.table("analytics_pet_funnel").select("*")
+        if owner_id:
+            query = query.eq("owner_id", owner_id)
+        rows = query.order("applications_total", desc=True).range(skip, skip + limit - 1).execute().data or []
+        if not rows:
+            return []
+
+        pets = await get_loader("pets").load_many(row["pet_id"] for row in rows)
+
+        for row in rows:
+            row["pet_name"] = pets[row["pet_id"]]["name"] if row["pet_id"] in pets else None
+            row["days_to_adoption"] = None
+            if row.get("adopted_at") and row.get("listed_at"):
+                listed = datetime.fromisoformat(str(row["listed_at"]).replace("Z", "+00:00"))
+                adopted = datetime.fromisoformat(str(row["adopted_at"]).replace("Z", "+00:00"))
+                row["days_to_adoption"] = round((adopted - listed).total_seconds() / SECONDS_PER_DAY, 2)
+        return rows
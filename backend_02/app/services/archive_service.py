@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import supabase_client
+
+logger = logging.getLogger(__name__)
+
+
+class PetArchiver:
+    """
+    Periodic job moving adopted pets and their applications to the archive tables.
+
+    Every ``interval`` seconds the archiver calls ``archive_adopted_pets``
+    (migration 0006) until a batch comes back short. The function moves pets
+    adopted more than ``archive_after_days`` ago, once none of their
+    applications is still submitted, together with those applications. Pet
+    listings and application inboxes then only scan live rows, while lookups
+    by ID fall back to the archive (see ARCHIVE_TABLES). The function skips
+    rows locked by another caller, so every worker process can run the job.
+    """
+
+    def __init__(self, archive_after_days: int = 30, interval: float = 3600.0, batch_size: int = 500):
+        self.archive_after_days = archive_after_days
+        self.interval = interval
+        self.batch_size = batch_size
+
+        self._task: Optional[asyncio.Task] = None
+        self._runs_total = 0
+        self._pets_archived_total = 0
+        self._errors_total = 0
+        self._last_run_pets = 0
+        self._last_run_seconds = 0.0
+
+    def archive_batch(self) -> int:
+        """
+        Archive one batch of adopted pets.
+
+        Returns:
+            Number of pets archived.
+        """
+        result = supabase_client.rpc("archive_adopted_pets", {
+            "min_age_seconds": self.archive_after_days * 86400,
+            "batch_size": self.batch_size,
+        }).execute()
+        return int(result.data or 0)
+
+    def archive_once(self) -> int:
+        """
+        Archive batches until no full batch remains.
+
+        Returns:
+            Number of pets archived.
+        """
+        started = time.perf_counter()
+        archived = 0
+        while True:
+            count = self.archive_batch()
+            archived += count
+            if count < self.batch_size:
+                break
+        self._runs_total += 1
+        self._pets_archived_total += archived
+        self._last_run_pets = archived
+        self._last_run_seconds = time.perf_counter() - started
+        return archived
+
+    async def start(self) -> None:
+        """
+        Start the periodic archival loop for this worker process.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the archival loop; an interrupted batch is rolled back by the database.
+        """
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                archived = await run_in_threadpool(self.archive_once)
+                if archived:
+                    logger.info("Archived %d adopted pets", archived)
+            except Exception:
+                self._errors_total += 1
+                logger.warning("Pet archival failed", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return archival counters.
+        """
+        return {
+            "running": self._task is not None,
+            "runs_total": self._runs_total,
+            "pets_archived_total": self._pets_archived_total,
+            "errors_total": self._errors_total,
+            "last_run_pets": self._last_run_pets,
+            "last_run_seconds": round(self._last_run_seconds, 4),
+        }
+
+
+@lru_cache
+def get_pet_archiver() -> PetArchiver:
+    """
+    Return this process's pet archiver.
+    """
+    return PetArchiver(
+        archive_after_days=settings.ARCHIVE_AFTER_DAYS,
+        interval=settings.ARCHIVE_INTERVAL_SECONDS,
+        batch_size=settings.ARCHIVE_BATCH_SIZE,
+    )
@@ -0,0 +1,170 @@
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database import ARCHIVE_TABLES, supabase_read_client
+from app.schemas.export import ExportFormat, ExportResource
+
+# Table, keyset column and exported columns of each dataset
+EXPORT_TABLES: Dict[ExportResource, Tuple[str, str, List[str]]] = {
+    ExportResource.PETS: ("pets", "pet_id", [
+        "pet_id", "owner_id", "owner_type", "name", "pet_type_id", "breed_id",
+        "age", "gender", "description", "image_url", "status", "created_at",
+    ]),
+    ExportResource.APPLICATIONS: ("adoption_applications", "application_id", [
+        "application_id", "pet_id", "adopter_id", "message", "status", "submitted_at",
+    ]),
+    ExportResource.STORIES: ("success_stories", "story_id", [
+        "story_id", "pet_id", "adopter_id", "story_title", "story_content", "image_url", "published_at",
+    ]),
+}
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def iter_keyset(
+    table: str,
+    key: str,
+    columns: str,
+    filters: Optional[Dict[str, Any]] = None,
+    page_size: Optional[int] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield the rows of a table one page at a time, ordered by a unique key.
+
+    Each page starts after the last key of the previous one (``key > last``)
+    instead of using an offset, so every page is an index range scan and
+    rows inserted or deleted mid-export do not shift later pages.
+
+    Args:
+        table: Table name.
+        key: Unique, indexed column to page on.
+        columns: PostgREST select list; must include ``key``.
+        filters: Equality (scalar) or membership (list) filters.
+        page_size: Rows per page (defaults to EXPORT_PAGE_SIZE).
+
+    Yields:
+        Non-empty lists of rows.
+    """
+    page_size = page_size or settings.EXPORT_PAGE_SIZE
+    last = None
+    while True:
+        query = supabase_read_client.table(table).select(columns)
+        for column, value in (filters or {}).items():
+            query = query.in_(column, value) if isinstance(value, list) else query.eq(column, value)
+        if last is not None:
+            query = query.gt(key, last)
+        rows = query.order(key).limit(page_size).execute().data or []
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1][key]
+
+
+def _with_archive(table: str) -> List[str]:
+    return [table, ARCHIVE_TABLES[table]] if table in ARCHIVE_TABLES else [table]
+
+
+def _owned_pet_ids(owner_id: str) -> List[str]:
+    pet_ids = []
+    for table in _with_archive("pets"):
+        for rows in iter_keyset(table, "pet_id", "pet_id", {"owner_id": owner_id}):
+            pet_ids.extend(row["pet_id"] for row in rows)
+    return pet_ids
+
+
+# Spreadsheets evaluate text cells starting with these characters as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value: Any) -> Any:
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _encode_csv(rows: List[Dict[str, Any]], columns: List[str]) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore", lineterminator="\n")
+    writer.writerows({column: _csv_cell(row.get(column)) for column in columns} for row in rows)
+    return buffer.getvalue()
+
+
+def _encode_ndjson(rows: List[Dict[str, Any]]) -> str:
+    return "".join(json.dumps(row, default=str) + "\n" for row in rows)
+
+
+class ExportService:
+    """
+    Service for streaming full datasets as CSV or NDJSON.
+
+    Exports are generators: rows are read in keyset pages from the read client
+    and encoded page by page, so memory use stays constant however large the
+    export is (owner-scoped exports also hold the owner's pet IDs).
+    """
+
+    @staticmethod
+    def can_export(resource: ExportResource, user: Dict[str, Any]) -> bool:
+        """
+        Check whether a user may export a dataset.
+
+        Admins may export everything; pet owners may export their pets and the
+        applications and stories for them; adopters may export their own
+        applications and stories.
+        """
+        role = user.get("role")
+        if role in ["admin", "shelter", "individual"]:
+            return True
+        return role == "adopter" and resource != ExportResource.PETS
+
+    @staticmethod
+    def _scopes(resource: ExportResource, user: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        # Yields the filter sets whose union is everything the user may export
+        role = user.get("role")
+        user_id = user.get("user_id")
+        if role == "admin":
+            yield {}
+        elif resource == ExportResource.PETS:
+            yield {"owner_id": user_id}
+        elif role == "adopter":
+            yield {"adopter_id": user_id}
+        else:
+            # Owned pets are fetched lazily, once the response has started streaming
+            pet_ids = _owned_pet_ids(user_id)
+            chunk = settings.EXPORT_PET_ID_CHUNK
+            for start in range(0, len(pet_ids), chunk):
+                yield {"pet_id": pet_ids[start:start + chunk]}
+
+    @staticmethod
+    def stream(resource: ExportResource, export_format: ExportFormat, user: Dict[str, Any]) -> Iterator[str]:
+        """
+        Stream the rows of a dataset visible to a user.
+
+        Args:
+            resource: Dataset to export.
+            export_format: Output format.
+            user: Authenticated user (see ``can_export``).
+
+        Yields:
+            Encoded chunks of the export, one per page of rows.
+        """
+        table, key, columns = EXPORT_TABLES[resource]
+        select = ", ".join(columns)
+
+        if export_format == ExportFormat.CSV:
+            yield ",".join(columns) + "\n"
+
+        for filters in ExportService._scopes(resource, user):
+            # Archived pets and applications follow the live rows of each scope
+            for source in _with_archive(table):
+                for rows in iter_keyset(source, key, select, filters):
+                    if export_format == ExportFormat.CSV:
+                        yield _encode_csv(rows, columns)
+                    else:
+                        yield _encode_ndjson(rows)
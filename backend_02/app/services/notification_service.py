@@ -0,0 +1,323 @@
+import asyncio
+import inspect
+import json
+import logging
+import os
+import smtplib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from datetime import datetime, timezone
+from email.message import EmailMessage
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import supabase_client
+
+logger = logging.getLogger(__name__)
+
+EVENT_APPLICATION_SUBMITTED = "application_submitted"
+EVENT_APPLICATION_STATUS_CHANGED = "application_status_changed"
+EVENT_SAVED_SEARCH_MATCH = "saved_search_match"
+
+
+class NotificationTransport(ABC):
+    """
+    Delivers a rendered digest to one recipient.
+    """
+
+    @abstractmethod
+    def send(self, recipient: Dict[str, Any], subject: str, body: str) -> None:
+        """
+        Deliver a message.
+
+        Args:
+            recipient: User row with at least ``user_id`` and ``email``.
+            subject: Message subject.
+            body: Plain-text message body.
+        """
+
+
+class FileTransport(NotificationTransport):
+    """
+    Appends each message as a JSON line to a local file (development and tests).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, recipient: Dict[str, Any], subject: str, body: str) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        line = json.dumps({
+            "to": recipient.get("email"),
+            "user_id": recipient.get("user_id"),
+            "subject": subject,
+            "body": body,
+            "sent_at": datetime.now(timezone.utc).isoformat(),
+        })
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class SMTPTransport(NotificationTransport):
+    """
+    Sends each message as an email through an SMTP relay.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        sender: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+    ):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+
+    def send(self, recipient: Dict[str, Any], subject: str, body: str) -> None:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = recipient["email"]
+        message["Subject"] = subject
+        message.set_content(body)
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            smtp.send_message(message)
+
+
+# Transport factories selectable through NOTIFICATION_TRANSPORT
+_transports: Dict[str, Callable[[], NotificationTransport]] = {
+    "file": lambda: FileTransport(settings.NOTIFICATION_FILE_PATH),
+    "smtp": lambda: SMTPTransport(
+        settings.SMTP_HOST,
+        settings.SMTP_PORT,
+        settings.SMTP_SENDER,
+        username=settings.SMTP_USERNAME,
+        password=settings.SMTP_PASSWORD,
+        use_tls=settings.SMTP_USE_TLS,
+    ),
+}
+
+
+def register_transport(name: str, factory: Callable[[], NotificationTransport]) -> None:
+    """
+    Make a custom transport selectable through NOTIFICATION_TRANSPORT.
+
+    Args:
+        name: Transport name.
+        factory: Callable returning a configured transport.
+
+    Raises:
+        TypeError: If ``factory`` is a transport class that does not implement ``send``.
+    """
+    if inspect.isclass(factory) and inspect.isabstract(factory):
+        raise TypeError(f"Transport {factory.__name__} must implement send()")
+    _transports[name] = factory
+
+
+def render_digest(events: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Render a recipient's pending events as a single digest message.
+
+    Args:
+        events: Outbox rows for one recipient, oldest first.
+
+    Returns:
+        Dictionary with ``subject`` and ``body``.
+    """
+    lines = []
+    for event in events:
+        payload = event.get("payload") or {}
+        pet_name = payload.get("pet_name", "a pet")
+        if event["event_type"] == EVENT_APPLICATION_SUBMITTED:
+            lines.append(f"- New adoption application for {pet_name}")
+        elif event["event_type"] == EVENT_APPLICATION_STATUS_CHANGED:
+            lines.append(f"- Your application for {pet_name} was {payload.get('status', 'updated')}")
+        elif event["event_type"] == EVENT_SAVED_SEARCH_MATCH:
+            lines.append(f"- {pet_name} matches your saved search '{payload.get('search_name', '')}'")
+        else:
+            lines.append(f"- {event['event_type'].replace('_', ' ').capitalize()}")
+
+    count = len(events)
+    subject = "You have 1 new update" if count == 1 else f"You have {count} new updates"
+    return {"subject": subject, "body": "\n".join(lines)}
+
+
+def _parse_timestamp(value: Any) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class NotificationDispatcher:
+    """
+    Batch dispatcher that turns outbox events into per-recipient digests.
+
+    Every ``interval`` seconds the dispatcher leases a batch of undelivered
+    events (via the ``claim_notification_batch`` function), groups them by
+    recipient, sends one digest per recipient and marks the events delivered.
+    Events are only claimed once a recipient's oldest pending event has waited
+    a full digest window. Leases let several worker processes dispatch
+    concurrently; events whose delivery fails are retried once their lease
+    expires.
+    """
+
+    def __init__(
+        self,
+        transport: NotificationTransport,
+        digest_window: int = 300,
+        interval: float = 30.0,
+        batch_size: int = 500,
+        lease: int = 120,
+    ):
+        self.transport = transport
+        self.digest_window = digest_window
+        self.interval = interval
+        self.batch_size = batch_size
+        self.lease = lease
+
+        self._task: Optional[asyncio.Task] = None
+        self._batches_total = 0
+        self._events_delivered_total = 0
+        self._digests_sent_total = 0
+        self._delivery_errors_total = 0
+        self._last_batch_events = 0
+        self._last_batch_seconds = 0.0
+        self._last_lag_seconds: Optional[float] = None
+        self._max_lag_seconds = 0.0
+
+    def dispatch_once(self) -> int:
+        """
+        Claim and deliver one batch of events.
+
+        Returns:
+            Number of events claimed.
+        """
+        started = time.perf_counter()
+        events = supabase_client.rpc("claim_notification_batch", {
+            "digest_window_seconds": self.digest_window,
+            "batch_size": self.batch_size,
+            "lease_seconds": self.lease,
+        }).execute().data or []
+        if not events:
+            return 0
+
+        by_recipient: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for event in events:
+            by_recipient[event["recipient_id"]].append(event)
+
+        users = supabase_client.table("users").select("user_id, username, email") \
+            .in_("user_id", list(by_recipient)).execute().data or []
+        recipients = {user["user_id"]: user for user in users}
+
+        delivered_ids = []
+        for recipient_id, recipient_events in by_recipient.items():
+            recipient = recipients.get(recipient_id)
+            if recipient is not None:
+                digest = render_digest(sorted(recipient_events, key=lambda e: e["event_id"]))
+                try:
+                    self.transport.send(recipient, digest["subject"], digest["body"])
+                except Exception:
+                    self._delivery_errors_total += 1
+                    logger.warning("Failed to deliver notification digest to %s", recipient_id, exc_info=True)
+                    continue
+                self._digests_sent_total += 1
+            # Events for deleted users are marked delivered so they do not linger
+            delivered_ids.extend(event["event_id"] for event in recipient_events)
+
+        if delivered_ids:
+            supabase_client.table("notification_outbox") \
+                .update({"delivered_at": datetime.now(timezone.utc).isoformat()}) \
+                .in_("event_id", delivered_ids) \
+                .execute()
+
+        now = time.time()
+        created = [_parse_timestamp(event.get("created_at")) for event in events]
+        lags = [now - ts for ts in created if ts is not None]
+        if lags:
+            self._last_lag_seconds = max(lags)
+            self._max_lag_seconds = max(self._max_lag_seconds, self._last_lag_seconds)
+        self._batches_total += 1
+        self._events_delivered_total += len(delivered_ids)
+        self._last_batch_events = len(events)
+        self._last_batch_seconds = time.perf_counter() - started
+        return len(events)
+
+    async def start(self) -> None:
+        """
+        Start the periodic dispatch loop for this worker process.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the dispatch loop; claimed but undelivered events are retried after their lease.
+        """
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Keep draining while full batches come back
+                while await run_in_threadpool(self.dispatch_once) >= self.batch_size:
+                    pass
+            except Exception:
+                logger.warning("Notification dispatch failed", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return delivery throughput and lag metrics.
+        """
+        return {
+            "running": self._task is not None,
+            "batches_total": self._batches_total,
+            "events_delivered_total": self._events_delivered_total,
+            "digests_sent_total": self._digests_sent_total,
+            "delivery_errors_total": self._delivery_errors_total,
+            "last_batch_events": self._last_batch_events,
+            "last_batch_seconds": round(self._last_batch_seconds, 4),
+            "last_batch_events_per_second": (
+                round(self._last_batch_events / self._last_batch_seconds, 1) if self._last_batch_seconds else None
+            ),
+            "last_lag_seconds": round(self._last_lag_seconds, 3) if self._last_lag_seconds is not None else None,
+            "max_lag_seconds": round(self._max_lag_seconds, 3),
+        }
+
+
+@lru_cache
+def get_notification_dispatcher() -> NotificationDispatcher:
+    """
+    Return this process's dispatcher, using the transport named in the settings.
+    """
+    factory = _transports.get(settings.NOTIFICATION_TRANSPORT)
+    if factory is None:
+        raise ValueError(f"Unknown notification transport '{settings.NOTIFICATION_TRANSPORT}'")
+    return NotificationDispatcher(
+        factory(),
+        digest_window=settings.NOTIFICATION_DIGEST_WINDOW_SECONDS,
+        interval=settings.NOTIFICATION_DISPATCH_INTERVAL_SECONDS,
+        batch_size=settings.NOTIFICATION_BATCH_SIZE,
+        lease=settings.NOTIFICATION_LEASE_SECONDS,
+    )
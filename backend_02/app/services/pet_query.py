@@ -0,0 +1,178 @@
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Optional, Tuple
+
+from app.schemas.pet import PetFilter, PetSort
+
+# Columns with an index that can drive a pet listing query (see migrations/).
+# app/core/query_plans.py EXPLAINs a listing driven by each of them.
+INDEXED_EQUALITY_COLUMNS = {"pet_id", "status", "pet_type_id", "breed_id", "owner_id", "gender"}
+INDEXED_RANGE_COLUMNS = {"age", "created_at"}
+
+# Columns accepted in ``exclude`` (field:value) pairs
+EXCLUDABLE_COLUMNS = {"pet_type_id", "breed_id", "status", "gender"}
+
+# Column and direction of each sort; pet_id breaks ties so pages are stable
+SORT_ORDERS = {
+    PetSort.NEWEST: (("created_at", True), ("pet_id", False)),
+    PetSort.OLDEST: (("created_at", False), ("pet_id", False)),
+    PetSort.YOUNGEST: (("age", False), ("pet_id", False)),
+    PetSort.OLDEST_AGE: (("age", True), ("pet_id", False)),
+}
+
+
+class PetQueryError(ValueError):
+    """
+    Raised for pet filters that are invalid or cannot be served by an index.
+    """
+
+
+def _utc(value: datetime) -> datetime:
+    # Naive datetimes are taken to be UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return _utc(value).isoformat()
+    return value
+
+
+def _values(values) -> Tuple[Any, ...]:
+    return tuple(sorted({_canonical(value) for value in values}))
+
+
+class CompiledPetQuery:
+    """
+    A pet filter reduced to canonical predicates and an ordering.
+
+    Predicates are ``(column, operator, value)`` triples kept in sorted order,
+    with list values deduplicated and sorted, so equivalent filters (the same
+    values in a different order, a one-element list versus a single value)
+    compile to the same query and the same cache key.
+    """
+
+    __slots__ = ("predicates", "order")
+
+    def __init__(self, predicates: Tuple[Tuple[str, str, Any], ...], order: Tuple[Tuple[str, bool], ...]):
+        self.predicates = predicates
+        self.order = order
+
+    @property
+    def cache_key(self) -> Tuple[Any, ...]:
+        """
+        Hashable key identifying the result set (before pagination).
+        """
+        return ("pets", self.predicates, self.order)
+
+    def is_index_supported(self) -> bool:
+        """
+        Check whether an index can drive the query.
+
+        True when there are no predicates, or when at least one predicate is an
+        equality/membership or range test on an indexed column. An ordering
+        alone does not count: walking an index in sort order while filtering
+        on other columns can still read the whole table.
+        """
+        if not self.predicates:
+            return True
+        for column, operator, _ in self.predicates:
+            if operator in ("eq", "in") and column in INDEXED_EQUALITY_COLUMNS:
+                return True
+            if operator in ("gte", "lte", "lt") and column in INDEXED_RANGE_COLUMNS:
+                return True
+        return False
+
+    def apply(self, query, ordered: bool = True):
+        """
+        Push the predicates and ordering down into a PostgREST query.
+
+        Args:
+            query: A ``select`` request builder on the pets table.
+            ordered: Whether to apply the ordering (counts do not need it).
+
+        Returns:
+            The filtered (and ordered) request builder.
+        """
+        for column, operator, value in self.predicates:
+            if operator == "in":
+                query = query.in_(column, list(value))
+            elif operator == "not_in":
+                query = query.not_.in_(column, list(value))
+            else:
+                query = getattr(query, operator)(column, value)
+        if ordered:
+            for column, desc in self.order:
+                query = query.order(column, desc=desc)
+        return query
+
+
+def compile_pet_filter(filters: Optional[PetFilter]) -> CompiledPetQuery:
+    """
+    Compile a pet filter into a single PostgREST query.
+
+    Args:
+        filters: Filter to compile (None matches every pet).
+
+    Returns:
+        The compiled query.
+
+    Raises:
+        PetQueryError: If the filter is contradictory, excludes an unknown
+            field, or no index can serve it.
+    """
+    predicates = set()
+    order: Tuple[Tuple[str, bool], ...] = ()
+
+    if filters is not None:
+        for column in ("pet_type_id", "breed_id", "status", "gender", "owner_id"):
+            values = getattr(filters, column)
+            if not values:
+                continue
+            values = _values(values)
+            if len(values) == 1:
+                predicates.add((column, "eq", values[0]))
+            else:
+                predicates.add((column, "in", values))
+
+        if filters.age_min is not None and filters.age_max is not None and filters.age_min > filters.age_max:
+            raise PetQueryError("age_min cannot be greater than age_max")
+        if filters.age_min is not None:
+            predicates.add(("age", "gte", filters.age_min))
+        if filters.age_max is not None:
+            predicates.add(("age", "lte", filters.age_max))
+
+        created_after = _utc(filters.created_after) if filters.created_after else None
+        created_before = _utc(filters.created_before) if filters.created_before else None
+        if created_after and created_before and created_after >= created_before:
+            raise PetQueryError("created_after must be earlier than created_before")
+        if created_after:
+            predicates.add(("created_at", "gte", created_after.isoformat()))
+        if created_before:
+            predicates.add(("created_at", "lt", created_before.isoformat()))
+
+        excluded = {}
+        for pair in filters.exclude or []:
+            column, separator, value = pair.partition(":")
+            if not separator or not value or column not in EXCLUDABLE_COLUMNS:
+                raise PetQueryError(
+                    f"exclude must be field:value with field one of {', '.join(sorted(EXCLUDABLE_COLUMNS))}"
+                )
+            excluded.setdefault(column, set()).add(value)
+        for column, values in excluded.items():
+            predicates.add((column, "not_in", _values(values)))
+
+        if filters.sort is not None:
+            order = SORT_ORDERS[filters.sort]
+
+    compiled = CompiledPetQuery(tuple(sorted(predicates, key=lambda p: (p[0], p[1]))), order)
+    if not compiled.is_index_supported():
+        raise PetQueryError(
+            "Add a filter on status, pet_type_id, breed_id, owner_id, gender, age or created_at "
+            "so the query can use an index"
+        )
+    return compiled
@@ -1,7 +1,29 @@
-from typing import Dict, List, Optional, Any
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple, Union
 
-from app.core.database import supabase_client
-from app.schemas.pet import PetCreate, PetUpdate, PetStatus, PetFilter
+from postgrest.types import CountMethod
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.dataloader import get_loader
+from app.core.database import ARCHIVE_TABLES, supabase_client, supabase_read_client
+from app.core.task_queue import get_task_queue, register_task
+from app.schemas.pet import PetCreate, PetUpdate, PetStatus, PetFilter, PetCountMethod
+from app.services.pet_query import compile_pet_filter
+from app.services.recommendation_service import pet_feature_index
+from app.services.saved_search_service import MATCHED_FIELDS
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache
+def get_pet_count_cache() -> LRUCache:
+    """
+    Return this process's cache of pet listing totals, keyed by canonical filter and count method.
+    """
+    return LRUCache(max_entries=settings.PET_COUNT_CACHE_MAX_ENTRIES, ttl=settings.PET_COUNT_CACHE_TTL_SECONDS)
 
 
 class PetService:
@@ -31,48 +53,64 @@ class PetService:
         if not result.data:
             raise ValueError("Failed to create pet listing")
         
+        pet_feature_index.upsert(result.data[0])
+        get_task_queue().enqueue("saved_searches.match", pet_id=result.data[0]["pet_id"])
+        
         return result.data[0]
     
     @staticmethod
     async def get_pet_by_id(pet_id: str) -> Optional[Dict[str, Any]]:
         """
-        Retrieve a pet by ID.
+        Retrieve a pet by ID, including archived (adopted) pets.
         
         Args:
             pet_id: ID of the pet to retrieve.
             
         Returns:
-            Pet data or None if not found.
+            Pet data (with ``archived_at`` if archived) or None if not found.
         """
-        result = supabase_client.table("pets").select("*").eq("pet_id", pet_id).execute()
-        if not result.data:
+        pet = await get_loader("pets").load(pet_id)
+        if pet is None:
             return None
-            
-        pet = result.data[0]
-        
-        # Get pet type name
-        pet_type_result = supabase_client.table("pet_types").select("*").eq("pet_type_id", pet["pet_type_id"]).execute()
-        if pet_type_result.data:
-            pet["pet_type_name"] = pet_type_result.data[0]["type_name"]
-        
-        # Get breed name if available
-        if pet.get("breed_id"):
-            breed_result = supabase_client.table("breeds").select("*").eq("breed_id", pet["breed_id"]).execute()
-            if breed_result.data:
-                pet["breed_name"] = breed_result.data[0]["breed_name"]
-        
-        # Get owner name
-        owner_result = supabase_client.table("users").select("username").eq("user_id", pet["owner_id"]).execute()
-        if owner_result.data:
-            pet["owner_name"] = owner_result.data[0]["username"]
-            
+        
+        # Copy the shared row before adding names to it
+        pet = dict(pet)
+        await PetService.add_display_names([pet])
+        
         return pet
     
+    @staticmethod
+    async def add_display_names(pets: List[Dict[str, Any]]) -> None:
+        """
+        Add ``pet_type_name``, ``breed_name`` and ``owner_name`` to pets in place.
+        
+        Pet types, breeds and owners are fetched through the request's loaders
+        (one deduplicated query per table, skipped for rows already loaded).
+        
+        Args:
+            pets: Pet rows to annotate.
+        """
+        pet_types, breeds, owners = await asyncio.gather(
+            get_loader("pet_types").load_many(pet.get("pet_type_id") for pet in pets),
+            get_loader("breeds").load_many(pet.get("breed_id") for pet in pets),
+            get_loader("users").load_many(pet.get("owner_id") for pet in pets),
+        )
+        
+        for pet in pets:
+            if pet.get("pet_type_id") in pet_types:
+                pet["pet_type_name"] = pet_types[pet["pet_type_id"]]["type_name"]
+            if pet.get("breed_id") in breeds:
+                pet["breed_name"] = breeds[pet["breed_id"]]["breed_name"]
+            if pet.get("owner_id") in owners:
+                pet["owner_name"] = owners[pet["owner_id"]]["username"]
+    
     @staticmethod
     async def get_pets(filters: Optional[PetFilter] = None, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Get pets with optional filtering.
         
+        Only live listings are searched: archived (adopted) pets are found by ID only.
+        
         Args:
             filters: Optional filters to apply.
             skip: Number of records to skip (for pagination).
@@ -80,20 +118,14 @@ class PetService:
             
         Returns:
             List of pets matching the criteria.
+            
+        Raises:
+            PetQueryError: If the filters are invalid or have no index support.
         """
-        query = supabase_client.table("pets").select("*").range(skip, skip + limit - 1)
-        
-        # Apply filters if provided
-        if filters:
-            filter_dict = filters.dict(exclude_none=True)
-            for key, value in filter_dict.items():
-                # Handle special filters
-                if key == "age_min":
-                    query = query.gte("age", value)
-                elif key == "age_max":
-                    query = query.lte("age", value)
-                else:
-                    query = query.eq(key, value)
+        # All filters and the sort are pushed down into a single query
+        query = compile_pet_filter(filters).apply(
+            supabase_read_client.table("pets").select("*")
+        ).range(skip, skip + limit - 1)
         
         result = query.execute()
         
@@ -101,38 +133,61 @@ class PetService:
         pets = result.data
         if not pets:
             return []
+        
+        await PetService.add_display_names(pets)
+        
+        return pets
+    
+    @staticmethod
+    async def count_pets(
+        filters: Optional[PetFilter] = None,
+        method: Optional[PetCountMethod] = None
+    ) -> Tuple[int, PetCountMethod]:
+        """
+        Count the pets matching a filter.
+        
+        Without an explicit method, unfiltered listings use an estimated count,
+        and filtered ones an exact count only when the planner expects at most
+        PET_COUNT_EXACT_MAX rows (otherwise the planner's estimate is returned).
+        Totals are cached per canonical filter for PET_COUNT_CACHE_TTL_SECONDS.
+        
+        Args:
+            filters: Optional filters to apply.
+            method: Count method requested by the client, or None to choose one.
             
-        # Get pet types for all pets
-        pet_type_ids = list(set(pet["pet_type_id"] for pet in pets if pet.get("pet_type_id")))
-        if pet_type_ids:
-            pet_types_result = supabase_client.table("pet_types").select("*").in_("pet_type_id", pet_type_ids).execute()
-            pet_types = {pt["pet_type_id"]: pt["type_name"] for pt in pet_types_result.data} if pet_types_result.data else {}
-            
-            for pet in pets:
-                if pet.get("pet_type_id") in pet_types:
-                    pet["pet_type_name"] = pet_types[pet["pet_type_id"]]
-        
-        # Get breeds for all pets
-        breed_ids = list(set(pet["breed_id"] for pet in pets if pet.get("breed_id")))
-        if breed_ids:
-            breeds_result = supabase_client.table("breeds").select("*").in_("breed_id", breed_ids).execute()
-            breeds = {b["breed_id"]: b["breed_name"] for b in breeds_result.data} if breeds_result.data else {}
-            
-            for pet in pets:
-                if pet.get("breed_id") in breeds:
-                    pet["breed_name"] = breeds[pet["breed_id"]]
-                    
-        # Get owner names
-        owner_ids = list(set(pet["owner_id"] for pet in pets if pet.get("owner_id")))
-        if owner_ids:
-            owners_result = supabase_client.table("users").select("user_id, username").in_("user_id", owner_ids).execute()
-            owners = {o["user_id"]: o["username"] for o in owners_result.data} if owners_result.data else {}
+        Returns:
+            The total and the count method it was computed with.
             
-            for pet in pets:
-                if pet.get("owner_id") in owners:
-                    pet["owner_name"] = owners[pet["owner_id"]]
+        Raises:
+            PetQueryError: If the filters are invalid or have no index support.
+        """
+        compiled = compile_pet_filter(filters)
+        cache = get_pet_count_cache()
+        key = ("pets", compiled.predicates, method)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
         
-        return pets
+        def count(count_method: PetCountMethod) -> int:
+            query = compiled.apply(
+                supabase_read_client.table("pets").select("pet_id", count=CountMethod(count_method.value), head=True),
+                ordered=False
+            )
+            return query.execute().count or 0
+        
+        if method is not None:
+            result = (count(method), method)
+        elif not compiled.predicates:
+            result = (count(PetCountMethod.ESTIMATED), PetCountMethod.ESTIMATED)
+        else:
+            planned = count(PetCountMethod.PLANNED)
+            if planned <= settings.PET_COUNT_EXACT_MAX:
+                result = (count(PetCountMethod.EXACT), PetCountMethod.EXACT)
+            else:
+                result = (planned, PetCountMethod.PLANNED)
+        
+        cache.set(key, result)
+        return result
     
     @staticmethod
     async def update_pet(pet_id: str, pet_data: PetUpdate) -> Dict[str, Any]:
@@ -153,8 +208,39 @@ class PetService:
         if not result.data:
             raise ValueError("Failed to update pet listing")
         
+        get_loader("pets").clear(pet_id)
+        pet_feature_index.upsert(result.data[0])
+        if MATCHED_FIELDS & update_data.keys():
+            get_task_queue().enqueue("saved_searches.match", pet_id=pet_id)
+        
         return result.data[0]
     
+    @staticmethod
+    @register_task("pets.set_status")
+    def set_pet_status(pet_id: str, status: str, from_status: Union[str, List[str], None] = None) -> None:
+        """
+        Set a pet's adoption status. Runs as a background task.
+        
+        Args:
+            pet_id: ID of the pet to update.
+            status: New pet status.
+            from_status: Only update if the pet currently has this status (or one
+                of these statuses), so a delayed retry cannot overwrite a later
+                transition. A skipped update is logged.
+        """
+        query = supabase_client.table("pets").update({"status": status}).eq("pet_id", pet_id)
+        if isinstance(from_status, list):
+            query = query.in_("status", from_status)
+        elif from_status:
+            query = query.eq("status", from_status)
+        result = query.execute()
+        
+        if result.data:
+            pet_feature_index.upsert(result.data[0])
+            get_task_queue().enqueue("saved_searches.match", pet_id=pet_id)
+        elif from_status:
+            logger.warning("Pet %s not moved to %s: its status is no longer %s", pet_id, status, from_status)
+    
     @staticmethod
     async def delete_pet(pet_id: str) -> bool:
         """
@@ -167,6 +253,12 @@ class PetService:
             True if deletion was successful, False otherwise.
         """
         result = supabase_client.table("pets").delete().eq("pet_id", pet_id).execute()
+        if not result.data:
+            # Archived listings are deleted from the archive (with their applications)
+            result = supabase_client.table(ARCHIVE_TABLES["pets"]).delete().eq("pet_id", pet_id).execute()
+        
+        get_loader("pets").clear(pet_id)
+        pet_feature_index.remove(pet_id)
         
         return bool(result.data)
     
@@ -182,9 +274,9 @@ class PetService:
         Returns:
             True if the user is the pet's owner, False otherwise.
         """
-        result = supabase_client.table("pets").select("owner_id").eq("pet_id", pet_id).execute()
+        pet = await get_loader("pets").load(pet_id)
         
-        if not result.data:
+        if pet is None:
             return False
             
-        return result.data[0]["owner_id"] == user_id
+        return pet["owner_id"] == user_id
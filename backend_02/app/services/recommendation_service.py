@@ -0,0 +1,464 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import ARCHIVE_TABLES, supabase_read_client
+from app.core.dataloader import get_loader
+from app.core.warmup import register_warmup
+from app.schemas.pet import PetStatus
+
+# Categorical feature columns in the code matrix
+COL_TYPE = 0
+COL_BREED = 1
+COL_GENDER = 2
+COL_LOCATION = 3
+NUM_COLUMNS = 4
+
+# Relative weight of each signal in the final score
+WEIGHT_TYPE = 3.0
+WEIGHT_BREED = 2.0
+WEIGHT_AGE = 1.5
+WEIGHT_LOCATION = 1.0
+WEIGHT_GENDER = 0.5
+WEIGHT_RECENCY = 0.05
+# Application history counts for this fraction of a stated preference
+HISTORY_FACTOR = 0.5
+
+LOAD_PAGE_SIZE = 1000
+LOOKUP_CHUNK_SIZE = 200
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    return text or None
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    return [value]
+
+
+def _as_number(value: Any) -> Optional[float]:
+    # Preferences are free-form JSON: accept numbers and numeric strings only
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _timestamp(value: Any) -> float:
+    if not value:
+        return 0.0
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+class _Vocabulary:
+    """
+    Maps categorical values to dense integer codes; code 0 means unknown.
+    """
+
+    def __init__(self):
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: Any) -> int:
+        key = _normalize(value)
+        if key is None:
+            return 0
+        return self._codes.setdefault(key, len(self._codes) + 1)
+
+    def lookup(self, value: Any) -> Optional[int]:
+        key = _normalize(value)
+        return self._codes.get(key) if key is not None else None
+
+    def __len__(self) -> int:
+        return len(self._codes) + 1
+
+
+class PetFeatureIndex:
+    """
+    In-memory feature matrix of available pets used for recommendation scoring.
+
+    Each available pet occupies one row: categorical features are stored as
+    integer codes in ``codes`` (type, breed, gender, owner location) and numeric
+    features in ``ages`` and ``listed_at``. Scoring gathers per-code affinity
+    weights for every row at once, so ranking the full catalog is a handful of
+    vectorized NumPy operations. The index is kept in sync by the pet and
+    adoption services and fully rebuilt every RECOMMENDATION_REFRESH_SECONDS to
+    pick up writes made by other worker processes. Rebuilds run in the thread
+    pool and swap in the new rows at the end, so requests keep scoring against
+    the previous index meanwhile.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded_at: Optional[float] = None
+        self._refresh: Optional[asyncio.Task] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.vocabularies = [_Vocabulary() for _ in range(NUM_COLUMNS)]
+        self.codes = np.zeros((0, NUM_COLUMNS), dtype=np.int32)
+        self.ages = np.zeros(0, dtype=np.float32)
+        self.listed_at = np.zeros(0, dtype=np.float64)
+        self.size = 0
+        self._pets: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._type_names: Dict[str, str] = {}
+        self._breed_names: Dict[str, str] = {}
+        self._owners: Dict[str, Dict[str, Any]] = {}
+
+    # -- loading ---------------------------------------------------------
+
+    async def ensure_loaded(self) -> None:
+        """
+        Build the index on first use and refresh it once it is older than the refresh interval.
+
+        Only the first build is awaited; later refreshes run in the background.
+        """
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > settings.RECOMMENDATION_REFRESH_SECONDS:
+            if self._refresh is None:
+                self._refresh = asyncio.get_running_loop().create_task(run_in_threadpool(self.rebuild))
+                self._refresh.add_done_callback(self._refresh_done)
+            if self._loaded_at is None:
+                await asyncio.shield(self._refresh)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._refresh = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Recommendation index refresh failed", exc_info=task.exception())
+
+    def rebuild(self) -> None:
+        """
+        Reload every available pet and the reference data from the database.
+        """
+        pet_types = supabase_read_client.table("pet_types").select("pet_type_id, type_name").execute().data or []
+        breeds = supabase_read_client.table("breeds").select("breed_id, breed_name").execute().data or []
+
+        pets: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            page = supabase_read_client.table("pets").select("*") \
+                .eq("status", PetStatus.AVAILABLE.value) \
+                .order("pet_id") \
+                .range(offset, offset + LOAD_PAGE_SIZE - 1) \
+                .execute().data or []
+            pets.extend(page)
+            if len(page) < LOAD_PAGE_SIZE:
+                break
+            offset += LOAD_PAGE_SIZE
+
+        owners = self._fetch_owners({pet["owner_id"] for pet in pets if pet.get("owner_id")})
+
+        # Fill a fresh index without the lock, then swap it in
+        fresh = PetFeatureIndex()
+        fresh._type_names = {t["pet_type_id"]: t["type_name"] for t in pet_types}
+        fresh._breed_names = {b["breed_id"]: b["breed_name"] for b in breeds}
+        fresh._owners = owners
+        fresh._grow(len(pets))
+        for pet in pets:
+            fresh._write_row(pet)
+
+        with self._lock:
+            for name in (
+                "vocabularies", "codes", "ages", "listed_at", "size",
+                "_pets", "_rows", "_type_names", "_breed_names", "_owners",
+            ):
+                setattr(self, name, getattr(fresh, name))
+            self._loaded_at = time.monotonic()
+
+    @staticmethod
+    def _fetch_owners(owner_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        owner_ids = list(owner_ids)
+        owners: Dict[str, Dict[str, Any]] = {owner_id: {} for owner_id in owner_ids}
+        for start in range(0, len(owner_ids), LOOKUP_CHUNK_SIZE):
+            chunk = owner_ids[start:start + LOOKUP_CHUNK_SIZE]
+            users = supabase_read_client.table("users").select("user_id, username") \
+                .in_("user_id", chunk).execute().data or []
+            for user in users:
+                owners[user["user_id"]]["username"] = user["username"]
+            profiles = supabase_read_client.table("user_profiles").select("user_id, address, additional_info") \
+                .in_("user_id", chunk).execute().data or []
+            for profile in profiles:
+                info = profile.get("additional_info")
+                location = info.get("location") if isinstance(info, dict) else None
+                owners[profile["user_id"]]["location"] = location or profile.get("address")
+        return owners
+
+    # -- row maintenance -------------------------------------------------
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.ages)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 64)
+        codes = np.zeros((new_capacity, NUM_COLUMNS), dtype=np.int32)
+        codes[:self.size] = self.codes[:self.size]
+        ages = np.full(new_capacity, np.nan, dtype=np.float32)
+        ages[:self.size] = self.ages[:self.size]
+        listed_at = np.zeros(new_capacity, dtype=np.float64)
+        listed_at[:self.size] = self.listed_at[:self.size]
+        self.codes, self.ages, self.listed_at = codes, ages, listed_at
+
+    def _write_row(self, pet: Dict[str, Any]) -> None:
+        row = self._rows.get(pet["pet_id"])
+        if row is None:
+            self._grow(self.size + 1)
+            row = self.size
+            self.size += 1
+            self._rows[pet["pet_id"]] = row
+            self._pets.append(pet)
+        else:
+            self._pets[row] = pet
+
+        owner = self._owners.get(pet.get("owner_id"), {})
+        self.codes[row, COL_TYPE] = self.vocabularies[COL_TYPE].code(pet.get("pet_type_id"))
+        self.codes[row, COL_BREED] = self.vocabularies[COL_BREED].code(pet.get("breed_id"))
+        self.codes[row, COL_GENDER] = self.vocabularies[COL_GENDER].code(pet.get("gender"))
+        self.codes[row, COL_LOCATION] = self.vocabularies[COL_LOCATION].code(owner.get("location"))
+        self.ages[row] = np.nan if pet.get("age") is None else pet["age"]
+        self.listed_at[row] = _timestamp(pet.get("created_at"))
+
+    def upsert(self, pet: Dict[str, Any]) -> None:
+        """
+        Add or refresh a pet row; pets that are no longer available are removed.
+
+        Args:
+            pet: Full pet row as returned by the database.
+        """
+        if self._loaded_at is None:
+            return
+        if pet.get("status") != PetStatus.AVAILABLE.value:
+            self.remove(pet["pet_id"])
+            return
+        owner_id = pet.get("owner_id")
+        if owner_id and owner_id not in self._owners:
+            self._owners.update(self._fetch_owners([owner_id]))
+        with self._lock:
+            self._write_row(pet)
+
+    def remove(self, pet_id: str) -> None:
+        """
+        Remove a pet from the index (swap-with-last, O(1)).
+        """
+        with self._lock:
+            row = self._rows.pop(pet_id, None)
+            if row is None:
+                return
+            last = self.size - 1
+            if row != last:
+                moved = self._pets[last]
+                self._pets[row] = moved
+                self._rows[moved["pet_id"]] = row
+                self.codes[row] = self.codes[last]
+                self.ages[row] = self.ages[last]
+                self.listed_at[row] = self.listed_at[last]
+            self._pets.pop()
+            self.size = last
+
+    # -- scoring ---------------------------------------------------------
+
+    def affinity(self, column: int, weighted_values: Dict[Any, float]) -> np.ndarray:
+        """
+        Build a per-code affinity vector for one categorical column.
+
+        Args:
+            column: Column index (COL_TYPE, COL_BREED, ...).
+            weighted_values: Raw feature values mapped to their affinity weight.
+        """
+        vector = np.zeros(len(self.vocabularies[column]), dtype=np.float32)
+        for value, weight in weighted_values.items():
+            code = self.vocabularies[column].lookup(value)
+            if code is not None:
+                vector[code] += weight
+        return vector
+
+    def resolve_type_id(self, value: Any) -> Any:
+        """
+        Map a pet type name to its ID; IDs pass through unchanged.
+        """
+        key = _normalize(value)
+        for type_id, name in self._type_names.items():
+            if _normalize(name) == key:
+                return type_id
+        return value
+
+    def resolve_breed_id(self, value: Any) -> Any:
+        """
+        Map a breed name to its ID; IDs pass through unchanged.
+        """
+        key = _normalize(value)
+        for breed_id, name in self._breed_names.items():
+            if _normalize(name) == key:
+                return breed_id
+        return value
+
+    def top_k(
+        self,
+        affinities: Dict[int, np.ndarray],
+        age_range: Optional[tuple],
+        k: int,
+        exclude: Set[str],
+    ) -> List[Dict[str, Any]]:
+        """
+        Score every indexed pet and return the best ``k``.
+
+        Args:
+            affinities: Per-column affinity vectors from ``affinity()``.
+            age_range: Preferred (min, max) age, either bound may be None.
+            k: Number of pets to return.
+            exclude: Pet IDs that must not be recommended.
+
+        Returns:
+            Pet rows (enriched with names and ``score``) in descending score order.
+        """
+        with self._lock:
+            n = self.size
+            if n == 0 or k <= 0:
+                return []
+            codes = self.codes[:n]
+            scores = np.zeros(n, dtype=np.float32)
+            for column, weight in (
+                (COL_TYPE, WEIGHT_TYPE),
+                (COL_BREED, WEIGHT_BREED),
+                (COL_GENDER, WEIGHT_GENDER),
+                (COL_LOCATION, WEIGHT_LOCATION),
+            ):
+                vector = affinities.get(column)
+                if vector is not None and vector.any():
+                    scores += weight * vector[codes[:, column]]
+
+            if age_range and (age_range[0] is not None or age_range[1] is not None):
+                ages = self.ages[:n]
+                low = -np.inf if age_range[0] is None else age_range[0]
+                high = np.inf if age_range[1] is None else age_range[1]
+                distance = np.maximum(low - ages, 0) + np.maximum(ages - high, 0)
+                # 1 inside the range, decaying outside it; unknown ages score neutral
+                age_score = np.where(np.isnan(ages), 0.5, np.exp(-distance / 2.0))
+                scores += WEIGHT_AGE * age_score.astype(np.float32)
+
+            listed_at = self.listed_at[:n]
+            span = listed_at.max() - listed_at.min()
+            if span > 0:
+                scores += WEIGHT_RECENCY * ((listed_at - listed_at.min()) / span).astype(np.float32)
+
+            for pet_id in exclude:
+                row = self._rows.get(pet_id)
+                if row is not None:
+                    scores[row] = -np.inf
+
+            k = min(k, n)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            results = []
+            for row in top:
+                if not np.isfinite(scores[row]):
+                    continue
+                pet = dict(self._pets[row])
+                pet["pet_type_name"] = self._type_names.get(pet.get("pet_type_id"))
+                pet["breed_name"] = self._breed_names.get(pet.get("breed_id"))
+                pet["owner_name"] = self._owners.get(pet.get("owner_id"), {}).get("username")
+                pet["score"] = round(float(scores[row]), 4)
+                results.append(pet)
+            return results
+
+
+pet_feature_index = PetFeatureIndex()
+
+
+@register_warmup
+def warm_pet_feature_index() -> None:
+    """
+    Build the recommendation index before the worker accepts traffic.
+    """
+    pet_feature_index.rebuild()
+
+
+class RecommendationService:
+    """
+    Service for ranking available pets for an adopter.
+    """
+
+    @staticmethod
+    async def get_recommendations(adopter_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Rank available pets by fit with an adopter's preferences and history.
+
+        Preferences are read from ``user_profiles.additional_info`` (either at
+        the top level or under a ``preferences`` key): ``pet_types``,
+        ``breeds``, ``age_min``, ``age_max``, ``gender`` and ``location``.
+        Types and breeds may be given as IDs or names. Pets the adopter has
+        already applied for are excluded, and their types and breeds count as
+        weaker preferences.
+
+        Args:
+            adopter_id: ID of the adopter.
+            limit: Maximum number of pets to return.
+
+        Returns:
+            Recommended pets with a ``score`` field, best first.
+        """
+        index = pet_feature_index
+        await index.ensure_loaded()
+
+        profile_result = supabase_read_client.table("user_profiles").select("additional_info") \
+            .eq("user_id", adopter_id).execute()
+        info = profile_result.data[0].get("additional_info") if profile_result.data else None
+        if not isinstance(info, dict):
+            info = {}
+        preferences = info.get("preferences")
+        if not isinstance(preferences, dict):
+            preferences = info
+
+        type_weights: Dict[Any, float] = {}
+        breed_weights: Dict[Any, float] = {}
+        for value in _as_list(preferences.get("pet_types") or preferences.get("pet_type")):
+            type_weights[index.resolve_type_id(value)] = 1.0
+        for value in _as_list(preferences.get("breeds") or preferences.get("breed")):
+            breed_weights[index.resolve_breed_id(value)] = 1.0
+
+        # Application history: previously applied-for pets hint at taste
+        applied_pet_ids = set()
+        for table in ("adoption_applications", ARCHIVE_TABLES["adoption_applications"]):
+            applications = supabase_read_client.table(table).select("pet_id") \
+                .eq("adopter_id", adopter_id).execute().data or []
+            applied_pet_ids.update(application["pet_id"] for application in applications)
+        if applied_pet_ids:
+            history = list((await get_loader("pets").load_many(applied_pet_ids)).values())
+            share = HISTORY_FACTOR / len(history) if history else 0.0
+            for pet in history:
+                type_weights[pet.get("pet_type_id")] = type_weights.get(pet.get("pet_type_id"), 0.0) + share
+                if pet.get("breed_id"):
+                    breed_weights[pet["breed_id"]] = breed_weights.get(pet["breed_id"], 0.0) + share
+
+        affinities = {
+            COL_TYPE: index.affinity(COL_TYPE, type_weights),
+            COL_BREED: index.affinity(COL_BREED, breed_weights),
+            COL_GENDER: index.affinity(COL_GENDER, {g: 1.0 for g in _as_list(preferences.get("gender"))}),
+            COL_LOCATION: index.affinity(COL_LOCATION, {l: 1.0 for l in _as_list(preferences.get("location"))}),
+        }
+        age_range = (_as_number(preferences.get("age_min")), _as_number(preferences.get("age_max")))
+
+        return index.top_k(affinities, age_range, limit, exclude=applied_pet_ids)
@@ -0,0 +1,121 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import markdown
+import nh3
+
+from app.core.config import settings
+from app.core.database import supabase_client, supabase_read_client
+from app.core.http_cache import ResponseCache
+from app.core.metrics import register_metrics
+from app.schemas.resource import ResourceCreate
+
+SUMMARY_COLUMNS = "resource_id, title, category, author_id, published_at"
+
+
+def render_markdown(content: str) -> str:
+    """
+    Render markdown to HTML that is safe to embed in a page.
+
+    Args:
+        content: Markdown source.
+
+    Returns:
+        Sanitized HTML (scripts, event handlers and unsafe URLs removed).
+    """
+    html = markdown.markdown(content, extensions=["extra", "sane_lists"], output_format="html")
+    return nh3.clean(html, link_rel="noopener noreferrer nofollow")
+
+
+@lru_cache
+def get_resource_list_cache() -> ResponseCache:
+    """
+    Return this process's cache of serialized category listings.
+    """
+    return ResponseCache(settings.RESOURCE_CACHE_MAX_ENTRIES, settings.RESOURCE_CACHE_TTL_SECONDS)
+
+
+@lru_cache
+def get_resource_article_cache() -> ResponseCache:
+    """
+    Return this process's cache of serialized articles.
+    """
+    return ResponseCache(settings.RESOURCE_CACHE_MAX_ENTRIES, settings.RESOURCE_CACHE_TTL_SECONDS)
+
+
+register_metrics("resource_cache", lambda: {
+    "lists": get_resource_list_cache().snapshot(),
+    "articles": get_resource_article_cache().snapshot(),
+})
+
+
+class ResourceService:
+    """
+    Service for handling care guide (resource) database operations.
+    """
+
+    @staticmethod
+    async def create_resource(resource_data: ResourceCreate, author_id: str) -> Dict[str, Any]:
+        """
+        Create a care guide, rendering its markdown to sanitized HTML once.
+
+        Args:
+            resource_data: Resource data for creation.
+            author_id: ID of the user publishing the guide.
+
+        Returns:
+            The created resource data.
+        """
+        resource_dict = resource_data.dict()
+        resource_dict["author_id"] = author_id
+        resource_dict["content_html"] = render_markdown(resource_data.content)
+
+        result = supabase_client.table("resources").insert(resource_dict).execute()
+
+        if not result.data:
+            raise ValueError("Failed to create resource")
+
+        # Listings in this process now miss the new guide; other workers catch up after the TTL
+        get_resource_list_cache().clear()
+        return result.data[0]
+
+    @staticmethod
+    async def get_resources(category: Optional[str] = None, skip: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get care guide summaries, newest first.
+
+        Args:
+            category: Only return guides in this category.
+            skip: Number of records to skip.
+            limit: Maximum number of records to return.
+
+        Returns:
+            List of resource summaries (without article bodies).
+        """
+        query = supabase_read_client.table("resources").select(SUMMARY_COLUMNS)
+        if category:
+            query = query.eq("category", category.lower())
+        result = query.order("published_at", desc=True).range(skip, skip + limit - 1).execute()
+        return result.data or []
+
+    @staticmethod
+    async def get_resource(resource_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a care guide by ID.
+
+        Args:
+            resource_id: ID of the resource to retrieve.
+
+        Returns:
+            Resource data if found, None otherwise.
+        """
+        result = supabase_read_client.table("resources").select("*").eq("resource_id", resource_id).execute()
+
+        if not result.data:
+            return None
+
+        resource = result.data[0]
+        # Rows written before content_html existed are rendered on first read
+        if resource.get("content_html") is None:
+            resource["content_html"] = render_markdown(resource["content"])
+        return resource
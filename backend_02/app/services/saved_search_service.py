@@ -0,0 +1,372 @@
+import math
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.database import supabase_client, supabase_read_client
+from app.core.metrics import register_metrics
+from app.core.task_queue import register_task
+from app.schemas.saved_search import SavedSearchCreate
+from app.services.export_service import iter_keyset
+
+# Categorical pet fields indexed with posting lists
+DIMENSIONS = ("pet_type_id", "breed_id", "gender", "status")
+
+# Pet fields whose change can make a listing match a saved search
+MATCHED_FIELDS = set(DIMENSIONS) | {"age"}
+
+
+def _normalize(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    value = getattr(value, "value", value)
+    return str(value).strip().lower() or None
+
+
+class AgeIntervalTree:
+    """
+    Static centered interval tree answering "which age ranges contain this age?".
+
+    Each node keeps the intervals containing its center point, sorted by lower
+    bound and by upper bound; intervals entirely left or right of the center
+    go to the child subtrees. A stabbing query walks one root-to-leaf path, so
+    it costs O(log n + k) for k results.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[float, float, str]]):
+        self._root = self._build(list(intervals))
+
+    def _build(self, intervals: List[Tuple[float, float, str]]):
+        if not intervals:
+            return None
+        endpoints = sorted(point for low, high, _ in intervals for point in (low, high) if math.isfinite(point))
+        center = endpoints[len(endpoints) // 2] if endpoints else 0.0
+        here = [interval for interval in intervals if interval[0] <= center <= interval[1]]
+        left = [interval for interval in intervals if interval[1] < center]
+        right = [interval for interval in intervals if interval[0] > center]
+        by_low = sorted((low, search_id) for low, _, search_id in here)
+        by_high = sorted(((high, search_id) for _, high, search_id in here), reverse=True)
+        return center, self._build(left), self._build(right), by_low, by_high
+
+    def stab(self, point: float) -> Set[str]:
+        """
+        Return the IDs of the intervals containing ``point``.
+        """
+        found: Set[str] = set()
+        node = self._root
+        while node is not None:
+            center, left, right, by_low, by_high = node
+            if point < center:
+                for low, search_id in by_low:
+                    if low > point:
+                        break
+                    found.add(search_id)
+                node = left
+            elif point > center:
+                for high, search_id in by_high:
+                    if high < point:
+                        break
+                    found.add(search_id)
+                node = right
+            else:
+                found.update(search_id for _, search_id in by_low)
+                break
+        return found
+
+
+class SavedSearchIndex:
+    """
+    In-memory inverted index from pet attributes to the saved searches they satisfy.
+
+    For every categorical dimension the index keeps a posting list per value
+    plus the set of searches that do not constrain that dimension; age ranges
+    live in an AgeIntervalTree. Matching a pet starts from its smallest
+    candidate set (or the age ranges containing its age, when no categorical
+    value is selective) and narrows it with set intersections, so its cost
+    depends on how selective the pet's attributes are rather than on the
+    total number of searches. The index is kept in sync by
+    SavedSearchService and reloaded every SAVED_SEARCH_REFRESH_SECONDS to pick
+    up searches saved through other worker processes. Reloads happen in the
+    matching task (off the event loop) and build a new index that is swapped
+    in at the end; searches added or removed meanwhile are replayed onto it.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        # Changes made while a rebuild is loading, replayed onto the new index
+        self._pending: Optional[List[Tuple[str, Any]]] = None
+        self.matches_total = 0
+        self.last_match_seconds = 0.0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._searches: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Dict[str, Set[str]]] = {dimension: {} for dimension in DIMENSIONS}
+        self._unconstrained: Dict[str, Set[str]] = {dimension: set() for dimension in DIMENSIONS}
+        self._ages: Dict[str, Tuple[float, float]] = {}
+        self._any_age: Set[str] = set()
+        self._age_tree: Optional[AgeIntervalTree] = None
+
+    # -- loading ---------------------------------------------------------
+
+    def _stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > settings.SAVED_SEARCH_REFRESH_SECONDS
+
+    def ensure_loaded(self) -> None:
+        """
+        Load every saved search on first use and reload once older than the refresh interval.
+
+        Blocks on database reads, so only call it off the event loop.
+        """
+        if self._stale():
+            with self._rebuild_lock:
+                if self._stale():
+                    self.rebuild()
+
+    def rebuild(self) -> None:
+        """
+        Reload every saved search from the database.
+        """
+        with self._lock:
+            self._pending = []
+        try:
+            fresh = SavedSearchIndex()
+            for rows in iter_keyset("saved_searches", "search_id", "search_id, user_id, name, filters"):
+                for search in rows:
+                    fresh._add(search)
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            for operation, argument in self._pending:
+                if operation == "add":
+                    fresh._add(argument)
+                else:
+                    fresh._remove(argument)
+            self._pending = None
+            for name in ("_searches", "_postings", "_unconstrained", "_ages", "_any_age", "_age_tree"):
+                setattr(self, name, getattr(fresh, name))
+            self._loaded_at = time.monotonic()
+
+    # -- updates ---------------------------------------------------------
+
+    def add(self, search: Dict[str, Any]) -> None:
+        """
+        Index a saved search (replacing any previous version).
+        """
+        with self._lock:
+            self._add(search)
+            if self._pending is not None:
+                self._pending.append(("add", search))
+
+    def _add(self, search: Dict[str, Any]) -> None:
+        search_id = search["search_id"]
+        self._remove(search_id)
+        filters = search.get("filters") or {}
+        self._searches[search_id] = {
+            "search_id": search_id,
+            "user_id": search["user_id"],
+            "name": search.get("name"),
+        }
+        for dimension in DIMENSIONS:
+            values = {_normalize(value) for value in filters.get(dimension) or []} - {None}
+            if not values:
+                self._unconstrained[dimension].add(search_id)
+            for value in values:
+                self._postings[dimension].setdefault(value, set()).add(search_id)
+        age_min, age_max = filters.get("age_min"), filters.get("age_max")
+        if age_min is None and age_max is None:
+            self._any_age.add(search_id)
+        else:
+            self._ages[search_id] = (
+                float(age_min) if age_min is not None else -math.inf,
+                float(age_max) if age_max is not None else math.inf,
+            )
+            self._age_tree = None
+
+    def remove(self, search_id: str) -> None:
+        """
+        Drop a saved search from the index if present.
+        """
+        with self._lock:
+            self._remove(search_id)
+            if self._pending is not None:
+                self._pending.append(("remove", search_id))
+
+    def _remove(self, search_id: str) -> None:
+        if self._searches.pop(search_id, None) is None:
+            return
+        for dimension in DIMENSIONS:
+            self._unconstrained[dimension].discard(search_id)
+            postings = self._postings[dimension]
+            for value in [value for value, ids in postings.items() if search_id in ids]:
+                postings[value].discard(search_id)
+                if not postings[value]:
+                    del postings[value]
+        self._any_age.discard(search_id)
+        if self._ages.pop(search_id, None) is not None:
+            self._age_tree = None
+
+    # -- matching --------------------------------------------------------
+
+    def match(self, pet: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Return the saved searches a pet satisfies.
+
+        Args:
+            pet: Pet row.
+
+        Returns:
+            Matching searches (``search_id``, ``user_id``, ``name``).
+        """
+        started = time.perf_counter()
+        with self._lock:
+            # Per dimension, a search matches if it lists the pet's value or does not constrain the dimension
+            candidates = []
+            for dimension in DIMENSIONS:
+                posting = self._postings[dimension].get(_normalize(pet.get(dimension)), set())
+                candidates.append((posting, self._unconstrained[dimension]))
+            candidates.sort(key=lambda pair: len(pair[0]) + len(pair[1]))
+
+            age = pet.get("age")
+            posting, unconstrained = candidates[0]
+            age_driven = age is not None and self._ages \
+                and len(posting) + len(unconstrained) > len(self._ages) // 4
+            if age_driven:
+                # The categorical predicates are not selective: let the age ranges drive
+                if self._age_tree is None:
+                    self._age_tree = AgeIntervalTree((low, high, sid) for sid, (low, high) in self._ages.items())
+                found = self._age_tree.stab(float(age)) | self._any_age
+            else:
+                found = posting | unconstrained
+
+            # Set intersections run in C and iterate the smaller operand
+            for posting, unconstrained in candidates:
+                if not found:
+                    break
+                found = (found & posting) | (found & unconstrained)
+
+            if not age_driven:
+                found = (found & self._any_age) | {
+                    search_id for search_id in found - self._any_age if self._age_matches(search_id, age)
+                }
+
+            matched = [self._searches[search_id] for search_id in found]
+
+        self.matches_total += len(matched)
+        self.last_match_seconds = time.perf_counter() - started
+        return matched
+
+    def _age_matches(self, search_id: str, age: Any) -> bool:
+        bounds = self._ages.get(search_id)
+        if bounds is None:
+            return True
+        return age is not None and bounds[0] <= float(age) <= bounds[1]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return index size and matching counters.
+        """
+        return {
+            "searches": len(self._searches),
+            "age_constrained": len(self._ages),
+            "matches_total": self.matches_total,
+            "last_match_us": round(self.last_match_seconds * 1e6, 1),
+        }
+
+
+saved_search_index = SavedSearchIndex()
+register_metrics("saved_searches", saved_search_index.snapshot)
+
+
+class SavedSearchService:
+    """
+    Service for saved pet searches and their new-listing alerts.
+    """
+
+    @staticmethod
+    async def create_search(search_data: SavedSearchCreate, user_id: str) -> Dict[str, Any]:
+        """
+        Save a search for a user.
+
+        Args:
+            search_data: Search name and filters.
+            user_id: ID of the user saving the search.
+
+        Returns:
+            The saved search.
+        """
+        search_dict = search_data.model_dump(mode="json")
+        search_dict["user_id"] = user_id
+
+        result = supabase_client.table("saved_searches").insert(search_dict).execute()
+
+        if not result.data:
+            raise ValueError("Failed to save search")
+
+        # Reloading is left to the matching task; if the index is not loaded yet, it picks this search up then
+        saved_search_index.add(result.data[0])
+
+        return result.data[0]
+
+    @staticmethod
+    async def get_searches_by_user(user_id: str) -> List[Dict[str, Any]]:
+        """
+        Get a user's saved searches, oldest first.
+        """
+        result = supabase_read_client.table("saved_searches").select("*") \
+            .eq("user_id", user_id).order("created_at").execute()
+        return result.data or []
+
+    @staticmethod
+    async def get_search_by_id(search_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a saved search by ID.
+        """
+        result = supabase_read_client.table("saved_searches").select("*").eq("search_id", search_id).execute()
+        return result.data[0] if result.data else None
+
+    @staticmethod
+    async def delete_search(search_id: str) -> bool:
+        """
+        Delete a saved search.
+
+        Returns:
+            True if the search was deleted.
+        """
+        result = supabase_client.table("saved_searches").delete().eq("search_id", search_id).execute()
+        saved_search_index.remove(search_id)
+        return bool(result.data)
+
+    @staticmethod
+    @register_task("saved_searches.match")
+    def match_listing(pet_id: str) -> None:
+        """
+        Record a pet's matches with saved searches. Runs as a background task.
+
+        Each new (search, pet) match is inserted into saved_search_matches,
+        whose trigger queues the alert in notification_outbox; matches that
+        were already alerted are skipped, so updates do not repeat alerts.
+
+        Args:
+            pet_id: ID of the new or updated pet.
+        """
+        result = supabase_client.table("pets").select("*").eq("pet_id", pet_id).execute()
+        if not result.data:
+            return
+        pet = result.data[0]
+
+        saved_search_index.ensure_loaded()
+        matches = [
+            {"search_id": search["search_id"], "pet_id": pet_id}
+            for search in saved_search_index.match(pet)
+            if search["user_id"] != pet.get("owner_id")
+        ]
+        if matches:
+            supabase_client.table("saved_search_matches") \
+                .upsert(matches, on_conflict="search_id,pet_id", ignore_duplicates=True) \
+                .execute()
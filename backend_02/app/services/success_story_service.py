@@ -1,5 +1,5 @@
 from typing import List, Dict, Any, Optional
-from app.core.database import supabase_client
+from app.core.database import supabase_client, supabase_read_client
 
 class SuccessStoryService:
     @staticmethod
@@ -17,7 +17,7 @@ class SuccessStoryService:
         """
         Get a success story by ID
         """
-        response = supabase_client.table("success_stories").select("*").eq("story_id", story_id).execute()
+        response = supabase_read_client.table("success_stories").select("*").eq("story_id", story_id).execute()
         if len(response.data) > 0:
             return response.data[0]
         return None
@@ -27,7 +27,7 @@ class SuccessStoryService:
         """
         Get all success stories
         """
-        response = supabase_client.table("success_stories").select("*").order("published_at", desc=True).execute()
+        response = supabase_read_client.table("success_stories").select("*").order("published_at", desc=True).execute()
         return response.data
 
     @staticmethod
@@ -1,9 +1,40 @@
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
 
-from app.core.database import supabase_client
+from postgrest.exceptions import APIError
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.dataloader import get_loader
+from app.core.database import supabase_client, supabase_read_client
+from app.core.read_routing import reads_pinned_to_primary
 from app.core.auth import get_password_hash
 from app.schemas.user import UserCreate, UserRole
 
+# Postgres SQLSTATE for unique constraint violations
+UNIQUE_VIOLATION = "23505"
+
+# Unique constraint on users.email (the other one is users_username_key)
+EMAIL_UNIQUE_CONSTRAINT = "users_email_key"
+
+
+class UserExistsError(ValueError):
+    """
+    Raised when a username or email is already registered.
+    """
+
+    def __init__(self, field: str):
+        super().__init__(f"{field.capitalize()} already registered")
+        self.field = field
+
+
+@lru_cache
+def get_profile_cache() -> LRUCache:
+    """
+    Return this process's cache of user profiles, keyed by user ID.
+    """
+    return LRUCache(max_entries=settings.USER_PROFILE_CACHE_MAX_ENTRIES, ttl=settings.USER_PROFILE_CACHE_TTL_SECONDS)
+
 
 class UserService:
     """
@@ -14,7 +45,7 @@ class UserService:
         """
         Retrieve a user by username.
         """
-        result = supabase_client.table("users").select("*").eq("username", username).execute()
+        result = supabase_read_client.table("users").select("*").eq("username", username).execute()
         if result.data:
             return result.data[0]
         return None
@@ -23,69 +54,116 @@ class UserService:
         """
         Retrieve a user by email.
         """
-        result = supabase_client.table("users").select("*").eq("email", email).execute()
+        result = supabase_read_client.table("users").select("*").eq("email", email).execute()
         if result.data:
             return result.data[0]
         return None
     @staticmethod
     async def get_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
         """
-        Retrieve a user by ID.
+        Retrieve a user by ID (without the password hash), through the request's users loader.
         """
-        result = supabase_client.table("users").select("*").eq("user_id", user_id).execute()
-        if result.data:
-            return result.data[0]
-        return None
+        return await get_loader("users").load(user_id)
     
     @staticmethod
     async def create_user(user: UserCreate) -> Dict[str, Any]:
         """
-        Create a new user.
+        Create a new user and their profile.
+        
+        Both rows are inserted atomically by the ``register_user`` database
+        function in a single round trip; uniqueness is enforced by the
+        constraints on users rather than checked beforehand, so concurrent
+        registrations cannot both succeed.
         
         Args:
             user: User data for creation.
             
         Returns:
             The created user data.
+            
+        Raises:
+            UserExistsError: If the username or email is already registered.
         """
         # Hash the password
         hashed_password = get_password_hash(user.password)
         
-        # Create user in database
-        user_data = {
-            "username": user.username,
-            "email": user.email,
-            "password": hashed_password,
-            "role": user.role
-        }
-        
-        result = supabase_client.table("users").insert(user_data).execute()
+        try:
+            result = supabase_client.rpc("register_user", {
+                "username": user.username,
+                "email": user.email,
+                "password": hashed_password,
+                "role": user.role,
+                "additional_info": user.additional_info if user.additional_info else {}
+            }).execute()
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                # The message names the violated constraint, e.g.
+                # 'duplicate key value violates unique constraint "users_email_key"'
+                field = "email" if EMAIL_UNIQUE_CONSTRAINT in (e.message or "") else "username"
+                raise UserExistsError(field) from e
+            raise
         
         if not result.data:
             raise ValueError("Failed to create user")
         
-        created_user = result.data[0]
-        
-        # Create user profile
-        profile_data = {
-            "user_id": created_user["user_id"],
-            "additional_info": user.additional_info if user.additional_info else {}
-        }
-        
-        profile_result = supabase_client.table("user_profiles").insert(profile_data).execute()
-        
-        return created_user
+        return result.data[0]
     
     @staticmethod
     async def get_user_profile(user_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a user's profile.
         """
-        result = supabase_client.table("user_profiles").select("*").eq("user_id", user_id).execute()
+        result = supabase_read_client.table("user_profiles").select("*").eq("user_id", user_id).execute()
         if result.data:
             return result.data[0]
         return None
     
+    @staticmethod
+    async def get_cached_user_profile(user_id: str) -> Dict[str, Any]:
+        """
+        Retrieve a user's profile through the profile cache.
+        
+        The cache is per worker process, so another worker may still hold a
+        profile from before a recent update. While the request's reads are
+        pinned to the primary (read-your-writes), the cache is skipped and
+        refreshed from the primary instead.
+        
+        Returns:
+            The profile, or an empty dictionary if the user has none.
+        """
+        cache = get_profile_cache()
+        profile = None if reads_pinned_to_primary() else cache.get(user_id)
+        if profile is None:
+            profile = await UserService.get_user_profile(user_id) or {}
+            cache.set(user_id, profile)
+        return profile
+    
+    @staticmethod
+    async def get_user_with_profile(user_id: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Retrieve a user and their profile in one query (embedded select).
+        
+        The profile is also stored in the profile cache.
+        
+        Args:
+            user_id: ID of the user to retrieve.
+            
+        Returns:
+            ``(user, profile)``, with an empty profile if the user has none,
+            or None if the user does not exist.
+        """
+        result = supabase_read_client.table("users").select("*, user_profiles(*)").eq("user_id", user_id).execute()
+        if not result.data:
+            return None
+        
+        user = result.data[0]
+        # user_profiles.user_id is not unique, so PostgREST embeds a list
+        profiles = user.pop("user_profiles", None) or []
+        profile = profiles[0] if isinstance(profiles, list) and profiles else (profiles or {})
+        
+        get_profile_cache().set(user_id, profile)
+        return user, profile
+    
     @staticmethod
     async def update_user_profile(user_id: str, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -98,10 +176,10 @@ class UserService:
         Returns:
             The updated profile data.
         """
-        # Check if profile exists
-        profile = await UserService.get_user_profile(user_id)
+        # Check if profile exists (on the primary, since the write depends on it)
+        existing = supabase_client.table("user_profiles").select("profile_id").eq("user_id", user_id).execute()
         
-        if profile:
+        if existing.data:
             # Update existing profile
             result = supabase_client.table("user_profiles").update(profile_data).eq("user_id", user_id).execute()
         else:
@@ -112,4 +190,6 @@ class UserService:
         if not result.data:
             raise ValueError("Failed to update user profile")
         
+        get_profile_cache().delete(user_id)
+        
         return result.data[0]
@@ -0,0 +1,423 @@
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from postgrest.exceptions import APIError
+
+from app.core.config import settings
+from app.core.dataloader import get_loader
+from app.core.database import supabase_client, supabase_read_client
+from app.schemas.visit import VisitCreate, VisitStatus
+
+# Visits in these states occupy the owner's calendar
+ACTIVE_STATUSES = (VisitStatus.PENDING.value, VisitStatus.CONFIRMED.value)
+LOOKUP_CHUNK_SIZE = 200
+MAX_VISIT_MINUTES = 480
+# Raised by visit_schedules_no_overlap (migration 0007)
+EXCLUSION_VIOLATION = "23P01"
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+def _visit_interval(visit: Dict[str, Any]) -> Tuple[float, float]:
+    start = _timestamp(visit["scheduled_date"])
+    return start, start + int(visit.get("duration_minutes") or 60) * 60
+
+
+class VisitConflictError(Exception):
+    """
+    Raised when a visit overlaps another visit on the owner's calendar.
+    """
+
+    def __init__(self, conflicts: List[Dict[str, Any]]):
+        super().__init__("The requested time overlaps another visit")
+        self.conflicts = conflicts
+
+
+class OwnerCalendar:
+    """
+    Interval index over one owner's active visits.
+
+    Intervals are kept sorted by start time in parallel lists. Because no
+    interval is longer than ``max_length``, every interval overlapping
+    ``[start, end)`` starts within ``[start - max_length, end)``, so a lookup
+    is two binary searches plus a scan of that narrow slice.
+    """
+
+    def __init__(self):
+        self._starts: List[float] = []
+        self._entries: List[Tuple[float, float, str]] = []
+        self._by_id: Dict[str, Tuple[float, float, str]] = {}
+        self.max_length = 0.0
+
+    def add(self, visit_id: str, start: float, end: float) -> None:
+        """
+        Insert or move a visit's interval.
+        """
+        self.remove(visit_id)
+        entry = (start, end, visit_id)
+        index = bisect_left(self._entries, entry)
+        self._entries.insert(index, entry)
+        self._starts.insert(index, start)
+        self._by_id[visit_id] = entry
+        self.max_length = max(self.max_length, end - start)
+
+    def remove(self, visit_id: str) -> None:
+        """
+        Remove a visit's interval if present.
+        """
+        entry = self._by_id.pop(visit_id, None)
+        if entry is None:
+            return
+        index = bisect_left(self._entries, entry)
+        del self._entries[index]
+        del self._starts[index]
+
+    def overlapping(self, start: float, end: float, exclude: Optional[str] = None) -> List[Tuple[float, float, str]]:
+        """
+        Return intervals overlapping ``[start, end)`` in start order.
+
+        Args:
+            start: Interval start (epoch seconds).
+            end: Interval end (epoch seconds).
+            exclude: Visit ID to ignore, e.g. the visit being re-checked.
+        """
+        low = bisect_left(self._starts, start - self.max_length)
+        high = bisect_left(self._starts, end)
+        return [
+            entry for entry in self._entries[low:high]
+            if entry[1] > start and entry[2] != exclude
+        ]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class VisitCalendarIndex:
+    """
+    Per-owner OwnerCalendars, loaded on first use and kept in sync with writes.
+
+    Writes made through VisitService update the calendar in place. Calendars
+    are reloaded after VISIT_CALENDAR_TTL_SECONDS to pick up writes made by
+    other worker processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calendars: Dict[str, Tuple[OwnerCalendar, float]] = {}
+
+    def get(self, owner_id: str, refresh: bool = False) -> OwnerCalendar:
+        """
+        Return an owner's calendar, loading it if missing, stale or ``refresh`` is set.
+        """
+        cached = self._calendars.get(owner_id)
+        if cached is not None and not refresh and time.monotonic() - cached[1] < settings.VISIT_CALENDAR_TTL_SECONDS:
+            return cached[0]
+
+        calendar = OwnerCalendar()
+        for visit in self._load_active_visits(owner_id):
+            calendar.add(visit["visit_id"], *_visit_interval(visit))
+        with self._lock:
+            self._calendars[owner_id] = (calendar, time.monotonic())
+        return calendar
+
+    @staticmethod
+    def _load_active_visits(owner_id: str) -> List[Dict[str, Any]]:
+        pets = supabase_client.table("pets").select("pet_id").eq("owner_id", owner_id).execute().data or []
+        pet_ids = [pet["pet_id"] for pet in pets]
+        # Past visits cannot conflict with new ones; keep only those that may still be running
+        since = (datetime.now(timezone.utc) - timedelta(minutes=MAX_VISIT_MINUTES)).isoformat()
+        visits: List[Dict[str, Any]] = []
+        for start in range(0, len(pet_ids), LOOKUP_CHUNK_SIZE):
+            visits.extend(
+                supabase_client.table("visit_schedules")
+                .select("visit_id, scheduled_date, duration_minutes")
+                .in_("pet_id", pet_ids[start:start + LOOKUP_CHUNK_SIZE])
+                .in_("status", list(ACTIVE_STATUSES))
+                .gte("scheduled_date", since)
+                .execute().data or []
+            )
+        return visits
+
+    def record(self, owner_id: str, visit: Dict[str, Any]) -> None:
+        """
+        Apply a written visit row to the owner's calendar, if it is loaded.
+        """
+        cached = self._calendars.get(owner_id)
+        if cached is None:
+            return
+        calendar = cached[0]
+        if visit.get("status") in ACTIVE_STATUSES:
+            calendar.add(visit["visit_id"], *_visit_interval(visit))
+        else:
+            calendar.remove(visit["visit_id"])
+
+
+visit_calendars = VisitCalendarIndex()
+
+
+class VisitService:
+    """
+    Service for handling visit scheduling database operations.
+    """
+
+    @staticmethod
+    async def check_availability(
+        owner_id: str,
+        start: datetime,
+        duration_minutes: int,
+        exclude_visit_id: Optional[str] = None,
+        refresh: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find visits on an owner's calendar overlapping a proposed slot.
+
+        Args:
+            owner_id: ID of the pet owner whose calendar is checked.
+            start: Proposed start time.
+            duration_minutes: Proposed duration.
+            exclude_visit_id: Visit to ignore (when re-checking an existing visit).
+            refresh: Reload the calendar from the database first.
+
+        Returns:
+            Conflicting slots as ``{"start", "end"}`` dictionaries.
+        """
+        calendar = visit_calendars.get(owner_id, refresh=refresh)
+        slot_start = start.timestamp()
+        conflicts = calendar.overlapping(slot_start, slot_start + duration_minutes * 60, exclude=exclude_visit_id)
+        return [
+            {
+                "start": datetime.fromtimestamp(conflict_start, timezone.utc),
+                "end": datetime.fromtimestamp(conflict_end, timezone.utc),
+            }
+            for conflict_start, conflict_end, _ in conflicts
+        ]
+
+    @staticmethod
+    async def get_busy_slots(owner_id: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """
+        List occupied slots on an owner's calendar within a time window.
+
+        Args:
+            owner_id: ID of the pet owner.
+            start: Window start.
+            end: Window end.
+
+        Returns:
+            Occupied slots as ``{"start", "end"}`` dictionaries, in start order.
+        """
+        calendar = visit_calendars.get(owner_id)
+        return [
+            {
+                "start": datetime.fromtimestamp(slot_start, timezone.utc),
+                "end": datetime.fromtimestamp(slot_end, timezone.utc),
+            }
+            for slot_start, slot_end, _ in calendar.overlapping(start.timestamp(), end.timestamp())
+        ]
+
+    @staticmethod
+    async def propose_visit(visit_data: VisitCreate, adopter_id: str, owner_id: str) -> Dict[str, Any]:
+        """
+        Propose a visit to a pet, rejecting slots that overlap the owner's other visits.
+
+        Args:
+            visit_data: Visit data for creation.
+            adopter_id: ID of the adopter proposing the visit.
+            owner_id: ID of the pet's owner.
+
+        Returns:
+            The created visit data.
+
+        Raises:
+            VisitConflictError: If the slot overlaps another pending or confirmed visit.
+        """
+        conflicts = await VisitService.check_availability(
+            owner_id, visit_data.scheduled_date, visit_data.duration_minutes
+        )
+        if conflicts:
+            raise VisitConflictError(conflicts)
+
+        visit_dict = visit_data.dict()
+        visit_dict["scheduled_date"] = visit_data.scheduled_date.isoformat()
+        visit_dict["adopter_id"] = adopter_id
+        visit_dict["status"] = VisitStatus.PENDING.value
+
+        try:
+            result = supabase_client.table("visit_schedules").insert(visit_dict).execute()
+        except APIError as e:
+            if e.code == EXCLUSION_VIOLATION:
+                # Another worker booked an overlapping slot since our calendar was loaded
+                raise VisitConflictError(await VisitService.check_availability(
+                    owner_id, visit_data.scheduled_date, visit_data.duration_minutes, refresh=True
+                )) from e
+            raise
+
+        if not result.data:
+            raise ValueError("Failed to create visit")
+
+        visit_calendars.record(owner_id, result.data[0])
+        return result.data[0]
+
+    @staticmethod
+    async def get_visit_by_id(visit_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a visit by ID, including the pet's owner.
+
+        Args:
+            visit_id: ID of the visit to retrieve.
+
+        Returns:
+            Visit data with ``owner_id`` and ``pet_name`` if found, None otherwise.
+        """
+        result = supabase_read_client.table("visit_schedules").select("*").eq("visit_id", visit_id).execute()
+
+        if not result.data:
+            return None
+
+        visit = result.data[0]
+        pet = await get_loader("pets").load(visit["pet_id"])
+        if pet is not None:
+            visit["owner_id"] = pet["owner_id"]
+            visit["pet_name"] = pet["name"]
+
+        return visit
+
+    @staticmethod
+    async def update_visit_status(visit: Dict[str, Any], status: VisitStatus) -> Dict[str, Any]:
+        """
+        Confirm or cancel a visit.
+
+        Confirming re-checks the owner's confirmed visits in the database, so
+        that a visit overlapping one confirmed through another worker is not
+        confirmed too. Pending proposals do not block a confirmation.
+
+        Args:
+            visit: Visit data as returned by ``get_visit_by_id``.
+            status: New visit status.
+
+        Returns:
+            The updated visit data.
+
+        Raises:
+            VisitConflictError: If confirming would overlap another visit.
+        """
+        owner_id = visit.get("owner_id")
+        if status == VisitStatus.CONFIRMED and owner_id:
+            conflicts = VisitService._confirmed_conflicts(owner_id, visit)
+            if conflicts:
+                raise VisitConflictError(conflicts)
+
+        try:
+            result = supabase_client.table("visit_schedules").update({"status": status.value}) \
+                .eq("visit_id", visit["visit_id"]).execute()
+        except APIError as e:
+            if e.code == EXCLUSION_VIOLATION:
+                raise VisitConflictError(VisitService._confirmed_conflicts(owner_id, visit)) from e
+            raise
+
+        if not result.data:
+            raise ValueError("Failed to update visit")
+
+        if owner_id:
+            visit_calendars.record(owner_id, result.data[0])
+        return result.data[0]
+
+    @staticmethod
+    def _confirmed_conflicts(owner_id: str, visit: Dict[str, Any]) -> List[Dict[str, Any]]:
+        start, end = _visit_interval(visit)
+        candidates = supabase_client.table("visit_schedules") \
+            .select("visit_id, scheduled_date, duration_minutes") \
+            .eq("owner_id", owner_id) \
+            .eq("status", VisitStatus.CONFIRMED.value) \
+            .neq("visit_id", visit["visit_id"]) \
+            .gte("scheduled_date", datetime.fromtimestamp(start - MAX_VISIT_MINUTES * 60, timezone.utc).isoformat()) \
+            .lt("scheduled_date", datetime.fromtimestamp(end, timezone.utc).isoformat()) \
+            .execute().data or []
+        conflicts = []
+        for candidate in candidates:
+            candidate_start, candidate_end = _visit_interval(candidate)
+            if candidate_end > start:
+                conflicts.append({
+                    "start": datetime.fromtimestamp(candidate_start, timezone.utc),
+                    "end": datetime.fromtimestamp(candidate_end, timezone.utc),
+                })
+        return sorted(conflicts, key=lambda conflict: conflict["start"])
+
+    @staticmethod
+    async def _with_names(visits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not visits:
+            return visits
+
+        pets, adopters = await asyncio.gather(
+            get_loader("pets").load_many(visit["pet_id"] for visit in visits),
+            get_loader("users").load_many(visit["adopter_id"] for visit in visits),
+        )
+
+        for visit in visits:
+            visit["pet_name"] = pets[visit["pet_id"]]["name"] if visit["pet_id"] in pets else None
+            visit["adopter_name"] = adopters[visit["adopter_id"]]["username"] if visit["adopter_id"] in adopters else None
+        return visits
+
+    @staticmethod
+    async def get_visits_for_pet(pet_id: str, adopter_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get visits for a pet, optionally only those of one adopter.
+
+        Args:
+            pet_id: ID of the pet.
+            adopter_id: Restrict to this adopter's visits.
+
+        Returns:
+            Visits ordered by scheduled date.
+        """
+        query = supabase_read_client.table("visit_schedules").select("*").eq("pet_id", pet_id)
+        if adopter_id:
+            query = query.eq("adopter_id", adopter_id)
+        result = query.order("scheduled_date").execute()
+        return await VisitService._with_names(result.data or [])
+
+    @staticmethod
+    async def get_visits_for_owner(owner_id: str) -> List[Dict[str, Any]]:
+        """
+        Get visits for all pets owned by a user.
+
+        Args:
+            owner_id: ID of the pet owner.
+
+        Returns:
+            Visits ordered by scheduled date.
+        """
+        pets = supabase_read_client.table("pets").select("pet_id").eq("owner_id", owner_id).execute().data or []
+        pet_ids = [pet["pet_id"] for pet in pets]
+
+        visits: List[Dict[str, Any]] = []
+        for start in range(0, len(pet_ids), LOOKUP_CHUNK_SIZE):
+            visits.extend(
+                supabase_read_client.table("visit_schedules").select("*")
+                .in_("pet_id", pet_ids[start:start + LOOKUP_CHUNK_SIZE])
+                .execute().data or []
+            )
+        visits.sort(key=lambda visit: visit["scheduled_date"])
+        return await VisitService._with_names(visits)
+
+    @staticmethod
+    async def get_visits_by_adopter(adopter_id: str) -> List[Dict[str, Any]]:
+        """
+        Get visits proposed by an adopter.
+
+        Args:
+            adopter_id: ID of the adopter.
+
+        Returns:
+            Visits ordered by scheduled date.
+        """
+        result = supabase_read_client.table("visit_schedules").select("*") \
+            .eq("adopter_id", adopter_id).order("scheduled_date").execute()
+        return await VisitService._with_names(result.data or [])
@@ -0,0 +1,350 @@
+"""
+HTTP load test with latency regression thresholds.
+
+Starts the PostgREST stand-in (benchmarks/postgrest_standin.py) seeded with a
+synthetic dataset, boots ``main:app`` under uvicorn against it, and drives a
+weighted mix of traffic (browsing GET /pets with filters, pet detail, login,
+applying and approving) from a fixed number of concurrent clients. Reports
+throughput, error rate and p50/p95/p99 latency per route, plus the stand-in's own mean
+time per database request so runs bounded by the stand-in stand out.
+
+With ``--save-baseline`` the results are written to the baseline file;
+otherwise they are compared with it and the run exits with status 1 when a
+route's p95/p99 latency or throughput regresses beyond the thresholds, or its
+error rate rises. A missing baseline file is an error (status 2) unless
+``--allow-missing-baseline`` is given. Baselines are machine specific: record
+one on the machine that runs the comparison. Run from the backend directory:
+
+    python benchmarks/load_test.py --save-baseline
+    python benchmarks/load_test.py --duration 30 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# Shared with the API process so the driver can sign its tokens
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "benchmark.benchmark.benchmark")
+
+from app.core.auth import create_access_token  # noqa: E402
+from postgrest_standin import PASSWORD, STATS_PATH, build_dataset  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "load_baseline.json"
+
+# Dataset sizes (users, pets, applications, stories) per --scale
+SCALES = {
+    "small": (200, 500, 300, 50),
+    "medium": (1000, 5000, 3000, 300),
+    "large": (5000, 20000, 15000, 1000),
+}
+
+# Relative weight of each scenario in the traffic mix
+DEFAULT_MIX = {"browse": 50, "detail": 25, "login": 5, "apply": 12, "approve": 8}
+
+PAGE_SIZE = 20
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    # Nearest-rank percentile of an already sorted list
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def _wait_ready(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args[1]} exited with status {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout:.0f}s")
+
+
+class Workload:
+    """
+    Picks requests for the traffic mix from the seeded dataset.
+
+    Tokens are signed locally with the API's SECRET_KEY, so only the login
+    scenario pays for password hashing. Applications created during the run
+    join the pool of applications waiting for approval; each is approved once.
+    """
+
+    def __init__(self, data: dict, mix: dict, seed: int):
+        self.rng = random.Random(seed)
+        self.scenarios = list(mix)
+        self.weights = [mix[name] for name in self.scenarios]
+        self.pets = data["pets"]
+        self.pet_owner = {pet["pet_id"]: pet["owner_id"] for pet in self.pets}
+        self.pet_types = [pet_type["pet_type_id"] for pet_type in data["pet_types"]]
+        self.adopters = [user for user in data["users"] if user["role"] == "adopter"]
+        self.usernames = [user["username"] for user in data["users"]]
+        self.tokens = {user["user_id"]: create_access_token({"sub": user["user_id"]}) for user in data["users"]}
+        self.pending = [(app["application_id"], app["pet_id"]) for app in data["adoption_applications"]]
+        self.rng.shuffle(self.pending)
+
+    def _auth(self, user_id: str) -> dict:
+        return {"Authorization": f"Bearer {self.tokens[user_id]}"}
+
+    async def run_one(self, client: httpx.AsyncClient, record) -> None:
+        scenario = self.rng.choices(self.scenarios, self.weights)[0]
+        if scenario == "approve" and not self.pending:
+            scenario = "browse"
+
+        if scenario == "browse":
+            params = {"status": "available", "limit": PAGE_SIZE, "skip": PAGE_SIZE * self.rng.randrange(5)}
+            if self.rng.random() < 0.6:
+                params["pet_type_id"] = self.rng.choice(self.pet_types)
+            if self.rng.random() < 0.3:
+                params["age_max"] = self.rng.choice([1, 3, 8])
+            if self.rng.random() < 0.5:
+                params["sort"] = "-created_at"
+            await record("GET /pets", client.get("/pets", params=params))
+        elif scenario == "detail":
+            await record("GET /pets/{id}", client.get(f"/pets/{self.rng.choice(self.pets)['pet_id']}"))
+        elif scenario == "login":
+            form = {"username": self.rng.choice(self.usernames), "password": PASSWORD}
+            await record("POST /auth/login", client.post("/auth/login", data=form))
+        elif scenario == "apply":
+            adopter = self.rng.choice(self.adopters)["user_id"]
+            pet_id = self.rng.choice(self.pets)["pet_id"]
+            response = await record("POST /adoptions", client.post(
+                "/adoptions", json={"pet_id": pet_id, "message": "Load test"}, headers=self._auth(adopter)
+            ))
+            if response is not None and response.status_code == 201:
+                self.pending.append((response.json()["application_id"], pet_id))
+        else:
+            application_id, pet_id = self.pending.pop()
+            await record("PUT /adoptions/{id}", client.put(
+                f"/adoptions/{application_id}", json={"status": "approved"}, headers=self._auth(self.pet_owner[pet_id])
+            ))
+
+
+async def drive(base_url: str, workload: Workload, concurrency: int, duration: float, warmup: float) -> dict:
+    """
+    Run the traffic mix from ``concurrency`` clients and collect per-route samples.
+
+    Returns:
+        Route label -> {"latencies": [...], "errors": n}, plus the measured window in seconds.
+    """
+    samples: dict = {}
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    async def record(label: str, request):
+        begin = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            response = None
+        end = time.perf_counter()
+        if begin >= measure_from:
+            route = samples.setdefault(label, {"latencies": [], "errors": 0})
+            route["latencies"].append(end - begin)
+            if response is None or response.status_code >= 400:
+                route["errors"] += 1
+        return response
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        while time.perf_counter() < deadline:
+            await workload.run_one(client, record)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+    return {"routes": samples, "window": time.perf_counter() - measure_from}
+
+
+def summarize(collected: dict) -> dict:
+    window = collected["window"]
+    routes = {}
+    for label, route in sorted(collected["routes"].items()):
+        ordered = sorted(route["latencies"])
+        routes[label] = {
+            "requests": len(ordered),
+            "rps": round(len(ordered) / window, 2),
+            "error_rate": round(route["errors"] / len(ordered), 4),
+            "p50_ms": round(_percentile(ordered, 0.50) * 1000, 2),
+            "p95_ms": round(_percentile(ordered, 0.95) * 1000, 2),
+            "p99_ms": round(_percentile(ordered, 0.99) * 1000, 2),
+        }
+    total = sum(route["requests"] for route in routes.values())
+    return {"total_rps": round(total / window, 2), "routes": routes}
+
+
+def compare(results: dict, baseline: dict, args) -> list:
+    """
+    Return a message for every regression beyond the thresholds.
+
+    Latency changes smaller than ``--min-delta-ms`` are ignored so that
+    millisecond-scale routes do not fail on noise.
+    """
+    failures = []
+    for label, before in baseline["routes"].items():
+        after = results["routes"].get(label)
+        if after is None:
+            failures.append(f"{label}: no requests recorded")
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            limit = before[metric] * (1 + args.max_latency_regression)
+            if after[metric] > limit and after[metric] - before[metric] > args.min_delta_ms:
+                failures.append(f"{label}: {metric} {after[metric]:.2f} > {limit:.2f} (baseline {before[metric]:.2f})")
+        floor = before["rps"] * (1 - args.max_throughput_regression)
+        if after["rps"] < floor:
+            failures.append(f"{label}: rps {after['rps']:.2f} < {floor:.2f} (baseline {before['rps']:.2f})")
+        if after["error_rate"] > before["error_rate"] + args.max_error_rate_increase:
+            failures.append(f"{label}: error rate {after['error_rate']:.2%} (baseline {before['error_rate']:.2%})")
+    return failures
+
+
+def run(args) -> dict:
+    users, pets, applications, stories = SCALES[args.scale]
+    db_port, api_port = _free_port(), _free_port()
+    queue_dir = tempfile.TemporaryDirectory()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(BACKEND_DIR)
+    env["SUPABASE_URL"] = f"http://127.0.0.1:{db_port}"
+    env.setdefault("SERVER_WARMUP", "false")
+    env.setdefault("TASK_QUEUE_PATH", str(Path(queue_dir.name) / "tasks.db"))
+    env.setdefault("NOTIFICATION_FILE_PATH", str(Path(queue_dir.name) / "notifications.jsonl"))
+
+    standin = subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve().parent / "postgrest_standin.py"), "--port", str(db_port),
+         "--users", str(users), "--pets", str(pets), "--applications", str(applications),
+         "--stories", str(stories), "--seed", str(args.seed), "--latency-ms", str(args.db_latency_ms)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL,
+    )
+    api = None
+    try:
+        _wait_ready(f"http://127.0.0.1:{db_port}/rest/v1/pet_types?limit=1", standin)
+        api = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(api_port), "--workers", str(args.workers),
+             "--log-level", "warning", "--no-access-log"],
+            cwd=BACKEND_DIR, env=env,
+        )
+        base_url = f"http://127.0.0.1:{api_port}/api/v1"
+        _wait_ready(f"{base_url}/health", api)
+
+        data = build_dataset(users, pets, applications, stories, args.seed)
+        workload = Workload(data, dict(args.mix), args.seed)
+        stats_url = f"http://127.0.0.1:{db_port}{STATS_PATH}"
+        before = httpx.get(stats_url).json()
+        collected = asyncio.run(drive(base_url, workload, args.concurrency, args.duration, args.warmup))
+        after = httpx.get(stats_url).json()
+    finally:
+        for process in (api, standin):
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=10)
+        queue_dir.cleanup()
+
+    results = summarize(collected)
+    # Time the stand-in spent serving the run (warmup included), without the simulated latency
+    standin_requests = after["requests"] - before["requests"]
+    results["standin"] = {
+        "requests": standin_requests,
+        "mean_ms": round((after["busy_seconds"] - before["busy_seconds"]) * 1000 / max(standin_requests, 1), 3),
+    }
+    results["config"] = {
+        "scale": args.scale, "concurrency": args.concurrency, "duration": args.duration,
+        "workers": args.workers, "db_latency_ms": args.db_latency_ms, "mix": dict(args.mix),
+    }
+    return results
+
+
+def _mix(value: str) -> dict:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}")
+        mix[name] = float(weight)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="medium", help="synthetic dataset size")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before measuring")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="simulated database round trip")
+    parser.add_argument("--mix", type=_mix, default=DEFAULT_MIX,
+                        help="scenario weights, e.g. browse=60,detail=30,login=10")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="report results without comparing when the baseline file does not exist")
+    parser.add_argument("--max-latency-regression", type=float, default=0.25,
+                        help="allowed relative p95/p99 increase per route")
+    parser.add_argument("--max-throughput-regression", type=float, default=0.20,
+                        help="allowed relative throughput drop per route")
+    parser.add_argument("--max-error-rate-increase", type=float, default=0.01,
+                        help="allowed absolute error rate increase per route")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="ignore latency increases smaller than this")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    if not args.save_baseline and not args.allow_missing_baseline and not args.baseline.exists():
+        parser.error(f"baseline {args.baseline} not found; record one with --save-baseline "
+                     "or pass --allow-missing-baseline")
+
+    results = run(args)
+
+    failures = []
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+    elif args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("config") != results["config"]:
+            print(f"warning: baseline was recorded with {baseline.get('config')}", file=sys.stderr)
+        failures = compare(results, baseline, args)
+
+    if args.json:
+        print(json.dumps(dict(results, regressions=failures), indent=2))
+    else:
+        print(f"{'route':<22}{'requests':>10}{'req/s':>10}{'errors':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for label, route in results["routes"].items():
+            print(f"{label:<22}{route['requests']:>10}{route['rps']:>10.1f}{route['error_rate']:>9.2%}"
+                  f"{route['p50_ms']:>10.2f}{route['p95_ms']:>10.2f}{route['p99_ms']:>10.2f}")
+        print(f"{'total':<22}{'':>10}{results['total_rps']:>10.1f}")
+        standin = results["standin"]
+        print(f"stand-in: {standin['requests']} requests, {standin['mean_ms']:.2f} ms mean own time each")
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,501 @@
+"""
+In-memory PostgREST stand-in for load tests.
+
+Serves the subset of the PostgREST API used by the services (select with
+column lists and one level of embedding, eq/neq/gt/gte/lt/lte/in/not.in/is
+filters, order, offset/limit, count via Prefer, insert/upsert, update,
+delete and the rpc functions the API calls) over a synthetic dataset, so the
+API can be benchmarked without a database. Primary key lookups and embeds go
+through per-table hash indexes, ordered reads through cached sorted copies,
+and other filters scan in memory, optionally plus a simulated round-trip
+delay; results measure the API layer relative to a baseline, not database
+tuning. ``GET /_standin/stats`` reports how many requests the stand-in served
+and the time it spent on them (without the simulated delay), so load tests
+can tell when the stand-in itself dominates the latencies.
+
+The dataset is generated deterministically from ``--seed``, so the load
+driver can rebuild the same IDs with ``build_dataset``. Run standalone with:
+
+    python benchmarks/postgrest_standin.py --port 54321 --pets 2000
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, unquote, urlparse
+
+# Password of every seeded user
+PASSWORD = "benchmark-password"
+
+PRIMARY_KEYS = {
+    "users": "user_id",
+    "user_profiles": "profile_id",
+    "pet_types": "pet_type_id",
+    "breeds": "breed_id",
+    "pets": "pet_id",
+    "pets_archive": "pet_id",
+    "adoption_applications": "application_id",
+    "adoption_applications_archive": "application_id",
+    "success_stories": "story_id",
+    "visit_schedules": "visit_id",
+    "resources": "resource_id",
+    "saved_searches": "search_id",
+    "saved_search_matches": "search_id",
+    "notification_outbox": "event_id",
+}
+
+# Request counters of the stand-in itself (not a PostgREST route)
+STATS_PATH = "/_standin/stats"
+
+# Columns filled in on insert when missing
+TIMESTAMP_DEFAULTS = {
+    "users": "created_at",
+    "pets": "created_at",
+    "adoption_applications": "submitted_at",
+    "success_stories": "published_at",
+    "saved_searches": "created_at",
+    "user_profiles": "updated_at",
+}
+
+PET_TYPES = {"Dog": ["Labrador", "Beagle", "Poodle", "Husky", "Mixed"], "Cat": ["Siamese", "Persian", "Tabby"],
+             "Rabbit": ["Lop", "Rex"], "Bird": ["Parrot", "Canary"]}
+
+
+def _id(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _timestamp(rng: random.Random, days: int = 365) -> str:
+    moment = datetime(2025, 1, 1, tzinfo=timezone.utc) - timedelta(seconds=rng.randrange(days * 86400))
+    return moment.isoformat()
+
+
+def build_dataset(users: int, pets: int, applications: int, stories: int, seed: int = 42,
+                  password_hash: str = "") -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generate the synthetic dataset.
+
+    One user in ten is a shelter, one in a hundred an admin, the rest
+    adopters; pets belong to shelters, applications come from adopters.
+
+    Args:
+        users: Number of users.
+        pets: Number of pets.
+        applications: Number of adoption applications.
+        stories: Number of success stories.
+        seed: Random seed; the same seed always yields the same rows.
+        password_hash: Stored password hash for every user.
+    """
+    rng = random.Random(seed)
+    data: Dict[str, List[Dict[str, Any]]] = {table: [] for table in PRIMARY_KEYS}
+
+    breeds_by_type = {}
+    for type_name, breed_names in PET_TYPES.items():
+        pet_type = {"pet_type_id": _id(rng), "type_name": type_name}
+        data["pet_types"].append(pet_type)
+        breeds_by_type[pet_type["pet_type_id"]] = []
+        for breed_name in breed_names:
+            breed = {"breed_id": _id(rng), "pet_type_id": pet_type["pet_type_id"], "breed_name": breed_name}
+            data["breeds"].append(breed)
+            breeds_by_type[pet_type["pet_type_id"]].append(breed["breed_id"])
+
+    for index in range(max(users, 3)):
+        role = "admin" if index % 100 == 2 else "shelter" if index % 10 == 0 else "adopter"
+        user = {
+            "user_id": _id(rng), "username": f"user{index:06d}", "email": f"user{index:06d}@example.com",
+            "password": password_hash, "role": role, "created_at": _timestamp(rng),
+        }
+        data["users"].append(user)
+        data["user_profiles"].append({
+            "profile_id": _id(rng), "user_id": user["user_id"], "full_name": f"User {index}",
+            "phone_number": None, "address": None, "additional_info": {}, "updated_at": user["created_at"],
+        })
+
+    shelters = [user for user in data["users"] if user["role"] == "shelter"]
+    adopters = [user for user in data["users"] if user["role"] == "adopter"]
+
+    for index in range(pets):
+        pet_type_id = rng.choice(data["pet_types"])["pet_type_id"]
+        data["pets"].append({
+            "pet_id": _id(rng), "owner_id": rng.choice(shelters)["user_id"], "owner_type": "shelter",
+            "name": f"Pet {index}", "pet_type_id": pet_type_id,
+            "breed_id": rng.choice(breeds_by_type[pet_type_id]), "age": rng.randrange(0, 15),
+            "gender": rng.choice(["male", "female"]), "description": "A friendly companion looking for a home.",
+            "image_url": None, "status": rng.choices(["available", "pending", "adopted"], [70, 15, 15])[0],
+            "created_at": _timestamp(rng),
+        })
+
+    for _ in range(applications):
+        data["adoption_applications"].append({
+            "application_id": _id(rng), "pet_id": rng.choice(data["pets"])["pet_id"],
+            "adopter_id": rng.choice(adopters)["user_id"], "status": "submitted",
+            "message": "We have a big garden.", "submitted_at": _timestamp(rng, 60),
+        })
+
+    adopted = [pet for pet in data["pets"] if pet["status"] == "adopted"] or data["pets"]
+    for index in range(stories):
+        data["success_stories"].append({
+            "story_id": _id(rng), "pet_id": rng.choice(adopted)["pet_id"], "adopter_id": rng.choice(adopters)["user_id"],
+            "story_title": f"Happy ending {index}", "story_content": "Settled in from the first day. " * 20,
+            "published_at": _timestamp(rng),
+        })
+    return data
+
+
+def _coerce(raw: str, sample: Any) -> Any:
+    if isinstance(sample, bool):
+        return raw == "true"
+    if isinstance(sample, int):
+        return int(raw)
+    if isinstance(sample, float):
+        return float(raw)
+    return raw
+
+
+def _list(raw: str) -> List[str]:
+    return [item.strip().strip('"') for item in raw.strip("()").split(",") if item.strip()]
+
+
+def _matches(row: Dict[str, Any], column: str, expression: str) -> bool:
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    operator, _, raw = expression.partition(".")
+    value = row.get(column)
+    if operator == "is":
+        result = value is None if raw == "null" else value is (raw == "true")
+    elif operator == "in":
+        result = value is not None and str(value) in _list(raw)
+    elif value is None:
+        result = False
+    else:
+        target = _coerce(raw, value)
+        result = {
+            "eq": value == target, "neq": value != target, "gt": value > target,
+            "gte": value >= target, "lt": value < target, "lte": value <= target,
+        }.get(operator, True)
+    return result != negate
+
+
+def _sort(rows: List[Dict[str, Any]], order: str) -> List[Dict[str, Any]]:
+    for term in reversed([term for term in order.split(",") if term]):
+        column, _, direction = term.partition(".")
+        rows = sorted(rows, key=lambda row: (row.get(column) is None, row.get(column) or 0),
+                      reverse=direction.startswith("desc"))
+    return rows
+
+
+class TableSnapshot:
+    """
+    One version of a table's rows, with lookups derived from them on first use.
+
+    Snapshots are never modified: writes publish a new snapshot with copied
+    rows, so readers can filter and sort outside the store lock. Concurrent
+    readers may both build the same index; the last one wins harmlessly.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.rows = rows
+        self._indexes: Dict[str, Dict[Any, List[Dict[str, Any]]]] = {}
+        self._ordered: Dict[str, List[Dict[str, Any]]] = {}
+
+    def lookup(self, column: str, value: Any) -> List[Dict[str, Any]]:
+        """
+        Return the rows whose ``column`` equals ``value``, through a hash index.
+        """
+        index = self._indexes.get(column)
+        if index is None:
+            index = {}
+            for row in self.rows:
+                index.setdefault(row.get(column), []).append(row)
+            self._indexes[column] = index
+        return index.get(value, [])
+
+    def ordered(self, order: str) -> List[Dict[str, Any]]:
+        """
+        Return all rows sorted by a PostgREST ``order`` parameter, cached per ordering.
+        """
+        if not order:
+            return self.rows
+        rows = self._ordered.get(order)
+        if rows is None:
+            rows = _sort(self.rows, order)
+            self._ordered[order] = rows
+        return rows
+
+
+class Store:
+    """
+    Tables held in memory as snapshots; the lock only serializes writers and
+    the swap of a table's current snapshot.
+    """
+
+    def __init__(self, data: Dict[str, List[Dict[str, Any]]]):
+        self.tables = {table: TableSnapshot(rows) for table, rows in data.items()}
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.busy_seconds = 0.0
+        self._stats_lock = threading.Lock()
+
+    def snapshot(self, table: str) -> TableSnapshot:
+        with self.lock:
+            return self.tables.setdefault(table, TableSnapshot([]))
+
+    def record(self, seconds: float) -> None:
+        with self._stats_lock:
+            self.requests += 1
+            self.busy_seconds += seconds
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {"requests": self.requests, "busy_seconds": self.busy_seconds}
+
+    def select(self, table: str, filters: List[tuple], order: str = "",
+               snapshot: Optional[TableSnapshot] = None) -> List[Dict[str, Any]]:
+        snapshot = snapshot or self.snapshot(table)
+        key = PRIMARY_KEYS.get(table)
+        # Primary key equality is the common case; answer it from the index
+        lookup = next((index for index, (column, expression) in enumerate(filters)
+                       if column == key and expression.startswith("eq.")), None)
+        if lookup is not None:
+            rows = _sort(snapshot.lookup(key, filters[lookup][1][3:]), order)
+            filters = filters[:lookup] + filters[lookup + 1:]
+        else:
+            rows = snapshot.ordered(order)
+        for column, expression in filters:
+            rows = [row for row in rows if _matches(row, column, expression)]
+        return rows
+
+    def insert(self, table: str, rows: List[Dict[str, Any]], on_conflict: Optional[str], ignore: bool):
+        """
+        Insert rows; the caller holds the lock.
+        """
+        stored = []
+        existing = self.tables.setdefault(table, TableSnapshot([])).rows
+        conflict = [column for column in (on_conflict or "").split(",") if column]
+        for row in rows:
+            row = dict(row)
+            key = PRIMARY_KEYS.get(table)
+            if key and key != "event_id":
+                row.setdefault(key, str(uuid.uuid4()))
+            if table in TIMESTAMP_DEFAULTS:
+                row.setdefault(TIMESTAMP_DEFAULTS[table], datetime.now(timezone.utc).isoformat())
+            if conflict and any(all(other.get(c) == row.get(c) for c in conflict) for other in existing + stored):
+                if ignore:
+                    continue
+            stored.append(row)
+        if stored:
+            self.tables[table] = TableSnapshot(existing + stored)
+        return stored
+
+    def update(self, table: str, filters: List[tuple], changes: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Apply ``changes`` to the matching rows; the caller holds the lock.
+        """
+        snapshot = self.tables.setdefault(table, TableSnapshot([]))
+        matched = {id(row) for row in self.select(table, filters, snapshot=snapshot)}
+        if not matched:
+            return []
+        rows = [{**row, **changes} if id(row) in matched else row for row in snapshot.rows]
+        self.tables[table] = TableSnapshot(rows)
+        return [row for row, old in zip(rows, snapshot.rows) if id(old) in matched]
+
+    def delete(self, table: str, filters: List[tuple]) -> List[Dict[str, Any]]:
+        """
+        Remove the matching rows; the caller holds the lock.
+        """
+        snapshot = self.tables.setdefault(table, TableSnapshot([]))
+        doomed = self.select(table, filters, snapshot=snapshot)
+        if doomed:
+            ids = {id(row) for row in doomed}
+            self.tables[table] = TableSnapshot([row for row in snapshot.rows if id(row) not in ids])
+        return doomed
+
+
+def _project(store: Store, table: str, rows: List[Dict[str, Any]], select: str) -> List[Dict[str, Any]]:
+    if not select or select == "*":
+        return [dict(row) for row in rows]
+    columns, embeds, depth, current = [], [], 0, ""
+    for char in select + ",":
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            (embeds if "(" in current else columns).append(current.strip())
+            current = ""
+        else:
+            current += char
+    result = []
+    key = PRIMARY_KEYS.get(table)
+    children = {embed: store.snapshot(embed[:embed.index("(")]) for embed in embeds}
+    for row in rows:
+        item = dict(row) if "*" in columns else {column: row.get(column) for column in columns}
+        for embed in embeds:
+            item[embed[:embed.index("(")]] = [dict(other) for other in children[embed].lookup(key, row.get(key))]
+        result.append(item)
+    return result
+
+
+def make_handler(store: Store, latency: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this, delayed ACKs stall keep-alive clients
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def parse_request(self):
+            # Called once the request line is in, so keep-alive idle time is not counted
+            self._started = time.perf_counter()
+            return super().parse_request()
+
+        def _parse(self):
+            url = urlparse(self.path)
+            table = unquote(url.path.rsplit("/", 1)[-1])
+            params = parse_qsl(url.query, keep_blank_values=True)
+            options = {name: value for name, value in params if name in ("select", "order", "limit", "offset",
+                                                                          "on_conflict", "columns")}
+            filters = [(name, value) for name, value in params if name not in options]
+            return url.path, table, options, filters
+
+        def _body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length)) if length else None
+
+        def _send(self, status: int, payload: Any = None, headers: Optional[Dict[str, str]] = None, head=False):
+            body = b"" if payload is None else json.dumps(payload).encode()
+            store.record(time.perf_counter() - self._started)
+            if latency:
+                time.sleep(latency)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", "0" if head else str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            if not head:
+                self.wfile.write(body)
+
+        def _read(self, head: bool):
+            path, table, options, filters = self._parse()
+            if path == STATS_PATH:
+                self._send_stats()
+                return
+            rows = store.select(table, filters, options.get("order", ""))
+            total = len(rows)
+            offset = int(options.get("offset", 0))
+            limit = int(options["limit"]) if "limit" in options else None
+            rows = rows[offset:offset + limit if limit is not None else None]
+            payload = _project(store, table, rows, options.get("select", "*"))
+            headers = {}
+            if "count=" in (self.headers.get("Prefer") or ""):
+                end = offset + len(rows) - 1
+                headers["Content-Range"] = f"{offset}-{end}/{total}" if rows else f"*/{total}"
+            self._send(200, None if head else payload, headers, head=head)
+
+        def _send_stats(self):
+            # Not recorded, so polling the stats does not skew them
+            body = json.dumps(store.stats()).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._read(head=False)
+
+        def do_HEAD(self):
+            self._read(head=True)
+
+        def do_POST(self):
+            path, table, options, _ = self._parse()
+            body = self._body()
+            if "/rpc/" in path:
+                self._rpc(table, body or {})
+                return
+            rows = body if isinstance(body, list) else [body]
+            prefer = self.headers.get("Prefer") or ""
+            with store.lock:
+                stored = store.insert(table, rows, options.get("on_conflict"), "ignore-duplicates" in prefer)
+            self._send(201, stored)
+
+        def do_PATCH(self):
+            _, table, _, filters = self._parse()
+            changes = self._body() or {}
+            with store.lock:
+                payload = store.update(table, filters, changes)
+            self._send(200, payload)
+
+        def do_DELETE(self):
+            _, table, _, filters = self._parse()
+            self._body()  # Drain the (empty) body so the connection can be reused
+            with store.lock:
+                payload = store.delete(table, filters)
+            self._send(200, payload)
+
+        def _rpc(self, name: str, args: Dict[str, Any]):
+            if name != "register_user":
+                # claim_notification_batch, analytics functions: nothing to report
+                self._send(200, [])
+                return
+            with store.lock:
+                for field in ("username", "email"):
+                    if store.tables["users"].lookup(field, args[field]):
+                        self._send(409, {
+                            "code": "23505", "details": f"Key ({field})=({args[field]}) already exists.",
+                            "hint": None, "message": f'duplicate key value violates unique constraint "users_{field}_key"',
+                        })
+                        return
+                user = store.insert("users", [{key: args[key] for key in ("username", "email", "password", "role")}],
+                                    None, False)[0]
+                store.insert("user_profiles", [{"user_id": user["user_id"],
+                                                "additional_info": args.get("additional_info") or {}}], None, False)
+            self._send(200, [user])
+
+    return Handler
+
+
+def serve(port: int, data: Dict[str, List[Dict[str, Any]]], latency: float = 0.0) -> ThreadingHTTPServer:
+    """
+    Start the stand-in on a background thread and return the server.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(Store(data), latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--pets", type=int, default=2000)
+    parser.add_argument("--applications", type=int, default=2000)
+    parser.add_argument("--stories", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated database round trip")
+    args = parser.parse_args()
+
+    # Deferred import: hashing is only needed when the dataset is built
+    from passlib.context import CryptContext
+
+    password_hash = CryptContext(schemes=["bcrypt"], deprecated="auto").hash(PASSWORD)
+    data = build_dataset(args.users, args.pets, args.applications, args.stories, args.seed, password_hash)
+    server = serve(args.port, data, args.latency_ms / 1000)
+    print(f"PostgREST stand-in listening on http://127.0.0.1:{args.port}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
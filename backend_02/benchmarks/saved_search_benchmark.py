@@ -0,0 +1,136 @@
+"""
+Saved search matching benchmark.
+
+Indexes a large number of synthetic saved searches and compares matching new
+listings against the SavedSearchIndex with a linear scan that evaluates every
+search's filters (what matching without an index would do). Run from the
+backend directory:
+
+    python benchmarks/saved_search_benchmark.py --searches 20000 --pets 500
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Settings are loaded by the service module; no backend is contacted
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_KEY", "benchmark")
+
+from app.services.saved_search_service import DIMENSIONS, SavedSearchIndex, _normalize  # noqa: E402
+
+PET_TYPES = [f"type-{index}" for index in range(8)]
+BREEDS = {pet_type: [f"{pet_type}-breed-{index}" for index in range(40)] for pet_type in PET_TYPES}
+GENDERS = ["male", "female"]
+
+
+def build_searches(count: int, seed: int) -> list:
+    """
+    Generate searches shaped like real ones: nearly all pick a pet type,
+    many a breed of that type, some a gender and an age range.
+    """
+    rng = random.Random(seed)
+    searches = []
+    for index in range(count):
+        pet_type = rng.choice(PET_TYPES)
+        filters = {"status": ["available"]}
+        if rng.random() < 0.9:
+            filters["pet_type_id"] = [pet_type]
+        if rng.random() < 0.5:
+            filters["breed_id"] = rng.sample(BREEDS[pet_type], rng.randint(1, 3))
+        if rng.random() < 0.3:
+            filters["gender"] = [rng.choice(GENDERS)]
+        if rng.random() < 0.5:
+            age_min = rng.choice([None, 0, 1, 2, 5])
+            filters["age_min"] = age_min
+            filters["age_max"] = rng.choice([None, 1, 3, 8]) if age_min is None else age_min + rng.choice([1, 3, 6])
+        searches.append({"search_id": f"search-{index}", "user_id": f"user-{index % 5000}", "filters": filters})
+    return searches
+
+
+def build_pets(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    pets = []
+    for index in range(count):
+        pet_type = rng.choice(PET_TYPES)
+        pets.append({
+            "pet_id": f"pet-{index}",
+            "pet_type_id": pet_type,
+            "breed_id": rng.choice(BREEDS[pet_type]),
+            "gender": rng.choice(GENDERS),
+            "status": "available",
+            "age": rng.choice([None, 0, 1, 2, 3, 4, 6, 9]),
+        })
+    return pets
+
+
+def linear_match(searches: list, pet: dict) -> list:
+    matched = []
+    for search in searches:
+        filters = search["filters"]
+        if any(filters.get(dimension) and _normalize(pet.get(dimension)) not in filters[dimension]
+               for dimension in DIMENSIONS):
+            continue
+        age_min, age_max = filters.get("age_min"), filters.get("age_max")
+        if age_min is not None or age_max is not None:
+            age = pet.get("age")
+            if age is None or (age_min is not None and age < age_min) or (age_max is not None and age > age_max):
+                continue
+        matched.append(search)
+    return matched
+
+
+def timed(fn, pets: list) -> tuple:
+    start = time.perf_counter()
+    matches = sum(len(fn(pet)) for pet in pets)
+    return time.perf_counter() - start, matches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--searches", type=int, default=20000, help="saved searches to index")
+    parser.add_argument("--pets", type=int, default=500, help="new listings to match")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    searches = build_searches(args.searches, args.seed)
+    pets = build_pets(args.pets, args.seed + 1)
+
+    start = time.perf_counter()
+    index = SavedSearchIndex()
+    for search in searches:
+        index.add(search)
+    build_seconds = time.perf_counter() - start
+
+    index.match(pets[0])  # builds the age tree
+    index_seconds, index_matches = timed(index.match, pets)
+    linear_seconds, linear_matches = timed(lambda pet: linear_match(searches, pet), pets)
+    assert index_matches == linear_matches, "index and linear scan disagree"
+
+    results = {
+        "searches": args.searches,
+        "pets": args.pets,
+        "matches_per_pet": round(index_matches / args.pets, 1),
+        "build_ms": round(build_seconds * 1000, 2),
+        "index_us_per_pet": round(index_seconds / args.pets * 1e6, 2),
+        "linear_us_per_pet": round(linear_seconds / args.pets * 1e6, 2),
+        "speedup": round(linear_seconds / index_seconds, 1),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for name, value in results.items():
+        print(f"{name:<24}{value:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Cold-start benchmark.
+
+Measures, in fresh interpreter processes, the time to import each router
+module and the application, and the latency of the first request served
+(including lifespan startup). Run from the backend directory:
+
+    python benchmarks/startup_benchmark.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+ROUTER_MODULES = [
+    "app.routers.auth",
+    "app.routers.users",
+    "app.routers.pets",
+    "app.routers.adoptions",
+    "app.routers.success_stories",
+]
+
+# Executed in a fresh interpreter for every run
+PROBE = """
+import json, time, warnings
+warnings.simplefilter("ignore")
+timings = {}
+start = time.perf_counter()
+import fastapi
+timings["import_fastapi"] = time.perf_counter() - start
+for module in %(modules)r:
+    t = time.perf_counter()
+    __import__(module)
+    timings["import_" + module.rsplit(".", 1)[-1]] = time.perf_counter() - t
+t = time.perf_counter()
+import main
+timings["import_main"] = time.perf_counter() - t
+timings["import_total"] = time.perf_counter() - start
+from fastapi.testclient import TestClient
+t = time.perf_counter()
+with TestClient(main.app) as client:
+    response = client.get(main.settings.API_PREFIX + "/health")
+    timings["first_request"] = time.perf_counter() - t
+    assert response.status_code == 200, response.text
+    t = time.perf_counter()
+    client.get(main.settings.API_PREFIX + "/health")
+    timings["second_request"] = time.perf_counter() - t
+timings["process_ready"] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+
+def run_probe() -> dict:
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "benchmark")
+    env.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+    env.setdefault("SUPABASE_KEY", "benchmark.benchmark.benchmark")
+    env.setdefault("SERVER_WARMUP", "false")
+    env["PYTHONPATH"] = str(BACKEND_DIR)
+
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE % {"modules": ROUTER_MODULES}],
+        cwd=BACKEND_DIR,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts to measure")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    samples = [run_probe() for _ in range(args.runs)]
+    summary = {
+        name: {
+            "median_ms": round(statistics.median(s[name] for s in samples) * 1000, 2),
+            "max_ms": round(max(s[name] for s in samples) * 1000, 2),
+        }
+        for name in samples[0]
+    }
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"{'phase':<28}{'median (ms)':>14}{'max (ms)':>12}")
+    for name, values in summary.items():
+        print(f"{name:<28}{values['median_ms']:>14.2f}{values['max_ms']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
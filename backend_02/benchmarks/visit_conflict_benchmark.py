@@ -0,0 +1,105 @@
+"""
+Visit conflict detection benchmark.
+
+Builds a shelter calendar with thousands of visits and compares conflict
+checks against the OwnerCalendar interval index with a linear scan over all
+visits (what a query-per-check or list filter would do). Run from the backend
+directory:
+
+    python benchmarks/visit_conflict_benchmark.py --visits 5000 --checks 20000
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.visit_service import OwnerCalendar  # noqa: E402
+
+SLOT_SECONDS = 15 * 60
+DURATIONS = (30 * 60, 45 * 60, 60 * 60, 90 * 60)
+
+
+def build_visits(count: int, seed: int) -> list:
+    """
+    Generate non-overlapping visits spread over business hours.
+    """
+    rng = random.Random(seed)
+    visits = []
+    cursor = 0.0
+    for index in range(count):
+        cursor += rng.choice((0, 1, 2, 4)) * SLOT_SECONDS
+        duration = rng.choice(DURATIONS)
+        visits.append((f"visit-{index}", cursor, cursor + duration))
+        cursor += duration
+    return visits
+
+
+def linear_conflicts(visits: list, start: float, end: float) -> list:
+    return [visit for visit in visits if visit[1] < end and visit[2] > start]
+
+
+def timed(fn, queries: list) -> tuple:
+    start = time.perf_counter()
+    hits = sum(1 for query in queries if fn(*query))
+    return time.perf_counter() - start, hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--visits", type=int, default=5000, help="visits on the shelter's calendar")
+    parser.add_argument("--checks", type=int, default=20000, help="conflict checks to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    visits = build_visits(args.visits, args.seed)
+    horizon = visits[-1][2]
+
+    start = time.perf_counter()
+    calendar = OwnerCalendar()
+    for visit_id, visit_start, visit_end in visits:
+        calendar.add(visit_id, visit_start, visit_end)
+    build_seconds = time.perf_counter() - start
+
+    rng = random.Random(args.seed + 1)
+    queries = []
+    for _ in range(args.checks):
+        query_start = rng.uniform(0, horizon)
+        queries.append((query_start, query_start + rng.choice(DURATIONS)))
+
+    index_seconds, index_hits = timed(calendar.overlapping, queries)
+    linear_seconds, linear_hits = timed(lambda s, e: linear_conflicts(visits, s, e), queries)
+    assert index_hits == linear_hits, "index and linear scan disagree"
+
+    # Writes: cancel and re-propose a random visit, as confirm/cancel do
+    start = time.perf_counter()
+    for visit_id, visit_start, visit_end in rng.sample(visits, min(len(visits), 1000)):
+        calendar.remove(visit_id)
+        calendar.add(visit_id, visit_start, visit_end)
+    update_seconds = time.perf_counter() - start
+
+    results = {
+        "visits": args.visits,
+        "checks": args.checks,
+        "conflicting_checks": index_hits,
+        "build_ms": round(build_seconds * 1000, 2),
+        "index_us_per_check": round(index_seconds / args.checks * 1e6, 2),
+        "linear_us_per_check": round(linear_seconds / args.checks * 1e6, 2),
+        "speedup": round(linear_seconds / index_seconds, 1),
+        "update_us_per_write": round(update_seconds / min(len(visits), 1000) * 1e6, 2),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for name, value in results.items():
+        print(f"{name:<24}{value:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,112 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.concurrency import AdaptiveConcurrencyLimiter, ConcurrencyLimitMiddleware
 from app.core.config import settings
-from app.routers import auth, users, pets, adoptions, success_stories
+from app.core.database import close_supabase_client, get_replica_clients, get_supabase_client
+from app.core.dataloader import DataLoaderMiddleware
+from app.core.idempotency import IdempotencyMiddleware, IdempotencyStore
+from app.core.metrics import register_metrics
+from app.core.profiling import ProfilingMiddleware, get_profiler
+from app.core.read_routing import ReadYourWritesMiddleware
+from app.core.resilience import CircuitOpenError, circuit_open_exception_handler, get_stale_reads
+from app.core.task_queue import get_task_queue
+from app.core.warmup import run_warmup
+from app.services.archive_service import get_pet_archiver
+from app.services.notification_service import get_notification_dispatcher
+from app.routers import auth, users, pets, adoptions, success_stories, system, visits, resources, analytics, export, saved_searches, profiling
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create this worker's clients and warm caches before accepting traffic,
+    and run background task consumers, the notification dispatcher and the
+    pet archiver for the worker's lifetime.
+    """
+    get_supabase_client()
+    get_replica_clients()
+    if settings.SERVER_WARMUP:
+        await run_warmup()
+    await get_task_queue().start()
+    await get_notification_dispatcher().start()
+    if settings.ARCHIVE_ENABLED:
+        await get_pet_archiver().start()
+    yield
+    await get_pet_archiver().stop()
+    await get_notification_dispatcher().stop()
+    await get_task_queue().stop()
+    close_supabase_client()
+
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.PROJECT_VERSION,
-    openapi_url=f"{settings.API_PREFIX}/openapi.json"
+    openapi_url=f"{settings.API_PREFIX}/openapi.json",
+    lifespan=lifespan
+)
+
+# Cap in-flight requests per worker and shed excess load with fast 503s.
+# Added before CORS so that shed responses still carry CORS headers.
+concurrency_limiter = AdaptiveConcurrencyLimiter(
+    initial_limit=settings.CONCURRENCY_INITIAL_LIMIT,
+    min_limit=settings.CONCURRENCY_MIN_LIMIT,
+    max_limit=settings.CONCURRENCY_MAX_LIMIT,
+    latency_tolerance=settings.CONCURRENCY_LATENCY_TOLERANCE,
+    backoff_ratio=settings.CONCURRENCY_BACKOFF_RATIO,
+    low_priority_share=settings.CONCURRENCY_LOW_PRIORITY_SHARE,
+    max_queue=settings.CONCURRENCY_MAX_QUEUE,
+    queue_timeout=settings.CONCURRENCY_QUEUE_TIMEOUT_SECONDS,
+)
+register_metrics("concurrency", concurrency_limiter.snapshot)
+register_metrics("stale_reads", lambda: get_stale_reads().snapshot())
+register_metrics("task_queue", lambda: get_task_queue().snapshot())
+register_metrics("notifications", lambda: get_notification_dispatcher().snapshot())
+register_metrics("archive", lambda: get_pet_archiver().snapshot())
+app.add_middleware(
+    ConcurrencyLimitMiddleware,
+    limiter=concurrency_limiter,
+    exempt_paths={f"{settings.API_PREFIX}/health"},
+    retry_after=settings.CONCURRENCY_RETRY_AFTER_SECONDS,
+)
+
+# Replay stored responses for retried POSTs carrying an Idempotency-Key.
+# Added after the limiter so that replays and waiting duplicates do not take a slot.
+idempotency_store = IdempotencyStore(
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+    max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+)
+register_metrics("idempotency", idempotency_store.snapshot)
+app.add_middleware(
+    IdempotencyMiddleware,
+    store=idempotency_store,
+    paths={
+        f"{settings.API_PREFIX}/adoptions",
+        f"{settings.API_PREFIX}/pets",
+        f"{settings.API_PREFIX}/stories",
+    },
+    max_body_bytes=settings.IDEMPOTENCY_MAX_BODY_BYTES,
+)
+
+# Fail fast with 503 while a table's circuit breaker is open
+app.add_exception_handler(CircuitOpenError, circuit_open_exception_handler)
+
+# Pin a client's reads to the primary for a short window after it writes
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Batch and memoize entity lookups (users, pets, breeds, pet types) per request
+app.add_middleware(DataLoaderMiddleware)
+
+# Sample the stacks of selected requests (off unless enabled; see PROFILING_* settings)
+register_metrics("profiling", lambda: get_profiler().snapshot())
+app.add_middleware(
+    ProfilingMiddleware,
+    profiler=get_profiler(),
+    exempt_prefixes=(f"{settings.API_PREFIX}/profiling",),
 )
 
 # Set up CORS middleware
@@ -19,14 +116,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Total-Count-Method"],
 )
 
 # Include API routers
+app.include_router(system.router, prefix=settings.API_PREFIX, tags=["System"])
 app.include_router(auth.router, prefix=f"{settings.API_PREFIX}/auth", tags=["Authentication"])
 app.include_router(users.router, prefix=f"{settings.API_PREFIX}/users", tags=["Users"])
 app.include_router(pets.router, prefix=f"{settings.API_PREFIX}/pets", tags=["Pets"])
 app.include_router(adoptions.router, prefix=f"{settings.API_PREFIX}/adoptions", tags=["Adoptions"])
 app.include_router(success_stories.router, prefix=f"{settings.API_PREFIX}/stories", tags=["Success Stories"])
+app.include_router(visits.router, prefix=f"{settings.API_PREFIX}/visits", tags=["Visits"])
+app.include_router(resources.router, prefix=f"{settings.API_PREFIX}/resources", tags=["Resources"])
+app.include_router(analytics.router, prefix=f"{settings.API_PREFIX}/analytics", tags=["Analytics"])
+app.include_router(export.router, prefix=f"{settings.API_PREFIX}/export", tags=["Export"])
+app.include_router(saved_searches.router, prefix=f"{settings.API_PREFIX}/saved-searches", tags=["Saved Searches"])
+app.include_router(profiling.router, prefix=f"{settings.API_PREFIX}/profiling", tags=["Profiling"])
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
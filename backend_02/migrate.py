@@ -0,0 +1,79 @@
+"""
+Database migration tool.
+
+Applies the versioned SQL files in migrations/ to the Postgres database at
+DATABASE_URL (or --database-url) and records them in schema_migrations:
+
+    python migrate.py                  # apply pending migrations
+    python migrate.py status           # list applied, pending and modified migrations
+    python migrate.py baseline 0003    # mark migrations as applied without running them
+    python migrate.py check-plans      # migrate, then EXPLAIN the service queries
+
+Databases created by the old database_setup.sql script are upgraded with
+plain ``up``, not ``baseline``: 0001 only uses IF NOT EXISTS, OR REPLACE and
+DROP ... IF EXISTS statements, so it runs cleanly on such a database and adds
+what the old script lacked (notification outbox, analytics tables, visit and
+resource columns, indexes). ``baseline`` is for databases whose schema is
+already known to match a migration, e.g. restored from a dump of one.
+
+``check-plans`` is meant for CI against a local Postgres: it exits non-zero
+if any service query would scan a large table without an index.
+"""
+import argparse
+import logging
+import sys
+
+from app.core.migrations import MigrationError, MigrationRunner
+from app.core.query_plans import check_query_plans
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", default="up", choices=["up", "status", "baseline", "check-plans"])
+    parser.add_argument("version", nargs="?", help="target version (up) or last version to mark (baseline)")
+    parser.add_argument("--database-url", help="Postgres connection string (defaults to DATABASE_URL)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    database_url = args.database_url
+    if not database_url:
+        from app.core.config import settings
+
+        database_url = settings.DATABASE_URL
+    if not database_url:
+        parser.error("set DATABASE_URL or pass --database-url")
+
+    runner = MigrationRunner(database_url)
+    try:
+        if args.command == "status":
+            for migration in runner.status():
+                print(f"{migration['version']}  {migration['state']:<9}{migration['name']}")
+            return 0
+
+        if args.command == "baseline":
+            if not args.version:
+                parser.error("baseline needs the last version already present in the database")
+            for migration in runner.baseline(args.version):
+                print(f"Marked {migration.path.name} as applied")
+            return 0
+
+        applied = runner.migrate(args.version if args.command == "up" else None)
+        print(f"Applied {len(applied)} migration(s)")
+
+        if args.command == "check-plans":
+            with runner.connect() as conn:
+                failures = check_query_plans(conn)
+            for caller, problems in failures.items():
+                for problem in problems:
+                    print(f"FAIL {caller}: {problem}", file=sys.stderr)
+            if failures:
+                return 1
+            print("All service queries use an index")
+    except MigrationError as e:
+        print(f"Migration failed: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,389 @@
+-- Initial schema (formerly database_setup.sql)
+
+CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+
+-- Users Table
+CREATE TABLE IF NOT EXISTS users (
+    user_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    username VARCHAR(50) UNIQUE NOT NULL,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    password VARCHAR(255) NOT NULL,
+    role VARCHAR(20) NOT NULL CHECK (role IN ('adopter', 'individual', 'shelter', 'admin')),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- User Profiles Table
+CREATE TABLE IF NOT EXISTS user_profiles (
+    profile_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID REFERENCES users(user_id) ON DELETE CASCADE,
+    full_name VARCHAR(100),
+    phone_number VARCHAR(20),
+    address TEXT,
+    additional_info JSONB DEFAULT '{}'::jsonb,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Pet Types Table
+CREATE TABLE IF NOT EXISTS pet_types (
+    pet_type_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    type_name VARCHAR(50) UNIQUE NOT NULL
+);
+
+-- Breeds Table
+CREATE TABLE IF NOT EXISTS breeds (
+    breed_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    pet_type_id UUID REFERENCES pet_types(pet_type_id) ON DELETE CASCADE,
+    breed_name VARCHAR(100) NOT NULL,
+    UNIQUE(pet_type_id, breed_name)
+);
+
+-- Pets Table
+CREATE TABLE IF NOT EXISTS pets (
+    pet_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    owner_id UUID REFERENCES users(user_id) ON DELETE CASCADE,
+    owner_type VARCHAR(20) NOT NULL CHECK (owner_type IN ('shelter', 'individual')),
+    name VARCHAR(100) NOT NULL,
+    pet_type_id UUID REFERENCES pet_types(pet_type_id),
+    breed_id UUID REFERENCES breeds(breed_id),
+    age INTEGER,
+    gender VARCHAR(10),
+    description TEXT,
+    image_url TEXT,
+    status VARCHAR(20) DEFAULT 'available' CHECK (status IN ('available', 'pending', 'adopted')),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Adoption Applications Table
+CREATE TABLE IF NOT EXISTS adoption_applications (
+    application_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    pet_id UUID REFERENCES pets(pet_id) ON DELETE CASCADE,
+    adopter_id UUID REFERENCES users(user_id) ON DELETE CASCADE,
+    message TEXT,
+    status VARCHAR(20) DEFAULT 'submitted' CHECK (status IN ('submitted', 'approved', 'rejected')),
+    submitted_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Success Stories Table
+CREATE TABLE IF NOT EXISTS success_stories (
+    story_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    pet_id UUID REFERENCES pets(pet_id) ON DELETE CASCADE,
+    adopter_id UUID REFERENCES users(user_id) ON DELETE CASCADE,
+    story_title VARCHAR(255) NOT NULL,
+    story_content TEXT NOT NULL,
+    image_url TEXT,
+    published_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Keyset paging indexes for owner- and adopter-scoped exports
+CREATE INDEX IF NOT EXISTS pets_owner_id_idx ON pets (owner_id, pet_id);
+CREATE INDEX IF NOT EXISTS adoption_applications_pet_id_idx ON adoption_applications (pet_id, application_id);
+CREATE INDEX IF NOT EXISTS adoption_applications_adopter_id_idx ON adoption_applications (adopter_id, application_id);
+CREATE INDEX IF NOT EXISTS success_stories_pet_id_idx ON success_stories (pet_id, story_id);
+CREATE INDEX IF NOT EXISTS success_stories_adopter_id_idx ON success_stories (adopter_id, story_id);
+
+-- Resources Table
+CREATE TABLE IF NOT EXISTS resources (
+    resource_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    title VARCHAR(255) NOT NULL,
+    content TEXT NOT NULL,
+    category VARCHAR(50),
+    author_id UUID REFERENCES users(user_id) ON DELETE SET NULL,
+    published_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Sanitized HTML rendered from the markdown content when a resource is written
+ALTER TABLE resources ADD COLUMN IF NOT EXISTS content_html TEXT;
+CREATE INDEX IF NOT EXISTS resources_category_published_idx ON resources (category, published_at DESC);
+
+-- Visit Schedules Table
+CREATE TABLE IF NOT EXISTS visit_schedules (
+    visit_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    pet_id UUID REFERENCES pets(pet_id) ON DELETE CASCADE,
+    adopter_id UUID REFERENCES users(user_id) ON DELETE CASCADE,
+    scheduled_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    duration_minutes INTEGER NOT NULL DEFAULT 60 CHECK (duration_minutes > 0),
+    status VARCHAR(20) DEFAULT 'pending' CHECK (status IN ('pending', 'confirmed', 'completed', 'cancelled')),
+    message TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE visit_schedules ADD COLUMN IF NOT EXISTS duration_minutes INTEGER NOT NULL DEFAULT 60;
+CREATE INDEX IF NOT EXISTS visit_schedules_pet_date_idx ON visit_schedules (pet_id, scheduled_date);
+
+-- Notification Outbox Table
+-- Rows are written by triggers in the same transaction as the change they describe
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    event_id BIGSERIAL PRIMARY KEY,
+    recipient_id UUID REFERENCES users(user_id) ON DELETE CASCADE,
+    event_type VARCHAR(50) NOT NULL,
+    payload JSONB DEFAULT '{}'::jsonb,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    claimed_until TIMESTAMP WITH TIME ZONE,
+    delivered_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS notification_outbox_undelivered_idx
+    ON notification_outbox (recipient_id, created_at) WHERE delivered_at IS NULL;
+
+-- Notify pet owners of new applications and adopters of status changes
+CREATE OR REPLACE FUNCTION enqueue_application_notifications() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO notification_outbox (recipient_id, event_type, payload)
+        SELECT p.owner_id, 'application_submitted', jsonb_build_object(
+            'application_id', NEW.application_id, 'pet_id', NEW.pet_id, 'pet_name', p.name
+        )
+        FROM pets p WHERE p.pet_id = NEW.pet_id;
+    ELSIF NEW.status IS DISTINCT FROM OLD.status THEN
+        INSERT INTO notification_outbox (recipient_id, event_type, payload)
+        SELECT NEW.adopter_id, 'application_status_changed', jsonb_build_object(
+            'application_id', NEW.application_id, 'pet_id', NEW.pet_id, 'pet_name', p.name, 'status', NEW.status
+        )
+        FROM pets p WHERE p.pet_id = NEW.pet_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS adoption_applications_notify ON adoption_applications;
+CREATE TRIGGER adoption_applications_notify
+    AFTER INSERT OR UPDATE OF status ON adoption_applications
+    FOR EACH ROW EXECUTE FUNCTION enqueue_application_notifications();
+
+-- Lease a batch of undelivered events to a dispatcher. Only recipients whose
+-- oldest undelivered event has waited a full digest window are included, so
+-- their events are delivered together as one digest.
+CREATE OR REPLACE FUNCTION claim_notification_batch(
+    digest_window_seconds INTEGER,
+    batch_size INTEGER,
+    lease_seconds INTEGER
+) RETURNS SETOF notification_outbox AS $$
+    UPDATE notification_outbox o
+    SET claimed_until = NOW() + make_interval(secs => lease_seconds)
+    WHERE o.event_id IN (
+        SELECT event_id FROM notification_outbox
+        WHERE delivered_at IS NULL
+          AND (claimed_until IS NULL OR claimed_until < NOW())
+          AND recipient_id IN (
+              SELECT recipient_id FROM notification_outbox
+              WHERE delivered_at IS NULL
+              GROUP BY recipient_id
+              HAVING MIN(created_at) <= NOW() - make_interval(secs => digest_window_seconds)
+          )
+        ORDER BY recipient_id, event_id
+        LIMIT batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING o.*;
+$$ LANGUAGE sql;
+
+-- Adoption Analytics Summary Tables
+-- Maintained incrementally by triggers on pets and adoption_applications, so
+-- analytics endpoints never aggregate over the base tables.
+CREATE TABLE IF NOT EXISTS analytics_pet_funnel (
+    pet_id UUID PRIMARY KEY REFERENCES pets(pet_id) ON DELETE CASCADE,
+    owner_id UUID,
+    pet_type_id UUID,
+    listed_at TIMESTAMP WITH TIME ZONE,
+    applications_total INTEGER NOT NULL DEFAULT 0,
+    applications_submitted INTEGER NOT NULL DEFAULT 0,
+    applications_approved INTEGER NOT NULL DEFAULT 0,
+    applications_rejected INTEGER NOT NULL DEFAULT 0,
+    adopted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS analytics_owner_summary (
+    owner_id UUID PRIMARY KEY REFERENCES users(user_id) ON DELETE CASCADE,
+    pets_listed INTEGER NOT NULL DEFAULT 0,
+    pets_adopted INTEGER NOT NULL DEFAULT 0,
+    applications_total INTEGER NOT NULL DEFAULT 0,
+    applications_approved INTEGER NOT NULL DEFAULT 0,
+    applications_rejected INTEGER NOT NULL DEFAULT 0,
+    adoption_seconds_total DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS analytics_pet_type_summary (
+    pet_type_id UUID PRIMARY KEY REFERENCES pet_types(pet_type_id) ON DELETE CASCADE,
+    pets_listed INTEGER NOT NULL DEFAULT 0,
+    pets_adopted INTEGER NOT NULL DEFAULT 0,
+    applications_total INTEGER NOT NULL DEFAULT 0,
+    applications_approved INTEGER NOT NULL DEFAULT 0,
+    applications_rejected INTEGER NOT NULL DEFAULT 0,
+    adoption_seconds_total DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS analytics_pet_funnel_applications_idx
+    ON analytics_pet_funnel (applications_total DESC);
+
+-- Apply counter deltas to the owner and pet type summaries
+CREATE OR REPLACE FUNCTION analytics_bump(
+    p_owner_id UUID,
+    p_pet_type_id UUID,
+    d_listed INTEGER,
+    d_adopted INTEGER,
+    d_applications INTEGER,
+    d_approved INTEGER,
+    d_rejected INTEGER,
+    d_adoption_seconds DOUBLE PRECISION
+) RETURNS VOID AS $$
+BEGIN
+    IF p_owner_id IS NOT NULL THEN
+        INSERT INTO analytics_owner_summary AS s (
+            owner_id, pets_listed, pets_adopted, applications_total,
+            applications_approved, applications_rejected, adoption_seconds_total
+        )
+        VALUES (p_owner_id, d_listed, d_adopted, d_applications, d_approved, d_rejected, d_adoption_seconds)
+        ON CONFLICT (owner_id) DO UPDATE SET
+            pets_listed = s.pets_listed + EXCLUDED.pets_listed,
+            pets_adopted = s.pets_adopted + EXCLUDED.pets_adopted,
+            applications_total = s.applications_total + EXCLUDED.applications_total,
+            applications_approved = s.applications_approved + EXCLUDED.applications_approved,
+            applications_rejected = s.applications_rejected + EXCLUDED.applications_rejected,
+            adoption_seconds_total = s.adoption_seconds_total + EXCLUDED.adoption_seconds_total,
+            updated_at = NOW();
+    END IF;
+    IF p_pet_type_id IS NOT NULL THEN
+        INSERT INTO analytics_pet_type_summary AS s (
+            pet_type_id, pets_listed, pets_adopted, applications_total,
+            applications_approved, applications_rejected, adoption_seconds_total
+        )
+        VALUES (p_pet_type_id, d_listed, d_adopted, d_applications, d_approved, d_rejected, d_adoption_seconds)
+        ON CONFLICT (pet_type_id) DO UPDATE SET
+            pets_listed = s.pets_listed + EXCLUDED.pets_listed,
+            pets_adopted = s.pets_adopted + EXCLUDED.pets_adopted,
+            applications_total = s.applications_total + EXCLUDED.applications_total,
+            applications_approved = s.applications_approved + EXCLUDED.applications_approved,
+            applications_rejected = s.applications_rejected + EXCLUDED.applications_rejected,
+            adoption_seconds_total = s.adoption_seconds_total + EXCLUDED.adoption_seconds_total,
+            updated_at = NOW();
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION analytics_on_pet_change() RETURNS TRIGGER AS $$
+DECLARE
+    adoption_seconds DOUBLE PRECISION;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO analytics_pet_funnel (pet_id, owner_id, pet_type_id, listed_at)
+        VALUES (NEW.pet_id, NEW.owner_id, NEW.pet_type_id, NEW.created_at)
+        ON CONFLICT (pet_id) DO NOTHING;
+        PERFORM analytics_bump(NEW.owner_id, NEW.pet_type_id, 1, 0, 0, 0, 0, 0);
+    ELSIF NEW.status = 'adopted' AND OLD.status IS DISTINCT FROM 'adopted' THEN
+        adoption_seconds := EXTRACT(EPOCH FROM NOW() - NEW.created_at);
+        UPDATE analytics_pet_funnel SET adopted_at = NOW() WHERE pet_id = NEW.pet_id;
+        PERFORM analytics_bump(NEW.owner_id, NEW.pet_type_id, 0, 1, 0, 0, 0, adoption_seconds);
+    ELSIF OLD.status = 'adopted' AND NEW.status IS DISTINCT FROM 'adopted' THEN
+        SELECT EXTRACT(EPOCH FROM adopted_at - NEW.created_at) INTO adoption_seconds
+        FROM analytics_pet_funnel WHERE pet_id = NEW.pet_id;
+        UPDATE analytics_pet_funnel SET adopted_at = NULL WHERE pet_id = NEW.pet_id;
+        PERFORM analytics_bump(NEW.owner_id, NEW.pet_type_id, 0, -1, 0, 0, 0, -COALESCE(adoption_seconds, 0));
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS pets_analytics ON pets;
+CREATE TRIGGER pets_analytics
+    AFTER INSERT OR UPDATE OF status ON pets
+    FOR EACH ROW EXECUTE FUNCTION analytics_on_pet_change();
+
+CREATE OR REPLACE FUNCTION analytics_on_application_change() RETURNS TRIGGER AS $$
+DECLARE
+    pet RECORD;
+    d_submitted INTEGER := 0;
+    d_approved INTEGER := 0;
+    d_rejected INTEGER := 0;
+    d_total INTEGER := 0;
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW.status IS NOT DISTINCT FROM OLD.status THEN
+        RETURN NEW;
+    END IF;
+    SELECT owner_id, pet_type_id INTO pet FROM pets WHERE pet_id = NEW.pet_id;
+
+    IF TG_OP = 'INSERT' THEN
+        d_total := 1;
+    ELSE
+        d_submitted := d_submitted - (OLD.status IS NOT DISTINCT FROM 'submitted')::INTEGER;
+        d_approved := d_approved - (OLD.status IS NOT DISTINCT FROM 'approved')::INTEGER;
+        d_rejected := d_rejected - (OLD.status IS NOT DISTINCT FROM 'rejected')::INTEGER;
+    END IF;
+    d_submitted := d_submitted + (NEW.status IS NOT DISTINCT FROM 'submitted')::INTEGER;
+    d_approved := d_approved + (NEW.status IS NOT DISTINCT FROM 'approved')::INTEGER;
+    d_rejected := d_rejected + (NEW.status IS NOT DISTINCT FROM 'rejected')::INTEGER;
+
+    UPDATE analytics_pet_funnel SET
+        applications_total = applications_total + d_total,
+        applications_submitted = applications_submitted + d_submitted,
+        applications_approved = applications_approved + d_approved,
+        applications_rejected = applications_rejected + d_rejected
+    WHERE pet_id = NEW.pet_id;
+    PERFORM analytics_bump(pet.owner_id, pet.pet_type_id, 0, 0, d_total, d_approved, d_rejected, 0);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS adoption_applications_analytics ON adoption_applications;
+CREATE TRIGGER adoption_applications_analytics
+    AFTER INSERT OR UPDATE OF status ON adoption_applications
+    FOR EACH ROW EXECUTE FUNCTION analytics_on_application_change();
+
+-- Recompute every summary from the base tables (initial backfill or drift repair)
+CREATE OR REPLACE FUNCTION analytics_rebuild() RETURNS VOID AS $$
+BEGIN
+    DELETE FROM analytics_pet_funnel;
+    DELETE FROM analytics_owner_summary;
+    DELETE FROM analytics_pet_type_summary;
+
+    INSERT INTO analytics_pet_funnel (
+        pet_id, owner_id, pet_type_id, listed_at, applications_total,
+        applications_submitted, applications_approved, applications_rejected, adopted_at
+    )
+    SELECT
+        p.pet_id, p.owner_id, p.pet_type_id, p.created_at,
+        COUNT(a.application_id),
+        COUNT(a.application_id) FILTER (WHERE a.status = 'submitted'),
+        COUNT(a.application_id) FILTER (WHERE a.status = 'approved'),
+        COUNT(a.application_id) FILTER (WHERE a.status = 'rejected'),
+        CASE WHEN p.status = 'adopted' THEN MAX(a.submitted_at) FILTER (WHERE a.status = 'approved') END
+    FROM pets p
+    LEFT JOIN adoption_applications a ON a.pet_id = p.pet_id
+    GROUP BY p.pet_id;
+
+    INSERT INTO analytics_owner_summary (
+        owner_id, pets_listed, pets_adopted, applications_total,
+        applications_approved, applications_rejected, adoption_seconds_total
+    )
+    SELECT
+        owner_id, COUNT(*), COUNT(adopted_at), SUM(applications_total),
+        SUM(applications_approved), SUM(applications_rejected),
+        COALESCE(SUM(EXTRACT(EPOCH FROM adopted_at - listed_at)), 0)
+    FROM analytics_pet_funnel WHERE owner_id IS NOT NULL GROUP BY owner_id;
+
+    INSERT INTO analytics_pet_type_summary (
+        pet_type_id, pets_listed, pets_adopted, applications_total,
+        applications_approved, applications_rejected, adoption_seconds_total
+    )
+    SELECT
+        pet_type_id, COUNT(*), COUNT(adopted_at), SUM(applications_total),
+        SUM(applications_approved), SUM(applications_rejected),
+        COALESCE(SUM(EXTRACT(EPOCH FROM adopted_at - listed_at)), 0)
+    FROM analytics_pet_funnel WHERE pet_type_id IS NOT NULL GROUP BY pet_type_id;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT analytics_rebuild();
+
+-- Insert some initial pet types
+INSERT INTO pet_types (type_name) 
+VALUES ('Dog'), ('Cat'), ('Bird'), ('Rabbit'), ('Hamster'), ('Guinea Pig'), ('Fish')
+ON CONFLICT (type_name) DO NOTHING;
+
+-- Create RLS policies for enhanced security
+-- This should be adapted to match your actual security requirements
+-- ALTER TABLE users ENABLE ROW LEVEL SECURITY;
+-- CREATE POLICY users_policy ON users FOR ALL USING (auth.uid() = user_id OR EXISTS (SELECT 1 FROM users WHERE user_id = auth.uid() AND role = 'admin'));
+
+-- Add more RLS policies as needed for your application
@@ -0,0 +1,26 @@
+-- migrate: no-transaction
+-- Indexes for the filters and lookups issued by the services. Built
+-- CONCURRENTLY so that applying them does not block writes on a live database.
+
+-- PetService.get_pets filters and the recommendation index rebuild (status, keyset on pet_id)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS pets_status_pet_id_idx ON pets (status, pet_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS pets_pet_type_id_status_idx ON pets (pet_type_id, status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS pets_breed_id_idx ON pets (breed_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS pets_age_idx ON pets (age);
+
+-- SuccessStoryService.get_all_stories (newest first)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS success_stories_published_at_idx ON success_stories (published_at DESC);
+
+-- Profile lookups by user
+CREATE INDEX CONCURRENTLY IF NOT EXISTS user_profiles_user_id_idx ON user_profiles (user_id);
+
+-- VisitService.get_visits_by_adopter
+CREATE INDEX CONCURRENTLY IF NOT EXISTS visit_schedules_adopter_date_idx ON visit_schedules (adopter_id, scheduled_date);
+
+-- AnalyticsService.get_pet_funnels for one owner
+CREATE INDEX CONCURRENTLY IF NOT EXISTS analytics_pet_funnel_owner_idx
+    ON analytics_pet_funnel (owner_id, applications_total DESC);
+
+-- AnalyticsService.get_shelter_breakdown
+CREATE INDEX CONCURRENTLY IF NOT EXISTS analytics_owner_summary_adopted_idx
+    ON analytics_owner_summary (pets_adopted DESC);
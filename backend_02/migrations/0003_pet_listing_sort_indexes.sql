@@ -0,0 +1,6 @@
+-- migrate: no-transaction
+-- Indexes for the pet listing filter compiler: created_at ranges and the
+-- newest-first listing of available pets.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS pets_created_at_idx ON pets (created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS pets_status_created_at_idx ON pets (status, created_at);
@@ -0,0 +1,39 @@
+-- Saved pet searches and the alerts sent when a new or updated listing matches one
+
+CREATE TABLE IF NOT EXISTS saved_searches (
+    search_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    name VARCHAR(100) NOT NULL,
+    filters JSONB NOT NULL DEFAULT '{}'::jsonb,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS saved_searches_user_id_idx ON saved_searches (user_id, created_at);
+
+-- One row per (search, pet) that has been alerted, so a pet is announced once per search
+CREATE TABLE IF NOT EXISTS saved_search_matches (
+    search_id UUID NOT NULL REFERENCES saved_searches(search_id) ON DELETE CASCADE,
+    pet_id UUID NOT NULL REFERENCES pets(pet_id) ON DELETE CASCADE,
+    matched_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (search_id, pet_id)
+);
+
+CREATE INDEX IF NOT EXISTS saved_search_matches_pet_id_idx ON saved_search_matches (pet_id);
+
+-- Queue the alert in the same transaction as the match
+CREATE OR REPLACE FUNCTION enqueue_saved_search_notifications() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO notification_outbox (recipient_id, event_type, payload)
+    SELECT s.user_id, 'saved_search_match', jsonb_build_object(
+        'search_id', s.search_id, 'search_name', s.name, 'pet_id', p.pet_id, 'pet_name', p.name
+    )
+    FROM saved_searches s, pets p
+    WHERE s.search_id = NEW.search_id AND p.pet_id = NEW.pet_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS saved_search_matches_notify ON saved_search_matches;
+CREATE TRIGGER saved_search_matches_notify
+    AFTER INSERT ON saved_search_matches
+    FOR EACH ROW EXECUTE FUNCTION enqueue_saved_search_notifications();
@@ -0,0 +1,21 @@
+-- Registration in a single call: the user and their profile are inserted in
+-- one statement, so either both rows exist or neither does. Duplicate
+-- usernames and emails surface as unique violations (SQLSTATE 23505) on
+-- users_username_key / users_email_key instead of being checked beforehand.
+CREATE OR REPLACE FUNCTION register_user(
+    username VARCHAR,
+    email VARCHAR,
+    password VARCHAR,
+    role VARCHAR,
+    additional_info JSONB DEFAULT '{}'::jsonb
+) RETURNS SETOF users AS $$
+    WITH new_user AS (
+        INSERT INTO users (username, email, password, role)
+        VALUES (register_user.username, register_user.email, register_user.password, register_user.role)
+        RETURNING *
+    ), new_profile AS (
+        INSERT INTO user_profiles (user_id, additional_info)
+        SELECT user_id, COALESCE(register_user.additional_info, '{}'::jsonb) FROM new_user
+    )
+    SELECT * FROM new_user;
+$$ LANGUAGE sql;
@@ -0,0 +1,220 @@
+-- Archive tables for adopted pets and their resolved applications.
+--
+-- archive_adopted_pets() moves pets adopted more than a given time ago, with
+-- all of their applications (once none is still submitted), out of the hot
+-- pets and adoption_applications tables, so listing and inbox queries only
+-- scan live rows. Reads by ID fall back to the archive tables.
+
+CREATE TABLE IF NOT EXISTS pets_archive (
+    pet_id UUID PRIMARY KEY,
+    owner_id UUID REFERENCES users(user_id) ON DELETE CASCADE,
+    owner_type VARCHAR(20) NOT NULL CHECK (owner_type IN ('shelter', 'individual')),
+    name VARCHAR(100) NOT NULL,
+    pet_type_id UUID REFERENCES pet_types(pet_type_id),
+    breed_id UUID REFERENCES breeds(breed_id),
+    age INTEGER,
+    gender VARCHAR(10),
+    description TEXT,
+    image_url TEXT,
+    status VARCHAR(20) NOT NULL CHECK (status = 'adopted'),
+    created_at TIMESTAMP WITH TIME ZONE,
+    archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS pets_archive_owner_id_idx ON pets_archive (owner_id, pet_id);
+
+CREATE TABLE IF NOT EXISTS adoption_applications_archive (
+    application_id UUID PRIMARY KEY,
+    pet_id UUID REFERENCES pets_archive(pet_id) ON DELETE CASCADE,
+    adopter_id UUID REFERENCES users(user_id) ON DELETE CASCADE,
+    message TEXT,
+    status VARCHAR(20) NOT NULL CHECK (status IN ('approved', 'rejected')),
+    submitted_at TIMESTAMP WITH TIME ZONE,
+    archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS adoption_applications_archive_pet_id_idx
+    ON adoption_applications_archive (pet_id, application_id);
+CREATE INDEX IF NOT EXISTS adoption_applications_archive_adopter_id_idx
+    ON adoption_applications_archive (adopter_id, application_id);
+
+-- Stories, visits, saved search matches and funnel rows keep referencing a pet
+-- after it is archived. A foreign key can only target one table, so the
+-- references to pets are checked and cascaded by triggers over both tables.
+ALTER TABLE success_stories DROP CONSTRAINT IF EXISTS success_stories_pet_id_fkey;
+ALTER TABLE visit_schedules DROP CONSTRAINT IF EXISTS visit_schedules_pet_id_fkey;
+ALTER TABLE saved_search_matches DROP CONSTRAINT IF EXISTS saved_search_matches_pet_id_fkey;
+ALTER TABLE analytics_pet_funnel DROP CONSTRAINT IF EXISTS analytics_pet_funnel_pet_id_fkey;
+
+CREATE OR REPLACE FUNCTION check_pet_reference() RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.pet_id IS NULL THEN
+        RETURN NEW;
+    END IF;
+    -- Lock the pet like a foreign key check would, so it cannot be deleted concurrently
+    PERFORM 1 FROM pets WHERE pet_id = NEW.pet_id FOR KEY SHARE;
+    IF NOT FOUND THEN
+        PERFORM 1 FROM pets_archive WHERE pet_id = NEW.pet_id FOR KEY SHARE;
+        IF NOT FOUND THEN
+            RAISE EXCEPTION 'insert or update on table "%" violates pet reference', TG_TABLE_NAME
+                USING ERRCODE = 'foreign_key_violation',
+                      DETAIL = format('Key (pet_id)=(%s) is not present in table "pets".', NEW.pet_id);
+        END IF;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS success_stories_pet_reference ON success_stories;
+CREATE TRIGGER success_stories_pet_reference
+    BEFORE INSERT OR UPDATE OF pet_id ON success_stories
+    FOR EACH ROW EXECUTE FUNCTION check_pet_reference();
+
+DROP TRIGGER IF EXISTS visit_schedules_pet_reference ON visit_schedules;
+CREATE TRIGGER visit_schedules_pet_reference
+    BEFORE INSERT OR UPDATE OF pet_id ON visit_schedules
+    FOR EACH ROW EXECUTE FUNCTION check_pet_reference();
+
+DROP TRIGGER IF EXISTS saved_search_matches_pet_reference ON saved_search_matches;
+CREATE TRIGGER saved_search_matches_pet_reference
+    BEFORE INSERT OR UPDATE OF pet_id ON saved_search_matches
+    FOR EACH ROW EXECUTE FUNCTION check_pet_reference();
+
+DROP TRIGGER IF EXISTS analytics_pet_funnel_pet_reference ON analytics_pet_funnel;
+CREATE TRIGGER analytics_pet_funnel_pet_reference
+    BEFORE INSERT OR UPDATE OF pet_id ON analytics_pet_funnel
+    FOR EACH ROW EXECUTE FUNCTION check_pet_reference();
+
+-- ON DELETE CASCADE for the dropped foreign keys, skipped while archiving
+CREATE OR REPLACE FUNCTION delete_pet_dependents() RETURNS TRIGGER AS $$
+BEGIN
+    IF current_setting('app.archiving', true) = 'on' THEN
+        RETURN OLD;
+    END IF;
+    DELETE FROM success_stories WHERE pet_id = OLD.pet_id;
+    DELETE FROM visit_schedules WHERE pet_id = OLD.pet_id;
+    DELETE FROM saved_search_matches WHERE pet_id = OLD.pet_id;
+    DELETE FROM analytics_pet_funnel WHERE pet_id = OLD.pet_id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS pets_delete_dependents ON pets;
+CREATE TRIGGER pets_delete_dependents
+    AFTER DELETE ON pets
+    FOR EACH ROW EXECUTE FUNCTION delete_pet_dependents();
+
+DROP TRIGGER IF EXISTS pets_archive_delete_dependents ON pets_archive;
+CREATE TRIGGER pets_archive_delete_dependents
+    AFTER DELETE ON pets_archive
+    FOR EACH ROW EXECUTE FUNCTION delete_pet_dependents();
+
+-- Move up to batch_size pets adopted at least min_age_seconds ago, and all of
+-- their applications, to the archive tables. Pets with a submitted application
+-- are left alone until it is resolved. Locked rows are skipped, so concurrent
+-- callers archive disjoint batches. Returns the number of pets archived.
+CREATE OR REPLACE FUNCTION archive_adopted_pets(
+    min_age_seconds INTEGER,
+    batch_size INTEGER
+) RETURNS INTEGER AS $$
+DECLARE
+    archived INTEGER;
+BEGIN
+    PERFORM set_config('app.archiving', 'on', true);
+
+    WITH candidates AS (
+        SELECT p.pet_id
+        FROM pets p
+        LEFT JOIN analytics_pet_funnel f ON f.pet_id = p.pet_id
+        WHERE p.status = 'adopted'
+          AND COALESCE(f.adopted_at, p.created_at) <= NOW() - make_interval(secs => min_age_seconds)
+          AND NOT EXISTS (
+              SELECT 1 FROM adoption_applications a
+              WHERE a.pet_id = p.pet_id AND a.status NOT IN ('approved', 'rejected')
+          )
+        ORDER BY p.pet_id
+        LIMIT batch_size
+        FOR UPDATE OF p SKIP LOCKED
+    ), moved_pets AS (
+        DELETE FROM pets p USING candidates c
+        WHERE p.pet_id = c.pet_id
+        RETURNING p.*
+    ), archived_pets AS (
+        INSERT INTO pets_archive (
+            pet_id, owner_id, owner_type, name, pet_type_id, breed_id,
+            age, gender, description, image_url, status, created_at
+        )
+        SELECT
+            pet_id, owner_id, owner_type, name, pet_type_id, breed_id,
+            age, gender, description, image_url, status, created_at
+        FROM moved_pets
+        RETURNING pet_id
+    ), moved_applications AS (
+        DELETE FROM adoption_applications a USING candidates c
+        WHERE a.pet_id = c.pet_id
+        RETURNING a.*
+    ), archived_applications AS (
+        INSERT INTO adoption_applications_archive (
+            application_id, pet_id, adopter_id, message, status, submitted_at
+        )
+        SELECT application_id, pet_id, adopter_id, message, status, submitted_at
+        FROM moved_applications
+    )
+    SELECT COUNT(*) INTO archived FROM archived_pets;
+
+    PERFORM set_config('app.archiving', 'off', true);
+    RETURN archived;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recompute the analytics summaries over live and archived rows
+CREATE OR REPLACE FUNCTION analytics_rebuild() RETURNS VOID AS $$
+BEGIN
+    DELETE FROM analytics_pet_funnel;
+    DELETE FROM analytics_owner_summary;
+    DELETE FROM analytics_pet_type_summary;
+
+    INSERT INTO analytics_pet_funnel (
+        pet_id, owner_id, pet_type_id, listed_at, applications_total,
+        applications_submitted, applications_approved, applications_rejected, adopted_at
+    )
+    SELECT
+        p.pet_id, p.owner_id, p.pet_type_id, p.created_at,
+        COUNT(a.application_id),
+        COUNT(a.application_id) FILTER (WHERE a.status = 'submitted'),
+        COUNT(a.application_id) FILTER (WHERE a.status = 'approved'),
+        COUNT(a.application_id) FILTER (WHERE a.status = 'rejected'),
+        CASE WHEN p.status = 'adopted' THEN MAX(a.submitted_at) FILTER (WHERE a.status = 'approved') END
+    FROM (
+        SELECT pet_id, owner_id, pet_type_id, created_at, status FROM pets
+        UNION ALL
+        SELECT pet_id, owner_id, pet_type_id, created_at, status FROM pets_archive
+    ) p
+    LEFT JOIN (
+        SELECT application_id, pet_id, status, submitted_at FROM adoption_applications
+        UNION ALL
+        SELECT application_id, pet_id, status, submitted_at FROM adoption_applications_archive
+    ) a ON a.pet_id = p.pet_id
+    GROUP BY p.pet_id, p.owner_id, p.pet_type_id, p.created_at, p.status;
+
+    INSERT INTO analytics_owner_summary (
+        owner_id, pets_listed, pets_adopted, applications_total,
+        applications_approved, applications_rejected, adoption_seconds_total
+    )
+    SELECT
+        owner_id, COUNT(*), COUNT(adopted_at), SUM(applications_total),
+        SUM(applications_approved), SUM(applications_rejected),
+        COALESCE(SUM(EXTRACT(EPOCH FROM adopted_at - listed_at)), 0)
+    FROM analytics_pet_funnel WHERE owner_id IS NOT NULL GROUP BY owner_id;
+
+    INSERT INTO analytics_pet_type_summary (
+        pet_type_id, pets_listed, pets_adopted, applications_total,
+        applications_approved, applications_rejected, adoption_seconds_total
+    )
+    SELECT
+        pet_type_id, COUNT(*), COUNT(adopted_at), SUM(applications_total),
+        SUM(applications_approved), SUM(applications_rejected),
+        COALESCE(SUM(EXTRACT(EPOCH FROM adopted_at - listed_at)), 0)
+    FROM analytics_pet_funnel WHERE pet_type_id IS NOT NULL GROUP BY pet_type_id;
+END;
+$$ LANGUAGE plpgsql;
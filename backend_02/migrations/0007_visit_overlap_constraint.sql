@@ -0,0 +1,49 @@
+-- Reject overlapping visits on an owner's calendar in the database.
+--
+-- VisitService checks a proposed slot against the owner's calendar before
+-- inserting it, but two workers can both pass that check for overlapping
+-- slots. The exclusion constraint below makes the insert of the second one
+-- fail with SQLSTATE 23P01 (exclusion_violation), which VisitService reports
+-- as a conflict. Visits carry their pet's owner so the constraint can span
+-- all of the owner's pets.
+--
+-- Existing overlapping pending/confirmed visits make this migration fail;
+-- cancel one visit of each overlapping pair before applying it.
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+ALTER TABLE visit_schedules ADD COLUMN IF NOT EXISTS owner_id UUID REFERENCES users(user_id) ON DELETE CASCADE;
+
+UPDATE visit_schedules v SET owner_id = p.owner_id
+FROM pets p WHERE p.pet_id = v.pet_id AND v.owner_id IS NULL;
+
+UPDATE visit_schedules v SET owner_id = p.owner_id
+FROM pets_archive p WHERE p.pet_id = v.pet_id AND v.owner_id IS NULL;
+
+CREATE OR REPLACE FUNCTION set_visit_owner() RETURNS TRIGGER AS $$
+BEGIN
+    SELECT owner_id INTO NEW.owner_id FROM pets WHERE pet_id = NEW.pet_id;
+    IF NOT FOUND THEN
+        SELECT owner_id INTO NEW.owner_id FROM pets_archive WHERE pet_id = NEW.pet_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS visit_schedules_set_owner ON visit_schedules;
+CREATE TRIGGER visit_schedules_set_owner
+    BEFORE INSERT OR UPDATE OF pet_id ON visit_schedules
+    FOR EACH ROW EXECUTE FUNCTION set_visit_owner();
+
+-- timestamptz + interval is only STABLE because day and month arithmetic
+-- depends on the time zone; minute arithmetic does not, so this is IMMUTABLE
+-- and may be used in the constraint.
+CREATE OR REPLACE FUNCTION visit_period(scheduled_date TIMESTAMP WITH TIME ZONE, duration_minutes INTEGER)
+RETURNS TSTZRANGE AS $$
+    SELECT tstzrange(scheduled_date, scheduled_date + duration_minutes * INTERVAL '1 minute');
+$$ LANGUAGE sql IMMUTABLE;
+
+ALTER TABLE visit_schedules DROP CONSTRAINT IF EXISTS visit_schedules_no_overlap;
+ALTER TABLE visit_schedules ADD CONSTRAINT visit_schedules_no_overlap
+    EXCLUDE USING gist (owner_id WITH =, visit_period(scheduled_date, duration_minutes) WITH &&)
+    WHERE (status IN ('pending', 'confirmed'));
@@ -0,0 +1,53 @@
+-- Platform-wide analytics totals, and summaries kept correct when pets are deleted.
+
+-- AnalyticsService.get_overview read every analytics_owner_summary row and
+-- added them up in Python, which PostgREST's row limit silently truncates.
+-- The view aggregates in the database and always returns exactly one row.
+CREATE OR REPLACE VIEW analytics_overview AS
+SELECT
+    COALESCE(SUM(pets_listed), 0) AS pets_listed,
+    COALESCE(SUM(pets_adopted), 0) AS pets_adopted,
+    COALESCE(SUM(applications_total), 0) AS applications_total,
+    COALESCE(SUM(applications_approved), 0) AS applications_approved,
+    COALESCE(SUM(applications_rejected), 0) AS applications_rejected,
+    COALESCE(SUM(adoption_seconds_total), 0) AS adoption_seconds_total
+FROM analytics_owner_summary;
+
+-- Take a deleted pet's counters back out of its owner and pet type summaries.
+-- Runs before the row goes away, while its funnel row still exists. Pets
+-- moved to the archive (app.archiving) keep counting.
+CREATE OR REPLACE FUNCTION analytics_on_pet_delete() RETURNS TRIGGER AS $$
+DECLARE
+    funnel RECORD;
+BEGIN
+    IF current_setting('app.archiving', true) = 'on' THEN
+        RETURN OLD;
+    END IF;
+    SELECT * INTO funnel FROM analytics_pet_funnel WHERE pet_id = OLD.pet_id;
+    IF FOUND THEN
+        PERFORM analytics_bump(
+            funnel.owner_id, funnel.pet_type_id,
+            -1,
+            -(funnel.adopted_at IS NOT NULL)::INTEGER,
+            -funnel.applications_total,
+            -funnel.applications_approved,
+            -funnel.applications_rejected,
+            -COALESCE(EXTRACT(EPOCH FROM funnel.adopted_at - funnel.listed_at), 0)
+        );
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS pets_analytics_delete ON pets;
+CREATE TRIGGER pets_analytics_delete
+    BEFORE DELETE ON pets
+    FOR EACH ROW EXECUTE FUNCTION analytics_on_pet_delete();
+
+DROP TRIGGER IF EXISTS pets_archive_analytics_delete ON pets_archive;
+CREATE TRIGGER pets_archive_analytics_delete
+    BEFORE DELETE ON pets_archive
+    FOR EACH ROW EXECUTE FUNCTION analytics_on_pet_delete();
+
+-- Repair summaries that drifted through earlier deletions
+SELECT analytics_rebuild();
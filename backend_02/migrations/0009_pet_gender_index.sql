@@ -0,0 +1,5 @@
+-- migrate: no-transaction
+-- Pet listings filtered by gender, typically newest first
+-- ("PetService.get_pets(gender, exclude, newest)" in app/core/query_plans.py).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS pets_gender_created_at_idx ON pets (gender, created_at DESC, pet_id);
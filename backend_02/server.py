@@ -0,0 +1,57 @@
+"""
+Production entry point.
+
+Runs the API under uvicorn with a worker process per available core, uvloop
+and httptools when they are installed, and a graceful drain of in-flight
+requests on SIGTERM. Use ``python main.py`` for local development with reload.
+"""
+import importlib.util
+import os
+
+import uvicorn
+
+from app.core.config import settings
+
+
+def available_cores() -> int:
+    """
+    Return the number of CPU cores this process may run on.
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def resolve_worker_count(configured: int) -> int:
+    """
+    Resolve the worker count, sizing it to the available cores when unset.
+    """
+    if configured > 0:
+        return configured
+    return available_cores()
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main() -> None:
+    uvicorn.run(
+        "main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=resolve_worker_count(settings.SERVER_WORKERS),
+        loop="uvloop" if _installed("uvloop") else "asyncio",
+        http="httptools" if _installed("httptools") else "h11",
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_TIMEOUT_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        lifespan="on",
+        reload=False,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()